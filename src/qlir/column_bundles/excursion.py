@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from qlir.core.legs.segments import LegSegments
 from qlir.core.registries.columns.announce_and_register import announce_column_lifecycle
 from qlir.core.registries.columns.registry import ColKeyDecl, ColRegistry
 from qlir.core.semantics.events import log_column_event
@@ -46,9 +47,9 @@ def excursion(df: pd.DataFrame, trendname_or_col_prefix:str, leg_id_col: str, di
     - Normalized position of the excursion from both the start and the end of the leg
     - Percentage-of-leg timing for when the excursion occurs
 
-    All calculations are performed in a fully vectorized manner using
-    `groupby(...).transform(...)`, ensuring that per-leg values are broadcast
-    back to every row in the leg.
+    Leg boundaries are found once (`core.legs.segments.LegSegments`) and every
+    per-leg statistic is a segment reduction broadcast back to every row in
+    the leg, instead of one `groupby(...).transform(...)` per column.
 
     Parameters
     ----------
@@ -86,21 +87,26 @@ def excursion(df: pd.DataFrame, trendname_or_col_prefix:str, leg_id_col: str, di
 
     Notes
     -----
-    - The excursion "row" is identified using `idxmax` on the excursion
-      (in bps) within each leg and is marked via a boolean column.
+    - The excursion "row" is the first row holding the max excursion
+      (in bps) within each leg (same as `idxmax`) and is marked via a
+      boolean column.
     - Leg lengths are derived as `max(intra_leg_idx) + 1`, ensuring
       correct accounting for 0-based indexing.
     - The function assumes the input DataFrame has already been split
-      into valid directional leg segments by upstream logic.
+      into valid directional leg segments by upstream logic; leg ids must
+      be contiguous runs (ValueError otherwise).
     """
     
     new_cols = ColRegistry()
 
     excursion_name = f"{trendname_or_col_prefix}_{direction.value}_{mae_or_mfe.value}"
     
+    # Leg boundaries, once, for every per-leg statistic below
+    segments = LegSegments.from_ids(df[leg_id_col])
+
     # Mark the intra leg idx
     intra_leg_idx = f'{excursion_name}_intra_leg_idx'
-    df[intra_leg_idx] = df.groupby(leg_id_col).cumcount()
+    df[intra_leg_idx] = segments.position()
     announce_column_lifecycle(caller="excursion", registry=new_cols, decl=ColKeyDecl(key="intra_leg_idx", column=intra_leg_idx), event="created")    
     
     # Keep only a subset of columns
@@ -110,30 +116,23 @@ def excursion(df: pd.DataFrame, trendname_or_col_prefix:str, leg_id_col: str, di
     # Get the leg length / max idx - And apply to: [all row in gorup, new col]
     leg_max_idx = f"{excursion_name}_leg_max_idx"
     leg_of_n_bars = f"{excursion_name}_leg_of_n_bars"
-    df_slim[leg_max_idx] = (
-        df_slim.groupby(leg_id_col)[intra_leg_idx]
-        .transform("last")
-    )
+    df_slim[leg_max_idx] = segments.broadcast(segments.lengths - 1)
     df_slim[leg_of_n_bars] = df_slim[leg_max_idx] + 1
     announce_column_lifecycle(caller="excursion", registry=new_cols, decl=ColKeyDecl(key="leg_max_idx", column=leg_max_idx), event="created")
     announce_column_lifecycle(caller="excursion", registry=new_cols, decl=ColKeyDecl(key="leg_of_n_bars", column=leg_of_n_bars), event="created")
 
     # Get the first open - And apply to: [all rows in group, new col]
     group_first_open = f"{excursion_name}_grp_1st_open"
-    df_slim[group_first_open] = (
-        df_slim.groupby(leg_id_col)["open"]
-        .transform("first")
-    )
+    df_slim[group_first_open] = segments.broadcast(segments.first(df_slim["open"]))
     announce_column_lifecycle(caller="excursion", registry=new_cols, decl=ColKeyDecl(key="group_first_open", column=group_first_open), event="created")
 
     # Calc Exc (also in bps)
     df_slim[f"{excursion_name}_exc"] = df_slim["high"] - df_slim[group_first_open]
     df_slim[f"{excursion_name}_exc_bps"] = delta_in_bps(df_slim[f"{excursion_name}_exc"], df_slim[group_first_open])
     
-    # Mark the Exc row for each leg
-    mfe_row_idx = df_slim.groupby(leg_id_col)[f"{excursion_name}_exc_bps"].idxmax()
-    df_slim[f"is_{excursion_name}_row"] = False
-    df_slim.loc[mfe_row_idx, f"is_{excursion_name}_row"] = True
+    # Mark the Exc row for each leg (first max, like idxmax)
+    exc_rows = segments.argmax(df_slim[f"{excursion_name}_exc_bps"])
+    df_slim[f"is_{excursion_name}_row"] = segments.mark(exc_rows)
 
     exc_decl = ColKeyDecl(key="excursion", column=f"{excursion_name}_exc")
     exc_bps_decl = ColKeyDecl(key="excursion_bps", column=f"{excursion_name}_exc_bps")
@@ -1,9 +1,77 @@
+import logging
 
+import numpy as np
+import pandas as pd
 
-# To Implement 
-def distance_to_trendline_per_leg(...):
-    df = add_leg_indexing(df, leg_id)
-    df = add_distance_to_trendline(...)
-    df = mark_leg_extrema(...)
-    df = add_stretch_position(...)
-    return df
\ No newline at end of file
+from qlir.core.legs.segments import LegSegments
+from qlir.core.registries.columns.announce_and_register import announce_column_lifecycle
+from qlir.core.registries.columns.registry import ColKeyDecl, ColRegistry
+from qlir.core.types.annotated_df import AnnotatedDF
+from qlir.df.scalars.units import delta_in_bps
+from qlir.df.utils import _ensure_columns
+
+log = logging.getLogger(__name__)
+
+
+def distance_to_trendline_per_leg(
+    df: pd.DataFrame,
+    *,
+    leg_id_col: str,
+    trendline_col: str,
+    price_col: str = "close",
+    prefix: str | None = None,
+) -> AnnotatedDF:
+    """
+    Distance of price from a trendline within each leg, and where in the leg
+    it stretched the furthest.
+
+    Adds (prefix defaults to `<trendline_col>_dist`):
+
+    - `<prefix>_intra_leg_idx` : 0-based bar offset within the leg
+    - `<prefix>_leg_of_n_bars` : bars in the leg
+    - `<prefix>` / `<prefix>_bps` : price - trendline (absolute / in bps of the trendline)
+    - `is_<prefix>_max_row` : first row with the leg's largest |distance|
+    - `<prefix>_max_pct_of_leg` : offset of that row as a fraction of the leg length
+
+    Leg boundaries are computed once and every per-leg value is a segment
+    reduction (see `core.legs.segments`). Rows outside legs get NaN / False.
+    """
+    _ensure_columns(df=df, cols=[leg_id_col, trendline_col, price_col], caller="distance_to_trendline_per_leg")
+
+    prefix = prefix or f"{trendline_col}_dist"
+    new_cols = ColRegistry()
+    segments = LegSegments.from_ids(df[leg_id_col])
+
+    intra_leg_idx = f"{prefix}_intra_leg_idx"
+    leg_of_n_bars = f"{prefix}_leg_of_n_bars"
+    df[intra_leg_idx] = segments.position()
+    df[leg_of_n_bars] = segments.length()
+
+    dist_col = prefix
+    dist_bps_col = f"{prefix}_bps"
+    df[dist_col] = df[price_col] - df[trendline_col]
+    df[dist_bps_col] = delta_in_bps(df[dist_col], df[trendline_col])
+
+    is_max_col = f"is_{prefix}_max_row"
+    max_rows = segments.argmax(df[dist_col].abs())
+    df[is_max_col] = segments.mark(max_rows)
+
+    max_pct_col = f"{prefix}_max_pct_of_leg"
+    offsets = np.where(max_rows >= 0, max_rows - segments.starts, np.nan)
+    df[max_pct_col] = segments.broadcast(offsets / segments.lengths)
+
+    announce_column_lifecycle(
+        caller="distance_to_trendline_per_leg",
+        registry=new_cols,
+        decls=[
+            ColKeyDecl(key="intra_leg_idx", column=intra_leg_idx),
+            ColKeyDecl(key="leg_of_n_bars", column=leg_of_n_bars),
+            ColKeyDecl(key="distance", column=dist_col),
+            ColKeyDecl(key="distance_bps", column=dist_bps_col),
+            ColKeyDecl(key="is_max_distance_row", column=is_max_col),
+            ColKeyDecl(key="max_distance_pct_of_leg", column=max_pct_col),
+        ],
+        event="created",
+    )
+
+    return AnnotatedDF(df=df, new_cols=new_cols, label="distance_to_trendline_per_leg")
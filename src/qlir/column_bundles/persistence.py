@@ -1,8 +1,9 @@
 import logging
 
+import numpy as np
 import pandas as pd
 
-from qlir.core.counters import univariate
+from qlir.core.legs.segments import LegSegments
 from qlir.core.ops import temporal
 from qlir.core.registries.columns.registry import ColRegistry
 from qlir.core.semantics.events import log_column_event
@@ -15,6 +16,37 @@ from qlir.df.granularity.distributions.persistence import condition_persistence
 log = logging.getLogger(__name__)
 
 
+def _with_leg_runs(
+    df: pd.DataFrame,
+    *,
+    condition_col: str,
+    group_ids_col: str,
+    run_len_col: str,
+    caller: str,
+) -> tuple[pd.DataFrame, str]:
+    """
+    Add the running True count and the per-leg run length in one pass.
+
+    Legs are the True runs of `condition_col` (ids in `group_ids_col`), so the
+    running count is the 1-based position in the leg (0 outside legs) and its
+    per-leg max is the leg length. Returns a new frame (the input only keeps
+    the columns assigned before this call) and the running-count column name.
+    """
+    segments = LegSegments.from_ids(df[group_ids_col])
+    contig_true_rows = f"{condition_col}__run_true"
+
+    running = np.zeros(segments.n_rows, dtype="int64")
+    running[segments.in_leg] = segments.position()[segments.in_leg] + 1
+
+    out = df.assign(**{
+        contig_true_rows: pd.array(running, dtype="Int64"),
+        run_len_col: pd.array(segments.length(), dtype="Int64"),
+    })
+    log_column_event(caller=caller, ev=ColumnLifecycleEvent(key="see caller", col=contig_true_rows, event="created"))
+    log_column_event(caller=caller, ev=ColumnLifecycleEvent(key=run_len_col, col=run_len_col, event="created"))
+    return out, contig_true_rows
+
+
 def persistence_up_legs(df: pd.DataFrame, direction_col: str, trendline_col: str) -> AnnotatedDF:
     '''
     Prep for persistence analysis funcs
@@ -28,12 +60,14 @@ def persistence_up_legs(df: pd.DataFrame, direction_col: str, trendline_col: str
     # Add group id - will need for bucketizing/summarization 
     df, grp_ids_up_legs_col = assign_condition_group_id(df=df, condition_col="dir_col_up", group_col=f"{trendline_col}_up_leg_id")
 
-    # Get running counters
-    df, contig_true_rows = univariate.with_running_true(df, col="dir_col_up")
-
-    # Add Persistence (Max of contig per group id )
-    df["up_leg_run_len"] = df.groupby(grp_ids_up_legs_col)[contig_true_rows].transform("max")
-    log_column_event(caller="persistence_up_legs", ev=ColumnLifecycleEvent(key="up_leg_run_len", col="up_leg_run_len", event="created"))
+    # Get running counters + Persistence (Max of contig per group id), one leg pass
+    df, contig_true_rows = _with_leg_runs(
+        df,
+        condition_col="dir_col_up",
+        group_ids_col=grp_ids_up_legs_col,
+        run_len_col="up_leg_run_len",
+        caller="persistence_up_legs",
+    )
     
     # uncomment for comparison (spt check)
     # logdf(df, from_row_idx=22, max_rows=40)
@@ -60,11 +94,14 @@ def persistence_down_legs(df: pd.DataFrame, direction_col: str, trendline_col: s
     # Add group id - will need for bucketizing/summarization 
     df, grp_ids_legs_col = assign_condition_group_id(df=df, condition_col="dir_col_down", group_col=f"{trendline_col}_down_leg_id")
 
-    # Get running counters
-    df, contig_true_rows = univariate.with_running_true(df, "dir_col_down")
-    
-    # Add Persistence (Max of contig per group id )
-    df["down_leg_run_len"] = df.groupby(grp_ids_legs_col)[contig_true_rows].transform("max")
+    # Get running counters + Persistence (Max of contig per group id), one leg pass
+    df, contig_true_rows = _with_leg_runs(
+        df,
+        condition_col="dir_col_down",
+        group_ids_col=grp_ids_legs_col,
+        run_len_col="down_leg_run_len",
+        caller="persistence_down_legs",
+    )
     
     # uncomment for comparison (spt check)
     # logdf(df, from_row_idx=22, max_rows=40)
@@ -85,11 +122,15 @@ def persistence(df: pd.DataFrame, condition_col: str , col_name_for_added_group_
     df[condition_col] = df[condition_col].astype("boolean").fillna(False)
 
     df, group_ids_col = assign_condition_group_id(df=df, condition_col=condition_col, group_col=col_name_for_added_group_id_col)
-    df, contig_true_rows = univariate.with_running_true(df, group_ids_col)
 
     max_run_col = f"{condition_col}_run_len"
-    df[max_run_col] = df.groupby(group_ids_col)[contig_true_rows].transform("max")
-    log_column_event(caller="persistence", ev=ColumnLifecycleEvent(key="persistence", col=max_run_col, event="created"))
+    df, contig_true_rows = _with_leg_runs(
+        df,
+        condition_col=condition_col,
+        group_ids_col=group_ids_col,
+        run_len_col=max_run_col,
+        caller="persistence",
+    )
 
     new_cols = ColRegistry()
     new_cols.add(key="group_ids_col", column=group_ids_col)
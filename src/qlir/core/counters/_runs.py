@@ -0,0 +1,42 @@
+"""
+NumPy run-length kernels shared by the counters.
+
+Every kernel works column-wise on 2-D arrays so many masks share one pass:
+
+    reset[i, j] = i      if row i breaks column j's streak
+                  i - 1  if row i starts a new run / group (streak restarts at 1)
+                  -1     otherwise
+    last        = np.maximum.accumulate(reset, axis=0)
+    running     = i - last
+"""
+
+from __future__ import annotations
+
+import numpy as _np
+
+
+def _last_reset(reset: _np.ndarray) -> _np.ndarray:
+    return _np.maximum.accumulate(reset, axis=0)
+
+
+def running_true_lengths(masks: _np.ndarray, group_starts: _np.ndarray) -> _np.ndarray:
+    """
+    Consecutive-True count for every column of a 2-D bool array (0 on False
+    rows), restarting at every `group_starts` row.
+    """
+    n = masks.shape[0]
+    idx = _np.arange(n, dtype="int64")[:, None]
+    reset = _np.where(~masks, idx, _np.where(group_starts[:, None], idx - 1, -1))
+    return idx - _last_reset(reset)
+
+
+def run_lengths(changes: _np.ndarray) -> tuple[_np.ndarray, _np.ndarray]:
+    """
+    Streak ids (1-based cumulative count of `changes`) and running lengths
+    for every column of a 2-D bool array of "a new run starts here" flags.
+    """
+    n = changes.shape[0]
+    idx = _np.arange(n, dtype="int64")[:, None]
+    ids = _np.cumsum(changes, axis=0, dtype="int64")
+    lens = idx - _last_reset(_np.where(changes, idx - 1, -1))
+    return ids, lens
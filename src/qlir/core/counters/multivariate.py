@@ -5,6 +5,8 @@ from typing import Iterable, Optional
 import numpy as _np
 import pandas as _pd
 
+from qlir.core.counters._runs import running_true_lengths
+
 BoolDtype = "boolean"
 
 def _maybe_copy(df: _pd.DataFrame, inplace: bool) -> _pd.DataFrame:
@@ -24,10 +26,9 @@ def _as_bool_series(s: _pd.Series) -> _pd.Series:
     return b.fillna(False).astype(BoolDtype)
 
 def _consecutive_true(mask: _pd.Series) -> _pd.Series:
-    m = _as_bool_series(mask)
-    groups = (~m).cumsum()
-    streak = m.astype("int64").groupby(groups, sort=False).cumsum()
-    return streak.astype("Int64")
+    m = _as_bool_series(mask).to_numpy(dtype=bool, na_value=False)
+    streak = running_true_lengths(m[:, None], _np.zeros(len(m), dtype=bool))[:, 0]
+    return _pd.Series(_pd.array(streak, dtype="Int64"), index=mask.index)
 
 # ----------------------------
 # Public API
@@ -0,0 +1,103 @@
+"""
+Fused streak / run-length computation for many columns at once.
+
+`with_running_true*` and `features.common.running` each copy the frame and
+run one `groupby(...).cumsum()` per mask. `streaks` instead stacks every
+requested column into one 2-D NumPy array and derives all running lengths
+(and streak ids) with a single cumulative pass along the rows (see `_runs`).
+
+Only the new columns are returned (same index as the input); the input frame
+is never copied or modified.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as _np
+import pandas as _pd
+
+from qlir.core.counters._runs import run_lengths, running_true_lengths
+from qlir.core.counters.multivariate import _as_bool_series, _safe_name
+from qlir.df.utils import _ensure_columns
+
+__all__ = ["streaks"]
+
+
+def _group_starts(df: _pd.DataFrame, group_col: Optional[str]) -> _np.ndarray:
+    """True on the first row and wherever `group_col` changes value."""
+    starts = _np.zeros(len(df), dtype=bool)
+    if len(df):
+        starts[0] = True
+    if group_col is not None:
+        g = df[group_col]
+        starts |= g.ne(g.shift(1)).to_numpy()
+    return starts
+
+
+def streaks(
+    df: _pd.DataFrame,
+    *,
+    cols: Iterable[str] = (),
+    rel_cols: Iterable[str] = (),
+    group_col: Optional[str] = None,
+    with_ids: bool = False,
+) -> _pd.DataFrame:
+    """
+    Running streak columns for many boolean and relation columns in one pass.
+
+    Parameters
+    ----------
+    df : _pd.DataFrame
+        Input rows, ordered as intended for streak detection (not copied).
+    cols : iterable[str]
+        Boolean-ish columns (bool / nullable boolean / numeric != 0, NA as
+        False, like `multivariate`). Adds `<col>__run_true` (Int64, 0 on
+        False rows) and, with `with_ids`, `<col>__run_id` (1-based id of the
+        True run, NA on False rows).
+    rel_cols : iterable[str]
+        Columns whose runs of identical values are streaks (e.g. relation
+        labels). Adds `<col>__streak_id` and `<col>__streak_len`, matching
+        `features.common.running.with_streaks`.
+    group_col : str | None
+        Streaks restart wherever this column changes value.
+    with_ids : bool
+        Also emit run ids for `cols`.
+
+    Returns
+    -------
+    _pd.DataFrame
+        Only the new columns, indexed like `df`.
+    """
+    cols = list(cols)
+    rel_cols = list(rel_cols)
+    if not cols and not rel_cols:
+        raise ValueError("cols and rel_cols are both empty")
+    _ensure_columns(df=df, cols=cols + rel_cols + ([group_col] if group_col else []), caller="streaks")
+
+    group_starts = _group_starts(df, group_col)
+    out: dict[str, object] = {}
+
+    if cols:
+        masks = _np.column_stack(
+            [_as_bool_series(df[c]).to_numpy(dtype=bool, na_value=False) for c in cols]
+        )
+        running = running_true_lengths(masks, group_starts)
+        if with_ids:
+            run_ids = _np.cumsum(running == 1, axis=0, dtype="int64")
+        for j, c in enumerate(cols):
+            out[_safe_name(c, "run_true")] = _pd.array(running[:, j], dtype="Int64")
+            if with_ids:
+                out[_safe_name(c, "run_id")] = _pd.array(run_ids[:, j], dtype="Int64")
+                out[_safe_name(c, "run_id")][~masks[:, j]] = _pd.NA
+
+    if rel_cols:
+        changes = _np.column_stack(
+            [df[c].ne(df[c].shift(1)).to_numpy() for c in rel_cols]
+        ) | group_starts[:, None]
+        ids, lens = run_lengths(changes)
+        for j, c in enumerate(rel_cols):
+            out[_safe_name(c, "streak_id")] = ids[:, j]
+            out[_safe_name(c, "streak_len")] = lens[:, j].astype("int32")
+
+    return _pd.DataFrame(out, index=df.index)
@@ -5,6 +5,7 @@ from typing import Optional
 import numpy as _np
 import pandas as _pd
 
+from qlir.core.counters._runs import running_true_lengths
 from qlir.core.semantics.events import log_column_event
 from qlir.core.registries.columns.lifecycle import ColumnLifecycleEvent
 
@@ -37,10 +38,10 @@ def _as_bool_series(s: _pd.Series) -> _pd.Series:
     return s.astype("boolean")
 
 def _consecutive_true(mask: _pd.Series) -> _pd.Series:
-    m = _as_bool_series(mask)
-    groups = (~m).cumsum()
-    streak = m.astype("int64").groupby(groups, sort=False).cumsum()
-    return streak.astype("Int64")
+    # NA counts as False (breaks the streak)
+    m = _as_bool_series(mask).to_numpy(dtype=bool, na_value=False)
+    streak = running_true_lengths(m[:, None], _np.zeros(len(m), dtype=bool))[:, 0]
+    return _pd.Series(_pd.array(streak, dtype="Int64"), index=mask.index)
 
 # ----------------------------
 # Public API
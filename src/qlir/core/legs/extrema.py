@@ -1,12 +1,34 @@
 from typing import Literal
 
+import pandas as _pd
+
+from qlir.core.legs.segments import LegSegments
+
 
 def mark_leg_extrema(
-    df,
+    df: _pd.DataFrame,
     *,
-    leg_id_col,
-    value_col,
+    leg_id_col: str,
+    value_col: str,
     how: Literal["max", "min"],
     tie_breaker: Literal["first", "last"],
-    out_col,
-)
+    out_col: str,
+    segments: LegSegments | None = None,
+) -> tuple[_pd.DataFrame, str]:
+    """
+    Mark the row holding each leg's max / min of `value_col` (NaN skipped).
+
+    Ties resolve to the first or last such row in leg order; legs whose
+    values are all NaN get no mark.
+    """
+    if how not in ("max", "min"):
+        raise ValueError(f"how must be 'max' or 'min', got {how!r}")
+
+    segments = segments or LegSegments.from_ids(df[leg_id_col])
+    if how == "max":
+        rows = segments.argmax(df[value_col], tie_breaker=tie_breaker)
+    else:
+        rows = segments.argmin(df[value_col], tie_breaker=tie_breaker)
+
+    df[out_col] = segments.mark(rows)
+    return df, out_col
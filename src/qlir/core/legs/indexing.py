@@ -1,7 +1,35 @@
+import pandas as _pd
 
+from qlir.core.legs.segments import LegSegments
 
 
-# To Implement 
-# def with_intra_leg_index(...)
-# def with_leg_length_index(...)
-# def with_leg_bounds(...)        # start/end rows if you want
+def with_intra_leg_index(
+    df: _pd.DataFrame,
+    *,
+    leg_id_col: str,
+    out_col: str = "intra_leg_idx",
+    segments: LegSegments | None = None,
+) -> tuple[_pd.DataFrame, str]:
+    """
+    Add the 0-based position of every row within its leg (NaN outside legs).
+
+    Pass `segments` to reuse boundaries already computed for `leg_id_col`.
+    """
+    segments = segments or LegSegments.from_ids(df[leg_id_col])
+    df[out_col] = segments.position()
+    return df, out_col
+
+
+def with_leg_length_index(
+    df: _pd.DataFrame,
+    *,
+    leg_id_col: str,
+    out_col: str = "leg_of_n_bars",
+    segments: LegSegments | None = None,
+) -> tuple[_pd.DataFrame, str]:
+    """
+    Add the number of bars of the row's leg to every row (NaN outside legs).
+    """
+    segments = segments or LegSegments.from_ids(df[leg_id_col])
+    df[out_col] = segments.length()
+    return df, out_col
@@ -0,0 +1,226 @@
+"""
+Segment kernels for contiguous legs.
+
+Leg bundles (excursion, persistence, distance to trendline, ...) used to
+regroup the same leg ids for every statistic: `cumcount`, several
+`groupby().transform(...)` calls, `idxmax`. Because legs are contiguous,
+ordered runs (see ___legs.README.MD), their boundaries can be found once and
+every per-leg statistic becomes a `reduceat` over those boundaries, broadcast
+back to rows with `np.repeat`.
+
+`LegSegments.from_ids` does the one pass over the leg-id column; the methods
+are the primitives (length, position-in-leg, first/last, max/min, argmax).
+Row-aligned results follow pandas' groupby conventions: rows outside any leg
+(NA leg id) get NaN.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as _np
+import pandas as _pd
+
+__all__ = ["LegSegments"]
+
+
+def _as_float(values) -> _np.ndarray:
+    if isinstance(values, _pd.Series):
+        if isinstance(values.dtype, _np.dtype):
+            return values.to_numpy()
+        return values.to_numpy(dtype="float64", na_value=_np.nan)
+    return _np.asarray(values)
+
+
+@dataclass(frozen=True)
+class LegSegments:
+    """
+    Boundaries of the legs in a row-aligned frame.
+
+    starts, ends : first / last row position of every leg (ends inclusive)
+    in_leg : per-row mask, False where the leg id is NA
+    """
+    starts: _np.ndarray
+    ends: _np.ndarray
+    in_leg: _np.ndarray
+
+    # ------------------------------------------------------------------
+    # construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_ids(cls, ids: _pd.Series) -> "LegSegments":
+        """
+        Find leg boundaries from a leg-id column (NA = not in a leg).
+
+        Raises ValueError if a leg id appears in more than one run, i.e. the
+        ids are not legs.
+        """
+        in_leg = ids.notna().to_numpy()
+        values = ids.to_numpy()
+
+        # a leg starts where the id changes or a leg follows a gap
+        n = len(values)
+        if n == 0:
+            empty = _np.empty(0, dtype=_np.intp)
+            return cls(starts=empty, ends=empty, in_leg=in_leg)
+
+        prev_in = _np.concatenate(([False], in_leg[:-1]))
+        changed = _np.ones(n, dtype=bool)
+        changed[1:] = values[1:] != values[:-1]
+        starts = _np.flatnonzero(in_leg & (~prev_in | changed))
+
+        next_in = _np.concatenate((in_leg[1:], [False]))
+        changed_next = _np.ones(n, dtype=bool)
+        changed_next[:-1] = changed[1:]
+        ends = _np.flatnonzero(in_leg & (~next_in | changed_next))
+
+        if len(_pd.unique(values[starts])) != len(starts):
+            raise ValueError(
+                f"Leg ids in '{ids.name}' are not contiguous: some id spans more than one run"
+            )
+        return cls(starts=starts, ends=ends, in_leg=in_leg)
+
+    # ------------------------------------------------------------------
+    # shape
+    # ------------------------------------------------------------------
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.in_leg)
+
+    @property
+    def n_legs(self) -> int:
+        return len(self.starts)
+
+    @property
+    def lengths(self) -> _np.ndarray:
+        """Bars per leg."""
+        return (self.ends - self.starts + 1).astype("int64")
+
+    @property
+    def all_in_legs(self) -> bool:
+        return bool(self.in_leg.all())
+
+    # ------------------------------------------------------------------
+    # broadcast back to rows
+    # ------------------------------------------------------------------
+
+    def broadcast(self, per_leg: _np.ndarray) -> _np.ndarray:
+        """
+        Row-aligned array carrying each leg's value on all of its rows
+        (NaN / NaT / None outside legs; dtype kept when every row is in a leg).
+        """
+        per_leg = _np.asarray(per_leg)
+        inside = _np.repeat(per_leg, self.lengths)
+        if self.all_in_legs:
+            return inside
+
+        kind = per_leg.dtype.kind
+        if kind in "biuf":
+            out = _np.full(self.n_rows, _np.nan)
+        elif kind in "Mm":
+            out = _np.full(self.n_rows, per_leg.dtype.type("NaT"), dtype=per_leg.dtype)
+        else:
+            out = _np.full(self.n_rows, None, dtype=object)
+        out[self.in_leg] = inside
+        return out
+
+    def length(self) -> _np.ndarray:
+        """Leg length on every row of the leg."""
+        return self.broadcast(self.lengths)
+
+    def position(self) -> _np.ndarray:
+        """0-based position of each row within its leg (`groupby.cumcount`)."""
+        lengths = self.lengths
+        offsets = _np.repeat(_np.cumsum(lengths) - lengths, lengths)
+        inside = _np.arange(int(lengths.sum()), dtype="int64") - offsets
+        if self.all_in_legs:
+            return inside
+        out = _np.full(self.n_rows, _np.nan)
+        out[self.in_leg] = inside
+        return out
+
+    # ------------------------------------------------------------------
+    # per-leg reductions
+    # ------------------------------------------------------------------
+
+    def _reduceat(self, ufunc, values: _np.ndarray) -> _np.ndarray:
+        if self.n_legs == 0:
+            return values[:0]
+        if self.all_in_legs:
+            return ufunc.reduceat(values, self.starts)
+        # interleave [start, end + 1) pairs and keep every other result
+        idx = _np.column_stack((self.starts, self.ends + 1)).ravel()
+        if idx[-1] == len(values):
+            idx = idx[:-1]
+        return ufunc.reduceat(values, idx)[::2]
+
+    def max(self, values) -> _np.ndarray:
+        """Per-leg max, NaN skipped (`transform("max")`)."""
+        v = _as_float(values)
+        return self._reduceat(_np.fmax if v.dtype.kind == "f" else _np.maximum, v)
+
+    def min(self, values) -> _np.ndarray:
+        """Per-leg min, NaN skipped (`transform("min")`)."""
+        v = _as_float(values)
+        return self._reduceat(_np.fmin if v.dtype.kind == "f" else _np.minimum, v)
+
+    def first(self, values) -> _np.ndarray:
+        """First non-NaN value per leg (`transform("first")`)."""
+        return self._pick(values, last=False)
+
+    def last(self, values) -> _np.ndarray:
+        """Last non-NaN value per leg (`transform("last")`)."""
+        return self._pick(values, last=True)
+
+    def _pick(self, values, *, last: bool) -> _np.ndarray:
+        v = _as_float(values)
+        if v.dtype.kind not in "fMm" or not _pd.isna(v).any():
+            return v[self.ends if last else self.starts]
+        pos = self._first_hit(~_pd.isna(v), last=last)
+        out = v[self.starts].copy()
+        out[pos < 0] = _np.nan if v.dtype.kind == "f" else v.dtype.type("NaT")
+        out[pos >= 0] = v[pos[pos >= 0]]
+        return out
+
+    def argmax(self, values, *, tie_breaker: Literal["first", "last"] = "first") -> _np.ndarray:
+        """
+        Row position of each leg's max (NaN skipped; -1 for all-NaN legs).
+        tie_breaker="first" matches `idxmax`.
+        """
+        return self._arg_extreme(values, self.max(values), tie_breaker)
+
+    def argmin(self, values, *, tie_breaker: Literal["first", "last"] = "first") -> _np.ndarray:
+        """Row position of each leg's min (see `argmax`)."""
+        return self._arg_extreme(values, self.min(values), tie_breaker)
+
+    def _arg_extreme(self, values, extreme: _np.ndarray, tie_breaker: str) -> _np.ndarray:
+        v = _as_float(values)
+        target = self.broadcast(extreme)
+        return self._first_hit(v == target, last=tie_breaker == "last")
+
+    def _first_hit(self, hit: _np.ndarray, *, last: bool) -> _np.ndarray:
+        """
+        Row position of the first (or last) True of `hit` per leg, -1 if none.
+        """
+        hit = hit & self.in_leg
+        rows = _np.flatnonzero(hit)
+        out = _np.full(self.n_legs, -1, dtype=_np.intp)
+        if len(rows) == 0:
+            return out
+
+        leg = _np.searchsorted(self.starts, rows, side="right") - 1
+        if last:
+            take = _np.append(leg[1:] != leg[:-1], True)
+        else:
+            take = _np.insert(leg[1:] != leg[:-1], 0, True)
+        out[leg[take]] = rows[take]
+        return out
+
+    def mark(self, rows: _np.ndarray) -> _np.ndarray:
+        """Boolean row mask with True at the given per-leg row positions (-1 ignored)."""
+        out = _np.zeros(self.n_rows, dtype=bool)
+        out[rows[rows >= 0]] = True
+        return out
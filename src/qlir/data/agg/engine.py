@@ -13,6 +13,7 @@ from qlir.data.agg.atomic import atomic_rename, atomic_write_json
 from qlir.data.agg.manifest import AggManifest
 from qlir.data.agg.paths import DatasetPaths
 from qlir.data.agg.schema_binance_klines import load_binance_kline_slice_json
+from qlir.telemetry import heartbeat, latency_trace
 
 log = logging.getLogger(__name__)
 
@@ -167,6 +168,18 @@ def _set_head_items(
     }
 
 
+def _update_trace(agg: AggManifest, frames: list[_pd.DataFrame]) -> None:
+    """
+    Carry the newest closed candle's latency trace (raw slice meta, see the
+    loaders) into the manifest, stamped "aggregated" the first time a
+    manifest write covers that candle. Call right before writing the manifest.
+    """
+    newest = latency_trace.newest(df.attrs.get("trace") for df in frames)
+    trace = latency_trace.carry(agg.data.get("trace"), newest, "aggregated")
+    if trace is not None:
+        agg.data["trace"] = trace
+
+
 def _next_part_index(agg: AggManifest) -> int:
     parts = agg.data.get("parts", [])
     if not isinstance(parts, list):
@@ -305,6 +318,7 @@ def create_or_update_parquet_chunk(
         _set_head_items(agg, None, head_df=None)
 
     # Persist manifest once at the end (includes new parts + head changes)
+    _update_trace(agg, new_frames)
     atomic_write_json(paths.agg_manifest_path, agg.data)
     log.debug("manifest updated")
 
@@ -358,6 +372,7 @@ def refresh_head_from_raw(
 
     write_parquet_atomic(combined, _head_path(paths))
     _set_head_items(agg, new_items, head_df=combined)
+    _update_trace(agg, frames)
     atomic_write_json(paths.agg_manifest_path, agg.data)
 
     log.debug("[agg] refreshed head (%d slices, %d rows)", len(new_items), len(combined))
@@ -383,6 +398,7 @@ def run_agg_daemon(
     paths.agg_parts_dir.mkdir(parents=True, exist_ok=True)
 
     while True:
+        heartbeat.begin()
         log.info("inside true")
         raw_manifest = wait_load_manifest_json_no_serialize(paths.raw_manifest_path)
         agg = AggManifest.load_or_init(paths.agg_manifest_path, dataset_meta)
@@ -403,6 +419,7 @@ def run_agg_daemon(
             )
 
         if not todo:
+            heartbeat.beat()
             time.sleep(cfg.sleep_idle_s)
             continue
 
@@ -435,3 +452,5 @@ def run_agg_daemon(
             )
             # If we made progress, poll soon (lets us quickly seal head if more arrived)
             print("next iteration")
+
+        heartbeat.beat()
@@ -53,4 +53,8 @@ def load_binance_kline_slice_json(path: Path) -> _pd.DataFrame:
         df[c] = df[c].astype("float64")
 
     # 'ignore' can remain object or be dropped; keep it for fidelity
+
+    # latency trace of the slice's newest closed candle (see qlir.telemetry.latency_trace)
+    meta = full_file.get("meta")
+    df.attrs["trace"] = meta.get("trace") if isinstance(meta, dict) else None
     return df
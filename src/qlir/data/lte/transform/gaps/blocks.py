@@ -1,41 +1,43 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Tuple
 
+import numpy as _np
 import pandas as _pd
 
 from .materialization.markers import ROW_MATERIALIZED_COL
 from .types import MissingBlock
 
 
-def find_missing_blocks(df: _pd.DataFrame) -> List[MissingBlock]:
+def find_missing_block_bounds(df: _pd.DataFrame) -> Tuple[_np.ndarray, _np.ndarray]:
     """
-    Find contiguous blocks of materialized (missing) rows.
-
-    Assumes `materialize_missing_rows` has already been run and that
-    the internal marker column exists.
+    Find contiguous blocks of materialized (missing) rows as arrays.
 
-    Returns blocks as index ranges [start_idx, end_idx], inclusive.
+    Returns (starts, ends): positional row indices, both inclusive, in
+    ascending order. Computed with a single diff over the marker column.
     """
     if ROW_MATERIALIZED_COL not in df.columns:
         raise KeyError(
             f"Expected internal column '{ROW_MATERIALIZED_COL}' not found"
         )
 
-    mask = df[ROW_MATERIALIZED_COL].values
+    mask = df[ROW_MATERIALIZED_COL].to_numpy(dtype=bool)
 
-    blocks: List[MissingBlock] = []
-    start: int | None = None
+    edges = _np.diff(_np.concatenate(([False], mask, [False])).astype(_np.int8))
+    starts = _np.flatnonzero(edges == 1)
+    ends = _np.flatnonzero(edges == -1) - 1
 
-    for i, is_missing in enumerate(mask):
-        if is_missing and start is None:
-            start = i
-        elif not is_missing and start is not None:
-            blocks.append(MissingBlock(start, i - 1))
-            start = None
+    return starts, ends
 
-    # Trailing block
-    if start is not None:
-        blocks.append(MissingBlock(start, len(mask) - 1))
 
-    return blocks
+def find_missing_blocks(df: _pd.DataFrame) -> List[MissingBlock]:
+    """
+    Find contiguous blocks of materialized (missing) rows.
+
+    Assumes `materialize_missing_rows` has already been run and that
+    the internal marker column exists.
+
+    Returns blocks as index ranges [start_idx, end_idx], inclusive.
+    """
+    starts, ends = find_missing_block_bounds(df)
+    return [MissingBlock(int(s), int(e)) for s, e in zip(starts, ends)]
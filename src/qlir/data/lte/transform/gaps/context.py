@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from typing import Tuple
 
+import numpy as _np
 import pandas as _pd
 
 from qlir.core.constants import DEFAULT_OHLC_COLS
-from qlir.data.lte.transform.policy.base import FillContext
+from qlir.data.lte.transform.policy.base import FillBatch, FillContext
 
 from .blocks import MissingBlock
 from .materialization.markers import ROW_MATERIALIZED_COL
@@ -122,6 +123,77 @@ def build_fill_context(
     )
 
 
+def build_fill_batch(
+    *,
+    df: _pd.DataFrame,
+    starts: _np.ndarray,
+    ends: _np.ndarray,
+    ohlc_cols: Tuple[str, str, str, str] = DEFAULT_OHLC_COLS,
+    interval_s: int,
+    strict: bool = True,
+) -> FillBatch:
+    """
+    Build a FillBatch covering every missing block at once.
+
+    Enforces the same invariants as `build_fill_context`, checked with
+    array operations over all blocks instead of per-block row lookups.
+    `starts` / `ends` must be maximal runs of materialized rows (as returned
+    by `find_missing_block_bounds`), which makes the "boundary rows are
+    real" and "block rows are all materialized" invariants hold by
+    construction.
+    """
+    starts = _np.asarray(starts, dtype=_np.int64)
+    ends = _np.asarray(ends, dtype=_np.int64)
+
+    if not isinstance(df.index, _pd.DatetimeIndex):
+        raise TypeError("DataFrame must be indexed by DatetimeIndex.")
+
+    # ------------------------------------------------------------------
+    # Invariant 1: no block may touch dataset boundaries
+    # ------------------------------------------------------------------
+    if len(starts) and (starts[0] == 0 or ends[-1] == len(df) - 1):
+        raise ValueError(
+            "Cannot build FillContext for block touching dataset boundary "
+            "(would require extrapolation)."
+        )
+
+    lengths = ends - starts + 1
+    block_first = _np.cumsum(lengths) - lengths
+    offsets = _np.arange(int(lengths.sum())) - _np.repeat(block_first, lengths)
+    positions = _np.repeat(starts, lengths) + offsets
+
+    timestamps = df.index[positions]
+
+    if strict and len(positions):
+        # --------------------------------------------------------------
+        # Invariant 4: timestamps strictly contiguous at interval_s
+        # --------------------------------------------------------------
+        step = _np.timedelta64(interval_s, "s")
+        within_block = offsets[1:] != 0
+        if not (_np.diff(timestamps.to_numpy())[within_block] == step).all():
+            raise ValueError(
+                "Block timestamps are not strictly contiguous at interval_s."
+            )
+
+        # --------------------------------------------------------------
+        # Invariant 5: no OHLC values present inside any block
+        # --------------------------------------------------------------
+        ohlc_block = df[list(ohlc_cols)].iloc[positions]
+        if not ohlc_block.isna().all().all():
+            raise ValueError(
+                "Block contains OHLC values; refusing to overwrite observed data."
+            )
+
+    return FillBatch(
+        starts=starts,
+        ends=ends,
+        left=df.iloc[starts - 1],
+        right=df.iloc[ends + 1],
+        timestamps=timestamps,
+        interval_s=interval_s,
+    )
+
+
 def _collect_real_window(
     *,
     df: _pd.DataFrame,
@@ -15,8 +15,8 @@ from qlir.perf.df_copy import df_copy_measured
 from qlir.perf.logging import log_memory_info
 
 from ...policy.base import FillPolicy
-from ..blocks import find_missing_blocks
-from ..context import build_fill_context
+from ..blocks import find_missing_block_bounds, find_missing_blocks
+from ..context import build_fill_batch, build_fill_context
 from .markers import FILL_POLICY_COL, SYNTHETIC_COL
 
 
@@ -38,11 +38,15 @@ def apply_fill_policy(
 
     This function:
     - finds contiguous missing blocks
-    - builds FillContext objects
+    - builds FillContext objects (or a single FillBatch)
     - delegates OHLC generation to the policy
     - writes values back into the DataFrame
     - tags synthetic rows
 
+    Policies with `supports_batch = True` receive every block at once via
+    `generate_batch` and results are written back with one positional
+    assignment per column. Other policies go through the per-block path.
+
     Parameters
     ----------
     df : _pd.DataFrame
@@ -76,6 +80,15 @@ def apply_fill_policy(
     if FILL_POLICY_COL not in out.columns:
         out[FILL_POLICY_COL] = None
 
+    if getattr(policy, "supports_batch", False):
+        return _apply_fill_policy_batch(
+            out,
+            ohlc_cols=ohlc_cols,
+            interval_s=interval_s,
+            policy=policy,
+            strict=strict,
+        )
+
     blocks = find_missing_blocks(out)
 
     for block in blocks:
@@ -107,3 +120,43 @@ def apply_fill_policy(
         out.loc[idx, FILL_POLICY_COL] = policy.name
 
     return out
+
+
+def _apply_fill_policy_batch(
+    out: _pd.DataFrame,
+    *,
+    ohlc_cols: OHLC_Cols,
+    interval_s: int,
+    policy: FillPolicy,
+    strict: bool,
+) -> _pd.DataFrame:
+    """
+    Fill every missing block of `out` (already a private copy) in one pass.
+    """
+    starts, ends = find_missing_block_bounds(out)
+    if len(starts) == 0:
+        return out
+
+    batch = build_fill_batch(
+        df=out,
+        starts=starts,
+        ends=ends,
+        ohlc_cols=ohlc_cols,
+        interval_s=interval_s,
+        strict=strict,
+    )
+
+    generated = policy.generate_batch(batch)
+
+    if generated.empty:
+        return out
+
+    rows = batch.positions
+
+    for col, gen_col in zip(ohlc_cols, ("open", "high", "low", "close")):
+        out.iloc[rows, out.columns.get_loc(col)] = generated[gen_col].to_numpy()
+
+    out.iloc[rows, out.columns.get_loc(SYNTHETIC_COL)] = True
+    out.iloc[rows, out.columns.get_loc(FILL_POLICY_COL)] = policy.name
+
+    return out
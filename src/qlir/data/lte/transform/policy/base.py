@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Sequence
 
+import numpy as _np
 import pandas as _pd
 
 
@@ -16,8 +17,61 @@ class FillContext:
     right_window: Sequence[_pd.Series]
 
 
+@dataclass
+class FillBatch:
+    """
+    All missing blocks of a frame, described at once.
+
+    Blocks are contiguous runs of materialized rows given as positional
+    [start, end] ranges (inclusive), in ascending order. `left` / `right`
+    hold the real boundary row for each block (row `start - 1` / `end + 1`),
+    and `timestamps` is the concatenation of every block's timestamps in
+    block order.
+    """
+    starts: _np.ndarray
+    ends: _np.ndarray
+    left: _pd.DataFrame
+    right: _pd.DataFrame
+    timestamps: _pd.DatetimeIndex
+    interval_s: int
+
+    @property
+    def lengths(self) -> _np.ndarray:
+        return self.ends - self.starts + 1
+
+    @property
+    def block_ids(self) -> _np.ndarray:
+        """Block number for every row in `timestamps`."""
+        return _np.repeat(_np.arange(len(self.starts)), self.lengths)
+
+    @property
+    def offsets(self) -> _np.ndarray:
+        """0-based position of every row in `timestamps` within its block."""
+        lengths = self.lengths
+        block_first = _np.cumsum(lengths) - lengths
+        return _np.arange(int(lengths.sum())) - _np.repeat(block_first, lengths)
+
+    @property
+    def positions(self) -> _np.ndarray:
+        """Positional row index (in the source frame) of every row in `timestamps`."""
+        return _np.repeat(self.starts, self.lengths) + self.offsets
+
+
 class FillPolicy:
     name: str
 
+    # Policies that implement `generate_batch` set this to True so
+    # `apply_fill_policy` fills every block in one vectorized pass.
+    supports_batch: bool = False
+
     def generate(self, ctx: FillContext) -> _pd.DataFrame:
         raise NotImplementedError
+
+    def generate_batch(self, batch: FillBatch) -> _pd.DataFrame:
+        """
+        Generate synthetic OHLC rows for every block in `batch`.
+
+        Must return a frame indexed by `batch.timestamps` with the same
+        columns (and values) that `generate` would produce block by block.
+        """
+        raise NotImplementedError
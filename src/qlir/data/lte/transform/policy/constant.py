@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import numpy as _np
 import pandas as _pd
 
-from .base import FillContext, FillPolicy
+from .base import FillBatch, FillContext, FillPolicy
 
 
 class ConstantFillPolicy(FillPolicy):
@@ -13,6 +14,7 @@ class ConstantFillPolicy(FillPolicy):
     """
 
     name = "constant"
+    supports_batch = True
 
     def generate(self, ctx: FillContext) -> _pd.DataFrame:
         if len(ctx.timestamps) == 0:
@@ -36,3 +38,19 @@ class ConstantFillPolicy(FillPolicy):
             _pd.DataFrame(rows)
             .set_index("timestamp")
         )
+
+    def generate_batch(self, batch: FillBatch) -> _pd.DataFrame:
+        if len(batch.timestamps) == 0:
+            return _pd.DataFrame()
+
+        prev_close = _np.repeat(batch.left["close"].to_numpy(), batch.lengths)
+
+        return _pd.DataFrame(
+            {
+                "open": prev_close,
+                "high": prev_close,
+                "low": prev_close,
+                "close": prev_close,
+            },
+            index=batch.timestamps,
+        )
@@ -1,12 +1,14 @@
+import numpy as _np
 import pandas as _pd
 
 from qlir.core.constants import DEFAULT_OHLC_COLS
 from qlir.core.types.OHLC_Cols import OHLC_Cols
-from qlir.data.lte.transform.policy.base import FillContext, FillPolicy
+from qlir.data.lte.transform.policy.base import FillBatch, FillContext, FillPolicy
 
 
 class OrderedSourceFillPolicy(FillPolicy):
     name = "ordered_source_backfill"
+    supports_batch = True
 
     def __init__(
         self,
@@ -64,3 +66,37 @@ class OrderedSourceFillPolicy(FillPolicy):
                     break
 
         return out
+
+    def generate_batch(self, batch: FillBatch) -> _pd.DataFrame:
+        """
+        Vectorized equivalent of `generate` over every block in `batch`.
+
+        Each source is aligned to the missing timestamps once; the first
+        fallback with a complete OHLC row wins. Timestamps absent from a
+        source are treated as unavailable in that source.
+        """
+        ts = batch.timestamps
+        cols = list(self.ohlc_cols)
+
+        _, primary_df = self.sources[0]
+        remaining = (
+            primary_df.reindex(ts)[cols].isna().any(axis=1).to_numpy(copy=True)
+        )
+
+        values = _np.full((len(ts), len(cols)), _np.nan, dtype="float64")
+        filled_from = _np.full(len(ts), None, dtype=object)
+
+        for source_name, src_df in self.sources[1:]:
+            if not remaining.any():
+                break
+
+            src_vals = src_df.reindex(ts)[cols].to_numpy(dtype="float64")
+            take = remaining & ~_np.isnan(src_vals).any(axis=1)
+
+            values[take] = src_vals[take]
+            filled_from[take] = source_name
+            remaining &= ~take
+
+        out = _pd.DataFrame(values, index=ts, columns=cols)
+        out[self.source_col] = filled_from
+        return out
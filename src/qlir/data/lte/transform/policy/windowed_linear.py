@@ -3,7 +3,7 @@ from __future__ import annotations
 import numpy as _np
 import pandas as _pd
 
-from .base import FillContext, FillPolicy
+from .base import FillBatch, FillContext, FillPolicy
 
 
 class WindowedLinearFillPolicy(FillPolicy):
@@ -17,6 +17,7 @@ class WindowedLinearFillPolicy(FillPolicy):
     """
 
     name = "windowed_linear"
+    supports_batch = True
 
     def __init__(
         self,
@@ -105,6 +106,59 @@ class WindowedLinearFillPolicy(FillPolicy):
             .set_index("timestamp")
         )
 
+    def generate_batch(self, batch: FillBatch) -> _pd.DataFrame:
+        """
+        Vectorized equivalent of `generate` over every block in `batch`.
+
+        Reproduces `np.linspace(left.close, right.open, n + 2)[1:-1]` per
+        block as `(k + 1) * step + left.close`, which is the same float
+        arithmetic linspace performs, so output matches `generate` exactly.
+        """
+        if len(batch.timestamps) == 0:
+            return _pd.DataFrame()
+
+        lengths = batch.lengths
+        block_ids = batch.block_ids
+        offsets = batch.offsets
+
+        left_close = batch.left["close"].to_numpy(dtype=float)
+        right_open = batch.right["open"].to_numpy(dtype=float)
+
+        # --------------------------------------------------------------
+        # 1. Linear close path (per block, flattened)
+        # --------------------------------------------------------------
+        step = (right_open - left_close) / (lengths + 1)
+        closes = (offsets + 1) * step[block_ids] + left_close[block_ids]
+
+        # --------------------------------------------------------------
+        # 2. Volatility per block (see `_estimate_volatility`)
+        # --------------------------------------------------------------
+        sigma = _np.abs(right_open - left_close)
+        if self.min_vol is not None:
+            sigma = _np.maximum(sigma, self.min_vol)
+        sigma = sigma * self.vol_scale
+        sigma_rows = sigma[block_ids]
+
+        # --------------------------------------------------------------
+        # 3. OHLC: open is the previous close (left.close for first row)
+        # --------------------------------------------------------------
+        opens = _np.empty_like(closes)
+        opens[1:] = closes[:-1]
+        opens[offsets == 0] = left_close
+
+        highs = _np.maximum(opens, closes) + sigma_rows
+        lows = _np.minimum(opens, closes) - sigma_rows
+
+        return _pd.DataFrame(
+            {
+                "open": opens,
+                "high": highs,
+                "low": lows,
+                "close": closes,
+            },
+            index=batch.timestamps,
+        )
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
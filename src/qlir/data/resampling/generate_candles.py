@@ -10,6 +10,11 @@ from qlir.data.quality.candles.candles import (
     ensure_homogeneous_candle_size,
     infer_freq,
 )
+from qlir.data.resampling.multi_timeframe import (
+    can_resample_fast,
+    resample_ohlcv_multi,
+    unit_size_ns,
+)
 from qlir.df.utils import materialize_index, move_column
 from qlir.logging.logdf import logdf
 from qlir.time.ensure_utc import ensure_utc_series_strict_string
@@ -17,6 +22,42 @@ from qlir.time.timefreq import TimeFreq, TimeUnit
 
 log = logging.getLogger(__name__)
 
+# map TimeFreq unit strings to pandas suffixes
+_UNIT_TO_SYMBOL = {
+    "second": "S",
+    "minute": "min",
+    "hour": "h",
+    "day": "D",
+}
+
+
+def _freq_key(out_unit: TimeUnit, size: int) -> str:
+    """Output dict key / pandas freq string for `size` × `out_unit` (e.g. "15min")."""
+    if out_unit.value not in _UNIT_TO_SYMBOL:
+        raise ValueError(f"Unsupported out_unit: {out_unit.value}")
+    return f"{size}{_UNIT_TO_SYMBOL[out_unit.value]}"
+
+
+def _finalize_candles(
+    candles: _pd.DataFrame,
+    *,
+    freq_str: str,
+    dataset_tf: TimeFreq,
+    dt_col: str,
+) -> _pd.DataFrame:
+    """Materialize the timestamp column and add the meta__ columns (in place)."""
+    # materialize the timestamp column 
+    candles = materialize_index(candles, dt_col)
+    
+    # add metadata columns so downstream knows what happened
+    candles["meta__candle_freq"] = freq_str
+    candles["meta__derived_from_freq"] = dataset_tf.as_pandas_str  # e.g. "1min"
+    
+    candles = move_column(candles, "meta__candle_freq", 0)
+    candles = move_column(candles, "meta__derived_from_freq", 0)
+    return candles
+
+
 def _generate(
     df: _pd.DataFrame,
     *,
@@ -46,6 +87,13 @@ def _generate(
     -------
     dict[str, _pd.DataFrame]
         Keys are pandas-style frequency strings (e.g. "7min", "4H").
+
+    Notes
+    -----
+    NaN-free UTC data goes through `multi_timeframe.resample_ohlcv_multi`,
+    which bins all sizes with epoch arithmetic in one pass (building coarser
+    sizes from finer ones). Anything else falls back to one
+    `df.resample(freq)` per size.
     """
 
     # ensure datetime index
@@ -64,41 +112,26 @@ def _generate(
         "volume": "sum",
     }
 
-    # map TimeFreq unit strings to pandas suffixes
-    unit_to_symbol = {
-        "second": "S",
-        "minute": "min",
-        "hour": "h",
-        "day": "D",
+    sizes_ns = {
+        _freq_key(out_unit, size): unit_size_ns(out_unit.value, size)
+        for size in out_candle_sizes
     }
 
-    if out_unit.value not in unit_to_symbol:
-        raise ValueError(f"Unsupported out_unit: {out_unit.value}")
+    if can_resample_fast(df):
+        resampled = resample_ohlcv_multi(df, sizes_ns)
+    else:
+        resampled = {
+            freq_str: df.resample(freq_str).agg(ohlc_map).dropna(how="any")
+            for freq_str in sizes_ns
+        }
 
     out: Dict[str, _pd.DataFrame] = {}
 
-    for size in out_candle_sizes:
-        freq_str = f"{size}{unit_to_symbol[out_unit.value]}"
-
-        candles = (
-            df
-            .resample(freq_str)
-            .agg(ohlc_map)
-            .dropna(how="any")
+    for freq_str, candles in resampled.items():
+        out[freq_str] = _finalize_candles(
+            candles, freq_str=freq_str, dataset_tf=dataset_tf, dt_col=dt_col
         )
 
-        # materialize the timestamp column 
-        candles = materialize_index(candles, dt_col)
-        
-        # add metadata columns so downstream knows what happened
-        candles["meta__candle_freq"] = freq_str
-        candles["meta__derived_from_freq"] = dataset_tf.as_pandas_str  # e.g. "1min"
-        
-        candles = move_column(candles, "meta__candle_freq", 0)
-        candles = move_column(candles, "meta__derived_from_freq", 0)
-
-        out[freq_str] = candles
-
     return out
 
 
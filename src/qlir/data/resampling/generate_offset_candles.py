@@ -1,7 +1,109 @@
-from typing import Dict
+from collections.abc import Mapping
+from typing import Iterator
 
 import pandas as _pd
 
+from qlir.data.resampling.multi_timeframe import (
+    OHLCVBars,
+    bars_from_frame,
+    bars_to_frame,
+    can_resample_fast,
+    reduce_bars,
+    start_day_origin_ns,
+)
+
+# standard OHLCV
+_OHLC_MAP = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "volume": "sum",
+}
+
+
+class OffsetCandles(Mapping):
+    """
+    Read-only mapping of "<freq>@<offset>" → phase-shifted candles.
+
+    Every phase is computed on access from one shared, sorted base (NumPy
+    views of the base columns, no per-offset frame copies), so memory stays
+    flat no matter how large `period` is. Nothing is cached: hold on to the
+    frames you need, or call `dict(...)` to materialize all of them.
+    """
+
+    def __init__(
+        self,
+        df: _pd.DataFrame,
+        *,
+        period: int,
+        freq_str: str,
+        step: _pd.Timedelta,
+    ):
+        self._df = df
+        self._period = period
+        self._freq_str = freq_str
+        self._step_ns = int(step.value)
+        self._size_ns = self._step_ns * period
+
+        self._fast = can_resample_fast(df)
+        self._base: OHLCVBars | None = bars_from_frame(df) if self._fast else None
+
+    def __len__(self) -> int:
+        return self._period
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._key(offset) for offset in range(self._period))
+
+    def __getitem__(self, key: str) -> _pd.DataFrame:
+        offset = self._parse_offset(key)
+        candles = self._fast_phase(offset) if self._fast else self._resample_phase(offset)
+        candles["candle_freq"] = self._freq_str
+        candles["offset"] = offset
+        return candles
+
+    def _key(self, offset: int) -> str:
+        return f"{self._freq_str}@{offset}"
+
+    def _parse_offset(self, key: str) -> int:
+        freq_str, sep, offset_str = str(key).partition("@")
+        if sep != "@" or freq_str != self._freq_str or not offset_str.isdigit():
+            raise KeyError(key)
+        offset = int(offset_str)
+        if offset >= self._period:
+            raise KeyError(key)
+        return offset
+
+    def _fast_phase(self, offset: int) -> _pd.DataFrame:
+        """
+        Same bins as resampling the index shifted by `offset` steps, but
+        computed on the unshifted base: bucket = (t + shift - origin) // size
+        with origin = midnight of the first *shifted* timestamp.
+        """
+        base = self._base
+        shift_ns = self._step_ns * offset
+
+        if len(base) == 0:
+            return self._resample_phase(offset)
+
+        origin_ns = start_day_origin_ns(int(base.labels_ns[0]) + shift_ns)
+        bars, has_empty = reduce_bars(base, origin_ns=origin_ns - shift_ns, size_ns=self._size_ns)
+        # labels are in unshifted coordinates; move only the (small) bar array
+        bars.labels_ns = bars.labels_ns + shift_ns
+
+        return bars_to_frame(
+            bars,
+            size_ns=self._size_ns,
+            has_empty=has_empty,
+            tz=self._df.index.tz,
+            unit=self._df.index.unit,
+            name=self._df.index.name,
+        )
+
+    def _resample_phase(self, offset: int) -> _pd.DataFrame:
+        shifted = self._df.set_axis(self._df.index + _pd.Timedelta(self._step_ns * offset, unit="ns"))
+        return shifted.resample(self._freq_str).agg(_OHLC_MAP).dropna(how="any")
+
 
 def generate_offset_candles(
     df: _pd.DataFrame,
@@ -9,32 +111,26 @@ def generate_offset_candles(
     period: int,
     unit: str = "minute",
     dt_col: str = "timestamp",
-) -> Dict[str, _pd.DataFrame]:
+) -> Mapping[str, _pd.DataFrame]:
     """
     From base-frequency data (usually 1m), generate all phase-shifted
     versions of a single period, e.g. all 7-minute alignments.
 
-    Returns dict like:
+    Returns dict-like (an `OffsetCandles` mapping) like:
       {
         "7min@0": df0,
         "7min@1": df1,
         ...
         "7min@6": df6,
       }
+
+    Each phase is built lazily from one sorted copy of the base data when it
+    is accessed, instead of copying and resampling the frame once per offset.
     """
     if df.index.name != dt_col:
         df = df.set_index(_pd.DatetimeIndex(df[dt_col], name=dt_col))
     df = df.sort_index()
 
-    # standard OHLCV
-    ohlc_map = {
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-    }
-
     # turn (period, unit) into pandas freq
     if unit == "minute":
         freq_str = f"{period}min"
@@ -45,15 +141,4 @@ def generate_offset_candles(
     else:
         raise ValueError("for offsets we usually want minute/second base")
 
-    out: Dict[str, _pd.DataFrame] = {}
-
-    for offset in range(period):
-        shifted = df.copy()
-        shifted.index = shifted.index + step * offset
-        candles = shifted.resample(freq_str).agg(ohlc_map).dropna(how="any")
-        candles["candle_freq"] = freq_str
-        candles["offset"] = offset
-        key = f"{freq_str}@{offset}"
-        out[key] = candles
-
-    return out
+    return OffsetCandles(df, period=period, freq_str=freq_str, step=step)
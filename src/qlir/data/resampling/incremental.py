@@ -0,0 +1,184 @@
+"""
+Incremental (live) maintenance of higher-timeframe candles.
+
+`generate_candles_from_1m` rebuilds every bar from the full history. For a
+live loop that only ever appends base candles, `IncrementalResampler` keeps
+the open (partial) bar per timeframe and, on each `update`, reduces just the
+new base rows, merges them into the open bar and returns the bars that
+changed. Cost per update is O(new candles × timeframes).
+
+Callers upsert the returned rows by bar-open time (`dt_col`): the first row
+per timeframe may replace the previously returned partial bar, the last row
+is the new open bar, and anything in between is closed.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable
+
+import numpy as _np
+import pandas as _pd
+
+from qlir.data.resampling.generate_candles import _finalize_candles, _freq_key
+from qlir.data.resampling.multi_timeframe import (
+    OHLCVBars,
+    bars_from_frame,
+    bars_to_frame,
+    can_resample_fast,
+    reduce_bars,
+    start_day_origin_ns,
+    unit_size_ns,
+)
+from qlir.time.timefreq import TimeFreq, TimeUnit
+
+log = logging.getLogger(__name__)
+
+
+class IncrementalResampler:
+    """
+    Stateful OHLCV resampler for append-only base candles.
+
+    Bins match `generate_candles_from_1m` over the same history: bars are
+    anchored at midnight (UTC) of the first base candle ever passed to
+    `update` (pandas' `origin="start_day"`).
+
+    Parameters
+    ----------
+    out_unit : TimeUnit
+        Target unit for `out_candle_sizes`.
+    out_candle_sizes : iterable[int]
+        Multipliers of `out_unit` to maintain (e.g. [5, 15] minutes).
+    dataset_tf : TimeFreq
+        Cadence of the base candles (used for `meta__derived_from_freq`).
+    dt_col : str
+        Datetime column (or index name) of the base candles.
+    """
+
+    def __init__(
+        self,
+        *,
+        out_unit: TimeUnit,
+        out_candle_sizes: Iterable[int],
+        dataset_tf: TimeFreq = TimeFreq(1, TimeUnit.MINUTE),
+        dt_col: str = "tz_start",
+    ):
+        self.dataset_tf = dataset_tf
+        self.dt_col = dt_col
+        self.sizes_ns: Dict[str, int] = {
+            _freq_key(out_unit, size): unit_size_ns(out_unit.value, size)
+            for size in out_candle_sizes
+        }
+
+        self._origin_ns: int | None = None
+        self._last_ts_ns: int | None = None
+        self._open_bars: Dict[str, OHLCVBars] = {}
+        self._tz = None
+        self._unit = "ns"
+
+    @property
+    def last_ts(self) -> _pd.Timestamp | None:
+        """Timestamp of the last base candle consumed (None before the first update)."""
+        if self._last_ts_ns is None:
+            return None
+        return _pd.Timestamp(self._last_ts_ns, unit="ns", tz=self._tz)
+
+    def update(self, new_candles: _pd.DataFrame) -> Dict[str, _pd.DataFrame]:
+        """
+        Consume newly appended base candles.
+
+        Parameters
+        ----------
+        new_candles : _pd.DataFrame
+            Base candles strictly after `last_ts`, either indexed by `dt_col`
+            or carrying it as a column. Must be NaN-free OHLCV with UTC times.
+
+        Returns
+        -------
+        dict[str, _pd.DataFrame]
+            Per timeframe, the changed bars in `generate_candles_from_1m`
+            format (empty frames are omitted).
+        """
+        df = self._normalize(new_candles)
+        if df.empty:
+            return {}
+
+        chunk = bars_from_frame(df)
+        first_ns = int(chunk.labels_ns[0])
+
+        if self._last_ts_ns is not None and first_ns <= self._last_ts_ns:
+            raise ValueError(
+                f"IncrementalResampler.update expects candles after {self.last_ts}, "
+                f"got {df.index[0]}"
+            )
+
+        if self._origin_ns is None:
+            self._origin_ns = start_day_origin_ns(first_ns)
+            self._tz = df.index.tz
+            self._unit = df.index.unit
+
+        out: Dict[str, _pd.DataFrame] = {}
+        for freq_str, size_ns in self.sizes_ns.items():
+            bars, _ = reduce_bars(chunk, origin_ns=self._origin_ns, size_ns=size_ns)
+            bars = self._merge_open_bar(freq_str, bars)
+            self._open_bars[freq_str] = _tail_bar(bars)
+
+            candles = bars_to_frame(
+                bars,
+                size_ns=size_ns,
+                has_empty=False,
+                tz=self._tz,
+                unit=self._unit,
+            )
+            out[freq_str] = _finalize_candles(
+                candles, freq_str=freq_str, dataset_tf=self.dataset_tf, dt_col=self.dt_col
+            )
+
+        self._last_ts_ns = int(chunk.labels_ns[-1])
+        return out
+
+    def _normalize(self, new_candles: _pd.DataFrame) -> _pd.DataFrame:
+        df = new_candles
+        if df.index.name != self.dt_col:
+            if self.dt_col not in df.columns:
+                raise KeyError(f"'{self.dt_col}' is neither the index nor a column")
+            df = df.set_index(self.dt_col)
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+
+        if len(df) and not can_resample_fast(df):
+            raise ValueError(
+                "IncrementalResampler needs NaN-free numeric OHLCV columns "
+                "indexed by UTC (or naive) datetimes"
+            )
+        return df
+
+    def _merge_open_bar(self, freq_str: str, bars: OHLCVBars) -> OHLCVBars:
+        """
+        Fold the carried-over open bar into the first new bar if they share a
+        bucket; otherwise the open bar was already final and is left as is.
+        """
+        prev = self._open_bars.get(freq_str)
+        if prev is None or prev.labels_ns[0] != bars.labels_ns[0]:
+            return bars
+
+        # reduce_bars returns fresh arrays (fancy indexing / reduceat), so
+        # writing into them does not touch the caller's base data.
+        bars.open[0] = prev.open[0]
+        bars.high[0] = max(prev.high[0], bars.high[0])
+        bars.low[0] = min(prev.low[0], bars.low[0])
+        bars.volume[0] = prev.volume[0] + bars.volume[0]
+        return bars
+
+
+def _tail_bar(bars: OHLCVBars) -> OHLCVBars:
+    """Copy of the last bar (the one still open after this update)."""
+    last = slice(len(bars) - 1, len(bars))
+    return OHLCVBars(
+        labels_ns=_np.array(bars.labels_ns[last]),
+        open=_np.array(bars.open[last]),
+        high=_np.array(bars.high[last]),
+        low=_np.array(bars.low[last]),
+        close=_np.array(bars.close[last]),
+        volume=_np.array(bars.volume[last]),
+    )
@@ -0,0 +1,278 @@
+"""
+Single-pass, multi-timeframe OHLCV resampling on NumPy arrays.
+
+`df.resample(freq).agg(...)` rescans (and re-bins) the whole base frame for
+every target size. Here every timestamp is mapped to an integer bucket id with
+epoch arithmetic::
+
+    bucket = (t - origin) // size
+
+and, because the base is sorted, each bucket is a contiguous run of rows. The
+OHLCV reductions then become `reduceat`-style segment kernels:
+
+    open   -> value at run start
+    high   -> np.maximum.reduceat
+    low    -> np.minimum.reduceat
+    close  -> value at run end
+    volume -> np.add.reduceat
+
+Coarser sizes are built from the largest already-computed finer size that
+divides them evenly (e.g. 1h from 15min, 1D from 4h), so an ascending list of
+sizes touches the full base only once.
+
+Bins follow pandas' default `origin="start_day"` (midnight of the first
+timestamp) and `closed="left", label="left"`, so the output matches
+`resample(freq).agg(ohlc_map).dropna(how="any")` for NaN-free, UTC (or naive)
+data. Callers should fall back to pandas when `can_resample_fast` is False.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as _np
+import pandas as _pd
+
+OHLCV_COLS: Tuple[str, str, str, str, str] = ("open", "high", "low", "close", "volume")
+
+_NS_PER_DAY = 86_400 * 1_000_000_000
+
+
+@dataclass
+class OHLCVBars:
+    """
+    Array form of a set of (non-empty) bars.
+
+    `labels_ns` are bar-open timestamps as int64 epoch nanoseconds; the
+    remaining arrays keep the dtype of the base columns.
+    """
+    labels_ns: _np.ndarray
+    open: _np.ndarray
+    high: _np.ndarray
+    low: _np.ndarray
+    close: _np.ndarray
+    volume: _np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.labels_ns)
+
+
+def can_resample_fast(df: _pd.DataFrame) -> bool:
+    """
+    True if `df` can go through the array engine with pandas-identical output:
+    a UTC/naive DatetimeIndex and NaN-free numeric (non-bool) OHLCV columns.
+    """
+    if not isinstance(df.index, _pd.DatetimeIndex):
+        return False
+
+    tz = df.index.tz
+    if tz is not None and str(tz) != "UTC":
+        return False
+
+    for col in OHLCV_COLS:
+        if col not in df.columns:
+            return False
+        s = df[col]
+        if not _pd.api.types.is_numeric_dtype(s) or _pd.api.types.is_bool_dtype(s):
+            return False
+        if isinstance(s.dtype, _pd.api.extensions.ExtensionDtype):
+            return False
+        if s.isna().any():
+            return False
+
+    return True
+
+
+def bars_from_frame(df: _pd.DataFrame) -> OHLCVBars:
+    """
+    View a sorted, DatetimeIndex'ed OHLCV frame as `OHLCVBars` (no copies
+    beyond what `to_numpy` requires).
+    """
+    return OHLCVBars(
+        labels_ns=df.index.as_unit("ns").asi8,
+        open=df["open"].to_numpy(),
+        high=df["high"].to_numpy(),
+        low=df["low"].to_numpy(),
+        close=df["close"].to_numpy(),
+        volume=df["volume"].to_numpy(),
+    )
+
+
+def start_day_origin_ns(first_ns: int) -> int:
+    """
+    pandas' `origin="start_day"` for UTC / naive data: midnight of the first
+    timestamp, as epoch nanoseconds.
+    """
+    return (first_ns // _NS_PER_DAY) * _NS_PER_DAY
+
+
+def bucket_ids(labels_ns: _np.ndarray, *, origin_ns: int, size_ns: int) -> _np.ndarray:
+    """
+    Integer bucket id per timestamp: `(t - origin) // size`.
+    """
+    return (labels_ns - origin_ns) // size_ns
+
+
+def run_starts(ids: _np.ndarray) -> _np.ndarray:
+    """
+    Start position of every run of equal values in a sorted id array.
+    """
+    if len(ids) == 0:
+        return _np.empty(0, dtype=_np.intp)
+    return _np.concatenate(([0], _np.flatnonzero(ids[1:] != ids[:-1]) + 1))
+
+
+def reduce_bars(
+    src: OHLCVBars,
+    *,
+    origin_ns: int,
+    size_ns: int,
+) -> Tuple[OHLCVBars, bool]:
+    """
+    Aggregate `src` (sorted) into bars of `size_ns`.
+
+    Returns the non-empty bars and whether any empty bucket was skipped
+    between the first and last bar (pandas would have produced a NaN row for
+    it, which affects the output dtype of int columns).
+    """
+    if len(src) == 0:
+        return src, False
+
+    ids = bucket_ids(src.labels_ns, origin_ns=origin_ns, size_ns=size_ns)
+    starts = run_starts(ids)
+    ends = _np.append(starts[1:], len(ids)) - 1
+    bucket = ids[starts]
+
+    bars = OHLCVBars(
+        labels_ns=origin_ns + bucket * size_ns,
+        open=src.open[starts],
+        high=_np.maximum.reduceat(src.high, starts),
+        low=_np.minimum.reduceat(src.low, starts),
+        close=src.close[ends],
+        volume=_np.add.reduceat(src.volume, starts),
+    )
+
+    has_empty = bool(bucket[-1] - bucket[0] + 1 != len(bucket))
+    return bars, has_empty
+
+
+def bars_to_frame(
+    bars: OHLCVBars,
+    *,
+    size_ns: int,
+    has_empty: bool,
+    tz,
+    unit: str,
+    name=None,
+) -> _pd.DataFrame:
+    """
+    Build the frame `resample(...).agg(ohlc_map).dropna(how="any")` returns
+    for the same bars (index values, index freq and column dtypes).
+    """
+    cols = {}
+    for col in OHLCV_COLS:
+        arr = getattr(bars, col)
+        # pandas inserts NaN rows for empty buckets before dropna, which
+        # upcasts the first/max/min/last columns (sum fills with 0 instead).
+        if has_empty and col != "volume" and arr.dtype.kind in "iu":
+            arr = arr.astype("float64")
+        cols[col] = arr
+
+    index = _pd.DatetimeIndex(bars.labels_ns.astype("datetime64[ns]"), name=name)
+    if tz is not None:
+        index = index.tz_localize(tz)
+    index = index.as_unit(unit)
+
+    # dropna keeps a freq only when the surviving rows are evenly spaced.
+    step = size_ns
+    if len(bars) > 1:
+        diffs = _np.diff(bars.labels_ns)
+        step = int(diffs[0]) if (diffs == diffs[0]).all() else None
+    if step is not None:
+        index.freq = _pd.tseries.frequencies.to_offset(_pd.Timedelta(step, unit="ns"))
+
+    return _pd.DataFrame(cols, index=index)
+
+
+def resample_ohlcv_multi(
+    df: _pd.DataFrame,
+    sizes_ns: Dict[str, int],
+) -> Dict[str, _pd.DataFrame]:
+    """
+    Resample a sorted OHLCV frame to several sizes at once.
+
+    Parameters
+    ----------
+    df : _pd.DataFrame
+        Sorted, DatetimeIndex'ed frame that passes `can_resample_fast`.
+    sizes_ns : dict[str, int]
+        Output key (e.g. "15min") → bar size in nanoseconds.
+
+    Returns
+    -------
+    dict[str, _pd.DataFrame]
+        Same keys (and order) as `sizes_ns`; frames hold the OHLCV columns
+        only, indexed by bar-open time.
+
+    Notes
+    -----
+    Float volume sums are plain (and, for hierarchical sizes, sums of sums)
+    rather than pandas' compensated summation, so they can differ from
+    `resample().sum()` in the last ulp.
+    """
+    base = bars_from_frame(df)
+    if len(base) == 0:
+        return {
+            key: _pd.DataFrame({c: df[c].iloc[0:0] for c in OHLCV_COLS}, index=df.index[0:0])
+            for key in sizes_ns
+        }
+
+    origin_ns = start_day_origin_ns(int(base.labels_ns[0]))
+
+    built: Dict[int, Tuple[OHLCVBars, bool]] = {}
+    for size_ns in sorted(set(sizes_ns.values())):
+        src = _finest_divisor_source(built, size_ns, base)
+        built[size_ns] = reduce_bars(src, origin_ns=origin_ns, size_ns=size_ns)
+
+    unit = df.index.unit
+    return {
+        key: bars_to_frame(
+            built[size_ns][0],
+            size_ns=size_ns,
+            has_empty=built[size_ns][1],
+            tz=df.index.tz,
+            unit=unit,
+            name=df.index.name,
+        )
+        for key, size_ns in sizes_ns.items()
+    }
+
+
+def _finest_divisor_source(
+    built: Dict[int, Tuple[OHLCVBars, bool]],
+    size_ns: int,
+    base: OHLCVBars,
+) -> OHLCVBars:
+    """
+    Pick the largest already-built size that evenly divides `size_ns`
+    (all sizes share one origin, so its bars nest exactly); else the base.
+    """
+    divisors = [s for s in built if size_ns % s == 0]
+    if not divisors:
+        return base
+    return built[max(divisors)][0]
+
+
+def unit_size_ns(unit_value: str, count: int) -> int:
+    """
+    Bar size in nanoseconds for `count` × a TimeUnit value string.
+    """
+    per_unit_s = {
+        "second": 1,
+        "minute": 60,
+        "hour": 3_600,
+        "day": 86_400,
+    }
+    return int(count) * per_unit_s[unit_value] * 1_000_000_000
+
@@ -15,7 +15,7 @@ log = logging.getLogger(__name__)
 
 
 
-@telemetry(log_path=Path("telemetry/manifest_rebuild.log"), console=True)
+@telemetry(log_path=Path("manifest_rebuild.log"))
 def rebuild_manifest_from_responses(
     *,
     responses_dir: Path,
@@ -1,12 +1,47 @@
 from datetime import datetime
 import json
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
 
 from qlir.data.sources.common.slices.canonical_hash import make_canonical_slice_hash
+from qlir.telemetry import latency_trace
 from qlir.utils.str.color import Ansi, colorize
 from qlir.utils.str.fmt import term_fmt
 from qlir.utils.time.fmt import format_ts_human
 
+# slice_id -> latency trace of its newest closed candle, so re-fetching the
+# growing slice every poll keeps the first receive time of that candle.
+_SLICE_TRACES: Dict[str, dict] = {}
+
+# kline array index of the candle's close time (ms, inclusive)
+_CLOSE_TIME_IDX = 6
+
+
+def _newest_closed_s(data, now_s: float) -> Optional[float]:
+    """Close time (epoch s) of the newest kline in `data` that has closed by `now_s`."""
+    if not isinstance(data, list):
+        return None
+    for row in reversed(data):
+        try:
+            closed = (int(row[_CLOSE_TIME_IDX]) + 1) / 1000
+        except (IndexError, TypeError, ValueError):
+            return None
+        if closed <= now_s:
+            return closed
+    return None
+
+
+def _slice_trace(slice_id: str, data) -> Optional[dict]:
+    now = time.time()
+    trace = latency_trace.carry(
+        _SLICE_TRACES.get(slice_id),
+        latency_trace.start(_newest_closed_s(data, now), received=now),
+        "received",
+    )
+    if trace is not None:
+        _SLICE_TRACES[slice_id] = trace
+    return trace
+
 
 def persist(data, url, request_slice_key, responses_dir, data_root, inspection_result, http_status, requested_at, completed_at) -> Dict:
     # Prep for writing
@@ -39,6 +74,7 @@ def persist(data, url, request_slice_key, responses_dir, data_root, inspection_r
             "requested_at": requested_at,
             "completed_at": completed_at,
             "data_root": str(data_root) if data_root is not None else None,
+            "trace": _slice_trace(canonical_slice_compkey_hashed, data),
         },
         "data": data,
     }
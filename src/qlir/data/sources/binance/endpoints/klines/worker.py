@@ -30,6 +30,7 @@ from qlir.data.sources.common.slices.slice_status_policy import SliceStatusPolic
 from qlir.data.sources.common.slices.slice_status_reason import SliceStatusReason
 from qlir.io.delete import delete_file_if_exists
 from qlir.io.helpers import has_files
+from qlir.telemetry import heartbeat
 from qlir.time.iso import now_utc, parse_iso
 from qlir.utils.str.color import Ansi, colorize
 from qlir.utils.time.fmt import format_ts_human
@@ -146,8 +147,10 @@ def run_klines_worker(
         log.debug("manifest batch update worker logs are turned on. To view, open another terminal and use tail -f %s", manifest_path)
 
     backoff = 1.0
+    last_fetched_end_s: float | None = None
 
     while True:
+        heartbeat.begin()
         # We need the current slice b/c we release this lock and then end of the while loop
         # so that we can reacquire it in the for loop (otherwise it stays locked from previous runs) 
         current_slice_id: str | None = None
@@ -228,6 +231,7 @@ def run_klines_worker(
                 len(active),
             )
             backoff = 1.0
+            heartbeat.beat()
             time.sleep(poll_interval_sec)
             print('\n')
             continue
@@ -300,6 +304,7 @@ def run_klines_worker(
                 )
 
                 backoff = 1.0
+                last_fetched_end_s = slice_key.end_ms / 1000
 
             except Exception as exc:
                 slice_status_reason = _get_slice_status_reason_on_exception(exc, fetch_fail)
@@ -335,6 +340,8 @@ def run_klines_worker(
                 # 🔑 ALWAYS release the claim
                 claims.release_claim(claims_dir, slice_id)
 
+        heartbeat.beat(processed_ts=last_fetched_end_s)
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
@@ -5,6 +5,7 @@ from typing import Literal, TypeAlias, Union
 
 from qlir.data.sources.binance.endpoints.klines.worker import run_klines_worker
 from qlir.data.sources.binance.job_config_models import KlinesJobConfig, UIKlinesJobConfig
+from qlir.telemetry.heartbeat import start_heartbeat
 
 
 # ---------------------------------------------------------------------------
@@ -34,6 +35,8 @@ class KlinesServerConfig(BaseServerConfig):
 
 def start_klines_worker(server_config: KlinesServerConfig, data_root: Path) -> None:
     """Start the klines worker"""
+    job = server_config.job_config
+    start_heartbeat(f"data_server.{job.symbol}.{job.interval}")
     run_klines_worker(
             symbol=server_config.job_config.symbol,
             interval=server_config.job_config.interval,
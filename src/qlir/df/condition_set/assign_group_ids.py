@@ -8,6 +8,24 @@ from qlir.df.utils import _ensure_columns
 
 log = logging.getLogger(__name__)
 
+def condition_group_ids(cond: _pd.Series) -> _pd.Series:
+    """
+    Run number of every contiguous True run in `cond` (1, 2, ...), NA elsewhere.
+
+    NA values in `cond` are treated as False.
+    """
+    cond = cond.astype("boolean")
+
+    # IMPORTANT: treat NA as False for boundary detection
+    cond_filled = cond.fillna(False)
+
+    # True where a new True-run starts
+    starts = cond_filled & ~cond_filled.shift(fill_value=False)
+
+    # Cumulative sum gives run numbers; mask False rows
+    return starts.cumsum().where(cond)
+
+
 def assign_condition_group_id(
     df: _pd.DataFrame,
     *,
@@ -18,7 +36,6 @@ def assign_condition_group_id(
     Assign monotonically increasing IDs to contiguous True runs.
     """
     _ensure_columns(df=df, cols=condition_col, caller="assign_condition_group_id")
-    cond = df[condition_col].astype("boolean")
     
     na_count = df[condition_col].isna().sum()
     if na_count:
@@ -29,17 +46,7 @@ def assign_condition_group_id(
             condition_col,
         )
 
-    # IMPORTANT: treat NA as False for boundary detection
-    cond_filled = cond.fillna(False)
-
-    # True where a new True-run starts
-    starts = cond_filled & ~cond_filled.shift(fill_value=False)
-
-    # Cumulative sum gives run numbers
-    group_ids = starts.cumsum()
-
-    # Mask False rows
-    df[group_col] = group_ids.where(cond)
+    df[group_col] = condition_group_ids(df[condition_col])
     log_column_event(caller="assign_condition_group_id", ev=ColumnLifecycleEvent(key="unknonw (log registry)", col=group_col, event="created"))
 
     return df, group_col
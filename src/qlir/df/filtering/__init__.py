@@ -2,9 +2,11 @@
 Filtering utilities: return *subsets* of a DataFrame.
 
 Submodules:
-- date: calendar / intraday filters
+- datetime (alias: date): calendar / intraday filters
 - session: trading sessions
 - events: event-anchored windows
 """
 
-from . import date, events, session
+from . import datetime, events, session
+
+date = datetime
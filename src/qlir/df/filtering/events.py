@@ -16,8 +16,10 @@ This is meant for: FOMC, CPI, big listings, exchange incidents, etc.
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+import heapq
 from typing import Any, Iterable, Mapping, Sequence
 
+import numpy as _np
 import pandas as _pd
 
 from qlir.time.constants import DEFAULT_TS_COL
@@ -123,6 +125,115 @@ def make_after_windows_from_events(events: Sequence[dict[str, Any]], after: time
     return windows
 
 
+# --------- window matching --------- #
+
+def _window_hits(
+    ts: _pd.Series,
+    windows: Sequence[tuple[datetime, datetime]],
+    *,
+    with_event_ids: bool,
+) -> tuple[_np.ndarray, _np.ndarray | None]:
+    """
+    Match rows against closed windows [start, end] via `searchsorted`.
+
+    Timestamps are sorted once (skipped when already monotonic) and each
+    window becomes a [lo, hi) range of sorted positions, so the cost is
+    O(rows + windows * log rows) instead of one full-column mask per window.
+    Overlapping windows cost nothing extra: ids are resolved once per
+    boundary (see `_first_window_ids`), not per row of each window.
+
+    Returns
+    -------
+    mask : np.ndarray[bool]
+        Row (positional) is inside at least one window.
+    event_ids : np.ndarray[int64] | None
+        Index of the *first* window (in `windows` order) containing the row,
+        -1 where no window matches. Only computed if `with_event_ids`.
+    """
+    n = len(ts)
+    ts_ns = _pd.DatetimeIndex(ts).as_unit("ns").asi8
+
+    order = None
+    if not (n < 2 or (ts_ns[1:] >= ts_ns[:-1]).all()):
+        order = _np.argsort(ts_ns, kind="stable")
+        ts_ns = ts_ns[order]
+
+    starts = _np.array([_pd.Timestamp(w[0]).as_unit("ns").value for w in windows], dtype=_np.int64)
+    ends = _np.array([_pd.Timestamp(w[1]).as_unit("ns").value for w in windows], dtype=_np.int64)
+
+    lo = _np.searchsorted(ts_ns, starts, side="left")
+    hi = _np.searchsorted(ts_ns, ends, side="right")
+    nonempty = lo < hi
+
+    event_ids = None
+    if with_event_ids:
+        sorted_ids = _first_window_ids(n, lo, hi, _np.flatnonzero(nonempty))
+        sorted_mask = sorted_ids >= 0
+    else:
+        # Coverage count via a difference array: one pass over rows.
+        cover = (
+            _np.bincount(lo[nonempty], minlength=n + 1)
+            - _np.bincount(hi[nonempty], minlength=n + 1)
+        )
+        sorted_mask = _np.cumsum(cover[:n]) > 0
+
+    if order is None:
+        return sorted_mask, sorted_ids if with_event_ids else None
+
+    mask = _np.empty(n, dtype=bool)
+    mask[order] = sorted_mask
+    if with_event_ids:
+        event_ids = _np.empty(n, dtype=_np.int64)
+        event_ids[order] = sorted_ids
+    return mask, event_ids
+
+
+def _first_window_ids(n: int, lo: _np.ndarray, hi: _np.ndarray, ks: _np.ndarray) -> _np.ndarray:
+    """
+    Per sorted row, the lowest window index k (of `ks`) with lo[k] <= row < hi[k],
+    else -1.
+
+    Between two consecutive window boundaries the answer is constant, so a
+    sweep over the (at most 2 * windows) boundaries with a heap of the open
+    windows yields one id per segment; rows are then filled with `np.repeat`.
+    """
+    ids = _np.full(n, -1, dtype=_np.int64)
+    if not len(ks):
+        return ids
+
+    bounds = _np.unique(_np.concatenate([lo[ks], hi[ks]]))
+    by_start = ks[_np.argsort(lo[ks], kind="stable")]
+    open_: list[int] = []
+    seg_ids = _np.empty(len(bounds) - 1, dtype=_np.int64)
+    i = 0
+    for j, b in enumerate(bounds[:-1].tolist()):
+        while i < len(by_start) and lo[by_start[i]] == b:
+            heapq.heappush(open_, int(by_start[i]))
+            i += 1
+        while open_ and hi[open_[0]] <= b:
+            heapq.heappop(open_)  # closed windows leave lazily, once they reach the top
+        seg_ids[j] = open_[0] if open_ else -1
+
+    ids[bounds[0]:bounds[-1]] = _np.repeat(seg_ids, _np.diff(bounds))
+    return ids
+
+
+def _filter_by_windows(
+    df: _pd.DataFrame,
+    ts: _pd.Series,
+    windows: Sequence[tuple[datetime, datetime]],
+    *,
+    add_event_id: bool,
+) -> _pd.DataFrame:
+    mask, event_ids = _window_hits(ts, windows, with_event_ids=add_event_id)
+
+    filtered = df[mask]
+    if add_event_id:
+        filtered = filtered.copy()
+        filtered["event_id"] = _pd.array(event_ids[mask], dtype="Int64")
+    return filtered
+
+
 # --------- dataframe filters --------- #
 
 def around_anchors(
@@ -146,27 +257,12 @@ def around_anchors(
         start, end = windows[0]
         return df[(ts >= start) & (ts <= end)]
 
-    mask = _pd.Series(False, index=df.index)
-    event_ids: list[int | None] = [None] * len(df)
-
-    for idx, (start, end) in enumerate(windows):
-        wmask = (ts >= start) & (ts <= end)
-        if add_event_id:
-            newly = wmask & (~mask)
-            if newly.any():
-                for i in newly[newly].index:
-                    event_ids[i] = idx
-        mask = mask | wmask
-
-    filtered = df[mask]
+    filtered = _filter_by_windows(df, ts, windows, add_event_id=add_event_id)
 
     if add_event_id:
-        event_series = _pd.Series(event_ids, index=df.index, dtype="Int64").loc[filtered.index]
-        filtered = filtered.copy()
-        filtered["event_id"] = event_series
-        filtered["event_label"] = filtered["event_id"].apply(
-            lambda x: f"{event_label_prefix}{x}" if _pd.notna(x) else None
-        )
+        filtered["event_label"] = (
+            event_label_prefix + filtered["event_id"].astype(str)
+        ).astype(object)
 
     return filtered
 
@@ -186,24 +282,7 @@ def before_anchors(
     events = _normalize_events(anchors, ts_key=ts_key)
     windows = make_before_windows_from_events(events, before)
 
-    mask = _pd.Series(False, index=df.index)
-    event_ids: list[int | None] = [None] * len(df)
-
-    for idx, (start, end) in enumerate(windows):
-        wmask = (ts >= start) & (ts <= end)
-        if add_event_id:
-            newly = wmask & (~mask)
-            if newly.any():
-                for i in newly[newly].index:
-                    event_ids[i] = idx
-        mask = mask | wmask
-
-    filtered = df[mask]
-    if add_event_id:
-        event_series = _pd.Series(event_ids, index=df.index, dtype="Int64").loc[filtered.index]
-        filtered = filtered.copy()
-        filtered["event_id"] = event_series
-    return filtered
+    return _filter_by_windows(df, ts, windows, add_event_id=add_event_id)
 
 
 def after_anchors(
@@ -221,21 +300,4 @@ def after_anchors(
     events = _normalize_events(anchors, ts_key=ts_key)
     windows = make_after_windows_from_events(events, after)
 
-    mask = _pd.Series(False, index=df.index)
-    event_ids: list[int | None] = [None] * len(df)
-
-    for idx, (start, end) in enumerate(windows):
-        wmask = (ts >= start) & (ts <= end)
-        if add_event_id:
-            newly = wmask & (~mask)
-            if newly.any():
-                for i in newly[newly].index:
-                    event_ids[i] = idx
-        mask = mask | wmask
-
-    filtered = df[mask]
-    if add_event_id:
-        event_series = _pd.Series(event_ids, index=df.index, dtype="Int64").loc[filtered.index]
-        filtered = filtered.copy()
-        filtered["event_id"] = event_series
-    return filtered
+    return _filter_by_windows(df, ts, windows, add_event_id=add_event_id)
@@ -6,9 +6,8 @@ Trading/session-style dataframe filters.
 All data is assumed stored in UTC, but sessions are defined in local market time.
 We:
 1. ensure UTC
-2. convert to target tz
-3. compare local time to a time window
-4. return the original rows (still UTC) and optionally tag them with `session`.
+2. look the timestamps up in a `SessionCalendar` (UTC intervals per local day)
+3. return the original rows (still UTC) and optionally tag them with `session`.
 
 Includes:
 - NY cash (09:30–16:00)
@@ -26,14 +25,15 @@ from __future__ import annotations
 
 
 from datetime import time
-from zoneinfo import ZoneInfo
 
+import numpy as _np
 import pandas as _pd
 
 from qlir.perf.df_copy import df_copy_measured
 from qlir.perf.logging import log_memory_debug
 from qlir.time.constants import DEFAULT_TS_COL
 from qlir.time.ensure_utc import ensure_utc_df_strict
+from qlir.time.session_calendar import COMMON_SESSIONS, SessionCalendar, SessionSpec
 
 import logging
 log = logging.getLogger(__name__)
@@ -58,14 +58,8 @@ def in_session(
     Generic session filter with wraparound support.
     """
     df = ensure_utc_df_strict(df, col)
-    local = df[col].dt.tz_convert(ZoneInfo(tz))
-    local_time = local.dt.time
-
-    if start_t < end_t:
-        mask = (local_time >= start_t) & (local_time < end_t)
-    else:
-        # overnight
-        mask = (local_time >= start_t) | (local_time < end_t)
+    spec = SessionSpec(start_t, end_t, tz)
+    mask = SessionCalendar.for_timestamps(df[col], {"session": spec}).mask("session", df[col])
 
     res = df[mask]
     if add_label is not None:
@@ -73,45 +67,72 @@ def in_session(
     return res
 
 
+def _common_session(
+    df: _pd.DataFrame,
+    name: str,
+    *,
+    col: str,
+    add_label: str | None,
+) -> _pd.DataFrame:
+    spec = COMMON_SESSIONS[name]
+    return in_session(df, start_t=spec.start_t, end_t=spec.end_t, tz=spec.tz, col=col, add_label=add_label)
+
+
+# derived sessions → the calendar sessions they combine
+_DERIVED_SESSIONS = {
+    "ny_extended": ("ny_premarket", "ny_cash", "ny_afterhours"),
+    "ldn_ny_overlap": ("london", "ny_overlap_leg"),
+}
+
+
+def session_masks(
+    ts: _pd.Series,
+    names=None,
+    *,
+    calendar: SessionCalendar | None = None,
+) -> dict[str, _np.ndarray]:
+    """
+    Boolean masks for several sessions from one calendar lookup each.
+
+    `ts` must already be UTC. Besides the `COMMON_SESSIONS` names, "ny_extended"
+    (premarket + cash + after-hours) and "ldn_ny_overlap" are available.
+    """
+    names = list(COMMON_SESSIONS) + list(_DERIVED_SESSIONS) if names is None else list(names)
+    needed = list(dict.fromkeys(
+        base for name in names for base in _DERIVED_SESSIONS.get(name, (name,))
+    ))
+    if calendar is None:
+        calendar = SessionCalendar.for_timestamps(ts, {n: COMMON_SESSIONS[n] for n in needed})
+    raw = calendar.masks(ts, needed)
+
+    out: dict[str, _np.ndarray] = {}
+    for name in names:
+        if name == "ny_extended":
+            out[name] = raw["ny_premarket"] | raw["ny_cash"] | raw["ny_afterhours"]
+        elif name == "ldn_ny_overlap":
+            out[name] = raw["london"] & raw["ny_overlap_leg"]
+        else:
+            out[name] = raw[name]
+    return out
+
+
 def ny_cash_session(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool = True) -> _pd.DataFrame:
-    return in_session(
-        df,
-        start_t=time(9, 30),
-        end_t=time(16, 0),
-        tz="America/New_York",
-        col=col,
-        add_label="ny_cash" if add_label else None,
-    )
+    return _common_session(df, "ny_cash", col=col, add_label="ny_cash" if add_label else None)
 
 
 def ny_premarket(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool = True) -> _pd.DataFrame:
-    return in_session(
-        df,
-        start_t=time(4, 0),
-        end_t=time(9, 30),
-        tz="America/New_York",
-        col=col,
-        add_label="ny_premarket" if add_label else None,
-    )
+    return _common_session(df, "ny_premarket", col=col, add_label="ny_premarket" if add_label else None)
 
 
 def ny_afterhours(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool = True) -> _pd.DataFrame:
-    return in_session(
-        df,
-        start_t=time(16, 0),
-        end_t=time(20, 0),
-        tz="America/New_York",
-        col=col,
-        add_label="ny_afterhours" if add_label else None,
-    )
+    return _common_session(df, "ny_afterhours", col=col, add_label="ny_afterhours" if add_label else None)
 
 
 def ny_extended(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool = True) -> _pd.DataFrame:
-    pre = ny_premarket(df, col=col, add_label=False)
-    cash = ny_cash_session(df, col=col, add_label=False)
-    aft = ny_afterhours(df, col=col, add_label=False)
+    df = ensure_utc_df_strict(df, col)
+    mask = session_masks(df[col], ["ny_extended"])["ny_extended"]
     merged = (
-        _pd.concat([pre, cash, aft], ignore_index=True)
+        df[mask]
         .drop_duplicates(subset=[col])
         .sort_values(col)
         .reset_index(drop=True)
@@ -122,48 +143,22 @@ def ny_extended(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool
 
 
 def frankfurt_session(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool = True) -> _pd.DataFrame:
-    return in_session(
-        df,
-        start_t=time(9, 0),
-        end_t=time(17, 0),
-        tz="Europe/Berlin",
-        col=col,
-        add_label="ffm" if add_label else None,
-    )
+    return _common_session(df, "ffm", col=col, add_label="ffm" if add_label else None)
 
 
 def london_session(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool = True) -> _pd.DataFrame:
-    return in_session(
-        df,
-        start_t=time(8, 0),
-        end_t=time(16, 30),
-        tz="Europe/London",
-        col=col,
-        add_label="london" if add_label else None,
-    )
+    return _common_session(df, "london", col=col, add_label="london" if add_label else None)
 
 
 def tokyo_session(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool = True) -> _pd.DataFrame:
-    return in_session(
-        df,
-        start_t=time(9, 0),
-        end_t=time(15, 0),
-        tz="Asia/Tokyo",
-        col=col,
-        add_label="tokyo" if add_label else None,
-    )
+    return _common_session(df, "tokyo", col=col, add_label="tokyo" if add_label else None)
 
 
 def london_newyork_overlap(df: _pd.DataFrame, col: str = DEFAULT_TS_COL, *, add_label: bool = True) -> _pd.DataFrame:
     df = ensure_utc_df_strict(df, col)
+    mask = session_masks(df[col], ["ldn_ny_overlap"])["ldn_ny_overlap"]
 
-    london_local = df[col].dt.tz_convert(ZoneInfo("Europe/London"))
-    l_mask = (london_local.dt.time >= time(8, 0)) & (london_local.dt.time < time(16, 30))
-
-    ny_local = df[col].dt.tz_convert(ZoneInfo("America/New_York"))
-    ny_mask = (ny_local.dt.time >= time(8, 0)) & (ny_local.dt.time < time(17, 0))
-
-    res = df[l_mask & ny_mask]
+    res = df[mask]
     if add_label:
         res = _add_session_label(res, "ldn_ny_overlap")
     return res
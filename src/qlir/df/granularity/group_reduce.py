@@ -0,0 +1,187 @@
+"""
+Single-pass, multi-metric group reductions for the granularity transforms.
+
+`to_row_per_event` and `to_row_per_time_chunk` reduce many `MetricSpec`s over
+the same groups. Instead of one grouped reduction per metric, the group keys
+are laid out once (`GroupLayout`: row positions in group order + segment
+starts) and every metric becomes a segment kernel over a gathered column:
+
+    SUM / COUNT_TRUE -> np.add.reduceat   (NaN counted as 0)
+    MIN / MAX        -> np.fmin / np.fmax.reduceat (NaN skipped)
+    FIRST / LAST     -> value at segment start / end
+
+Keys that are already contiguous (e.g. from `assign_condition_group_id`) are
+detected and skip factorization and sorting entirely. Metrics the kernels
+cannot reproduce exactly (MEDIAN, nullable/extension dtypes, FIRST/LAST with
+missing values, non-numeric MIN/MAX) are computed together in one named
+`agg` over the already-factorized segment codes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+import numpy as _np
+import pandas as _pd
+
+from qlir.df.granularity.metric_spec import Aggregation, MetricSpec
+
+_PANDAS_AGG = {
+    Aggregation.MIN: "min",
+    Aggregation.MAX: "max",
+    Aggregation.FIRST: "first",
+    Aggregation.LAST: "last",
+    Aggregation.SUM: "sum",
+    Aggregation.MEDIAN: "median",
+    Aggregation.COUNT_TRUE: "sum",
+}
+
+
+@dataclass
+class GroupLayout:
+    """
+    Rows arranged as contiguous segments, one per group.
+
+    pos : row positions in segment order (None when that is simply all rows
+          in their original order)
+    starts, ends : first / last index (into the arranged rows) per segment
+    """
+    pos: _np.ndarray | None
+    starts: _np.ndarray
+    ends: _np.ndarray
+
+    @property
+    def ngroups(self) -> int:
+        return len(self.starts)
+
+    @property
+    def sizes(self) -> _np.ndarray:
+        return (self.ends - self.starts + 1).astype("int64")
+
+    @property
+    def first_rows(self) -> _np.ndarray:
+        """Row position of the first member of every group."""
+        return self.starts if self.pos is None else self.pos[self.starts]
+
+    def gather(self, values: _np.ndarray) -> _np.ndarray:
+        return values if self.pos is None else values[self.pos]
+
+    def segment_codes(self) -> _np.ndarray:
+        """Segment number (0..ngroups-1) of every arranged row."""
+        return _np.repeat(_np.arange(self.ngroups), self.sizes)
+
+
+def _run_starts(values: _np.ndarray) -> _np.ndarray:
+    if len(values) == 0:
+        return _np.empty(0, dtype=_np.intp)
+    return _np.concatenate(([0], _np.flatnonzero(values[1:] != values[:-1]) + 1))
+
+
+def group_layout(keys: _pd.Series, *, sort: bool = False) -> GroupLayout:
+    """
+    Lay out the rows of `keys` by group (NA keys are dropped, like groupby).
+
+    sort=False orders groups by first appearance (`groupby(sort=False)`),
+    sort=True by key value. Within a group, rows keep their original order.
+    """
+    valid = keys.notna().to_numpy()
+    all_valid = bool(valid.all())
+    pos = _np.arange(len(keys)) if all_valid else _np.flatnonzero(valid)
+    values = keys.to_numpy()[pos] if not all_valid else keys.to_numpy()
+
+    # fast path: every group is already one contiguous run in the right order
+    starts = _run_starts(values)
+    run_keys = values[starts]
+    if len(starts) <= 1 or (run_keys[1:] > run_keys[:-1]).all():
+        contiguous = True
+    elif sort:
+        contiguous = False
+    else:
+        contiguous = len(_pd.unique(run_keys)) == len(run_keys)
+
+    if not contiguous:
+        codes, _ = _pd.factorize(values, sort=sort)
+        order = _np.argsort(codes, kind="stable")
+        pos = pos[order]
+        starts = _run_starts(codes[order])
+
+    ends = _np.append(starts[1:], len(pos)) - 1 if len(pos) else starts
+    return GroupLayout(pos=None if (all_valid and contiguous) else pos, starts=starts, ends=ends)
+
+
+def _fast_reduce(values: _np.ndarray, agg: Aggregation, layout: GroupLayout) -> _np.ndarray | None:
+    """
+    Segment kernel for one metric, or None if pandas semantics would differ.
+    """
+    kind = values.dtype.kind
+    starts, ends = layout.starts, layout.ends
+
+    if agg in (Aggregation.SUM, Aggregation.COUNT_TRUE):
+        if kind == "b":
+            return _np.add.reduceat(layout.gather(values).astype("int64"), starts)
+        if kind in "iu":
+            return _np.add.reduceat(layout.gather(values), starts, dtype=_np.int64 if kind == "i" else _np.uint64)
+        if kind == "f":
+            v = layout.gather(values)
+            return _np.add.reduceat(_np.where(_np.isnan(v), 0, v), starts)
+        return None
+
+    if agg in (Aggregation.MIN, Aggregation.MAX):
+        if kind in "biu":
+            ufunc = _np.minimum if agg == Aggregation.MIN else _np.maximum
+        elif kind == "f":
+            ufunc = _np.fmin if agg == Aggregation.MIN else _np.fmax
+        else:
+            return None
+        return ufunc.reduceat(layout.gather(values), starts)
+
+    if agg in (Aggregation.FIRST, Aggregation.LAST):
+        # groupby first/last skip missing values; only take the shortcut when there are none
+        if kind not in "biufMm" or _pd.isna(values).any():
+            return None
+        rows = starts if agg == Aggregation.FIRST else ends
+        return values[rows] if layout.pos is None else values[layout.pos[rows]]
+
+    return None
+
+
+def reduce_metrics(
+    df: _pd.DataFrame,
+    metrics: Iterable[MetricSpec],
+    layout: GroupLayout,
+) -> Dict[str, _np.ndarray | _pd.Series]:
+    """
+    Compute every metric over `layout`'s groups.
+
+    Returns output name → one value per group (in layout order), in the
+    order of `metrics`.
+    """
+    metrics = list(metrics)
+    out: Dict[str, _np.ndarray | _pd.Series] = {}
+    slow: Dict[str, MetricSpec] = {}
+
+    for m in metrics:
+        name = m.resolve_out_name()
+        s = df[m.col]
+        res = None
+        if isinstance(s.dtype, _np.dtype) and layout.ngroups:
+            res = _fast_reduce(s.to_numpy(), m.agg, layout)
+        if res is None:
+            slow[name] = m
+            out[name] = None
+        else:
+            out[name] = res
+
+    if slow:
+        rows = slice(None) if layout.pos is None else layout.pos
+        gathered = _pd.DataFrame(
+            {m.col: df[m.col].iloc[rows].reset_index(drop=True) for m in slow.values()}
+        )
+        agg = gathered.groupby(layout.segment_codes(), sort=True).agg(
+            **{name: (m.col, _PANDAS_AGG[m.agg]) for name, m in slow.items()}
+        )
+        for name in slow:
+            out[name] = agg[name].reset_index(drop=True)
+
+    return out
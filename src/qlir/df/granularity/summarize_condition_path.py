@@ -1,8 +1,9 @@
+import numpy as _np
 import pandas as _pd
 
 from qlir.core.constants import DEFAULT_OHLC_COLS, DEFAULT_OPEN_TIMESTAMP_COL
 from qlir.core.types.OHLC_Cols import OHLC_Cols
-from qlir.df.condition_set.assign_group_ids import assign_condition_group_id
+from qlir.df.condition_set.assign_group_ids import condition_group_ids
 from qlir.df.utils import _ensure_columns
 
 
@@ -16,35 +17,79 @@ def summarize_condition_paths(
 ) -> _pd.DataFrame:
     """
     Summarize all contiguous condition-true paths in a DataFrame.
-    """
 
-    df = df.copy()
+    One row per path (sorted by group id) with the same facts as
+    `summarize_condition_path`. If `group_col` is already a column it is used
+    as the path id; otherwise ids are derived from `condition_col`. The input
+    frame is never copied or modified.
+
+    Rows are gathered per path once (run start/end positions), so first/last
+    values are positional lookups and the path extremes are `reduceat`s.
+    """
 
     _ensure_columns(df, [ts_col, *ohlc_cols], caller="summarize_condition_paths")
 
-    # Just adding this step if grouping hasnt been done yet
-    if group_col not in df.columns:
-        (df, _) = assign_condition_group_id(
-            df,
-            condition_col=condition_col,
-            group_col=group_col,
-        )
-
-    paths = (
-        df
-        .dropna(subset=[group_col])
-        .groupby(group_col, sort=True)
-        .apply(
-            summarize_condition_path,
-            ts_col=ts_col,
-            ohlc_cols=ohlc_cols
-        )
-        .reset_index()
-    )
-
-    return paths
+    if group_col is None:
+        group_col = "condition_group_id"
+
+    # Just deriving ids here if grouping hasnt been done yet
+    if group_col in df.columns:
+        ids = df[group_col]
+    else:
+        _ensure_columns(df, condition_col, caller="summarize_condition_paths")
+        ids = condition_group_ids(df[condition_col])
+
+    # positions of grouped rows, ordered by id (stable, like groupby)
+    pos = _np.flatnonzero(ids.notna().to_numpy())
+    keys = ids.iloc[pos]
+    if not keys.is_monotonic_increasing:
+        order = keys.argsort(kind="stable").to_numpy()
+        pos = pos[order]
+        keys = keys.iloc[order]
+
+    key_values = keys.to_numpy()
+    if len(pos):
+        starts = _np.concatenate(([0], _np.flatnonzero(key_values[1:] != key_values[:-1]) + 1))
+        ends = _np.append(starts[1:], len(pos)) - 1
+    else:
+        starts = ends = _np.empty(0, dtype=_np.intp)
+    first_pos, last_pos = pos[starts], pos[ends]
+
+    def _at(col: str, rows: _np.ndarray) -> _pd.Series:
+        return df[col].iloc[rows].reset_index(drop=True)
+
+    return _pd.DataFrame({
+        group_col: keys.iloc[starts].reset_index(drop=True),
+        "start_time": _at(ts_col, first_pos),
+        "end_time": _at(ts_col, last_pos),
+        "bars": (ends - starts + 1).astype("int64"),
+
+        "first_open": _at(ohlc_cols.open, first_pos),
+        "first_high": _at(ohlc_cols.high, first_pos),
+        "first_low": _at(ohlc_cols.low, first_pos),
+        "first_close": _at(ohlc_cols.close, first_pos),
+
+        "last_open": _at(ohlc_cols.open, last_pos),
+        "last_high": _at(ohlc_cols.high, last_pos),
+        "last_low": _at(ohlc_cols.low, last_pos),
+        "last_close": _at(ohlc_cols.close, last_pos),
+
+        "path_max_high": _path_reduce(df[ohlc_cols.high], pos, starts, _np.fmax),
+        "path_min_low": _path_reduce(df[ohlc_cols.low], pos, starts, _np.fmin),
+    })
 
 
+def _path_reduce(s: _pd.Series, pos: _np.ndarray, starts: _np.ndarray, ufunc) -> _np.ndarray:
+    """
+    NaN-skipping per-path max/min (`fmax`/`fmin`) over `s` gathered at `pos`.
+    """
+    if isinstance(s.dtype, _np.dtype):
+        values = s.to_numpy()
+    else:
+        values = s.to_numpy(dtype="float64", na_value=_np.nan)
+    if len(starts) == 0:
+        return values[:0]
+    return ufunc.reduceat(values[pos], starts)
 
 
 def summarize_condition_path(
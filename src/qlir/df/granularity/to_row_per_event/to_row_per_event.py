@@ -4,7 +4,8 @@ import pandas as pd
 from typing import Iterable
 
 from qlir.df.granularity.dtype_guard import _validate_metric_dtype
-from qlir.df.granularity.metric_spec import MetricSpec, Aggregation
+from qlir.df.granularity.group_reduce import group_layout, reduce_metrics
+from qlir.df.granularity.metric_spec import MetricSpec
 
 def to_row_per_event(
     df: pd.DataFrame,
@@ -26,6 +27,12 @@ def to_row_per_event(
         Event-level metrics to compute.
     include_src_row_count : bool, default False
         Whether to include the number of source rows per event.
+
+    Notes
+    -----
+    Events are ordered by first appearance, like `groupby(sort=False)`.
+    All metrics are computed in one pass over a shared group layout (see
+    `qlir.df.granularity.group_reduce`).
     """
 
     if event_id_col not in df.columns:
@@ -52,44 +59,23 @@ def to_row_per_event(
 
     # ---- grouping -----------------------------------------------------------
 
-    grouped = df.groupby(event_id_col, sort=False)
+    # event ids are laid out once (no-op when already contiguous, as from
+    # assign_condition_group_id); every metric then reduces over that layout
+    layout = group_layout(df[event_id_col], sort=False)
 
-    result_frames: list[pd.Series] = []
+    result: dict[str, object] = {
+        event_id_col: df[event_id_col].iloc[layout.first_rows].reset_index(drop=True),
+    }
 
     # ---- structural metric --------------------------------------------------
 
     if include_src_row_count:
-        src_row_count = grouped.size()
-        src_row_count.name = "src_row_count"
-        result_frames.append(src_row_count)
+        result["src_row_count"] = layout.sizes
 
     # ---- column metrics -----------------------------------------------------
 
-    for m in metrics:
-        out = m.resolve_out_name()
-
-        if m.agg == Aggregation.COUNT_TRUE:
-            series = grouped[m.col].sum()
-        elif m.agg == Aggregation.MIN:
-            series = grouped[m.col].min()
-        elif m.agg == Aggregation.MAX:
-            series = grouped[m.col].max()
-        elif m.agg == Aggregation.FIRST:
-            series = grouped[m.col].first()
-        elif m.agg == Aggregation.LAST:
-            series = grouped[m.col].last()
-        elif m.agg == Aggregation.SUM:
-            series = grouped[m.col].sum()
-        elif m.agg == Aggregation.MEDIAN:
-            series = grouped[m.col].median()
-        else:
-            raise AssertionError(f"Unhandled aggregation: {m.agg}")
-
-        series.name = out
-        result_frames.append(series)
+    result.update(reduce_metrics(df, metrics, layout))
 
     # ---- assemble -----------------------------------------------------------
 
-    result = pd.concat(result_frames, axis=1).reset_index()
-
-    return result
+    return pd.DataFrame(result)
@@ -4,6 +4,10 @@ from typing import Literal, Optional
 import pandas as pd
 
 
+import numpy as np
+
+from qlir.data.resampling.multi_timeframe import start_day_origin_ns, unit_size_ns
+from qlir.df.granularity.group_reduce import group_layout, reduce_metrics
 from qlir.df.granularity.to_row_per_time_chunk._helpers import _validate_ts_ref, groupby_time
 from qlir.time.timefreq import TimeFreq
 from ..metric_spec import MetricSpec, Aggregation
@@ -64,51 +68,149 @@ def to_row_per_time_chunk(
 
     # ---- grouping ----------------------------------------------------------
 
-    # Convert TimeFreq → pandas offset string once
-    pandas_freq = freq.as_pandas_str
+    ts = _chunk_timestamps(df, ts_col)
+    if ts is not None and freq.unit.value in ("second", "minute", "hour", "day"):
+        out_df = _chunk_metrics_fast(
+            df,
+            ts=ts,
+            size_ns=unit_size_ns(freq.unit.value, freq.count),
+            metrics=metrics,
+            include_all_wall_clock_chunks=include_all_wall_clock_chunks,
+        )
+    else:
+        out_df = _chunk_metrics_grouped(
+            df,
+            ts_col=ts_col,
+            pandas_freq=freq.as_pandas_str,
+            metrics=metrics,
+            include_all_wall_clock_chunks=include_all_wall_clock_chunks,
+        )
 
-    grouped = groupby_time(
-        df=df,
-        ts_col=ts_col,
-        freq=pandas_freq,
-    )
+    # also for count_true metrics (otherwise this would be NA, but we likely want zero)
+    for m in metrics:
+        if m.agg == Aggregation.COUNT_TRUE:
+            out_df[m.resolve_out_name()] = (
+                out_df[m.resolve_out_name()].fillna(0).astype(int)
+            )
 
-    result_parts: list[pd.Series] = []
 
-    # ---- structural metric -------------------------------------------------
+    out_df = out_df.reset_index().rename(columns={"index": "dt"})
 
-    s = grouped.size()
-    s.name = "src_row_count"
-    result_parts.append(s)
+    return out_df
 
-    # ---- column metrics ----------------------------------------------------
 
-    for m in metrics:
-        out = m.resolve_out_name()
+def _chunk_timestamps(df: pd.DataFrame, ts_col: str | None) -> pd.DatetimeIndex | None:
+    """
+    Chunking timestamps for the epoch-arithmetic path: UTC or naive values
+    from the column / plain DatetimeIndex. None means "use pandas' Grouper".
+    """
+    if ts_col is None or ts_col in df.columns:
+        ts = pd.DatetimeIndex(df.index if ts_col is None else df[ts_col], name=ts_col if ts_col else df.index.name)
+    elif isinstance(df.index, pd.DatetimeIndex) and df.index.name == ts_col:
+        ts = df.index
+    else:
+        return None
 
-        if m.agg == Aggregation.COUNT_TRUE:
-            s = grouped[m.col].sum()
-        elif m.agg == Aggregation.MIN:
-            s = grouped[m.col].min()
-        elif m.agg == Aggregation.MAX:
-            s = grouped[m.col].max()
-        elif m.agg == Aggregation.FIRST:
-            s = grouped[m.col].first()
-        elif m.agg == Aggregation.LAST:
-            s = grouped[m.col].last()
-        elif m.agg == Aggregation.SUM:
-            s = grouped[m.col].sum()
-        elif m.agg == Aggregation.MEDIAN:
-            s = grouped[m.col].median()
-        else:
-            raise AssertionError(f"Unhandled aggregation {m.agg}")
-
-        s.name = out
-        result_parts.append(s)
-
-    # ---- assemble ----------------------------------------------------------
-
-    out_df = pd.concat(result_parts, axis=1)
+    if ts.tz is not None and str(ts.tz) != "UTC":
+        return None
+    return ts
+
+
+def _chunk_metrics_fast(
+    df: pd.DataFrame,
+    *,
+    ts: pd.DatetimeIndex,
+    size_ns: int,
+    metrics: list[MetricSpec],
+    include_all_wall_clock_chunks: bool,
+) -> pd.DataFrame:
+    """
+    Same chunks as `groupby(pd.Grouper(freq=...))` (origin = midnight of the
+    earliest timestamp, closed/label left), computed as integer chunk ids
+    with all metrics reduced in one pass.
+    """
+    valid = ~ts.isna()
+    ns = ts.as_unit("ns").asi8
+    origin_ns = start_day_origin_ns(int(ns[valid].min())) if valid.any() else 0
+
+    # float ids so NaT rows can be dropped like groupby does
+    ids = np.where(valid, (ns - origin_ns) // size_ns, np.nan)
+    layout = group_layout(pd.Series(ids), sort=True)
+    chunk = ids[layout.first_rows].astype("int64")
+
+    parts: dict[str, object] = {"src_row_count": layout.sizes}
+    parts.update(reduce_metrics(df, metrics, layout))
+
+    # Grouper materializes empty chunks (missing values) before they are
+    # dropped, so gaps upcast int/bool results even when they are filtered out
+    if len(chunk) and chunk[-1] - chunk[0] + 1 != len(chunk):
+        full = np.arange(chunk[0], chunk[-1] + 1) if include_all_wall_clock_chunks else chunk
+        at = chunk - chunk[0] if include_all_wall_clock_chunks else np.arange(len(chunk))
+        filled = {Aggregation.SUM, Aggregation.COUNT_TRUE}
+        fill_zero = {m.resolve_out_name() for m in metrics if m.agg in filled} | {"src_row_count"}
+        parts = {
+            name: _spread(values, at, len(full), zero=name in fill_zero)
+            for name, values in parts.items()
+        }
+        chunk = full
+
+    labels = pd.DatetimeIndex((origin_ns + chunk * size_ns).astype("datetime64[ns]"), name=ts.name)
+    if ts.tz is not None:
+        labels = labels.tz_localize(ts.tz)
+    labels = labels.as_unit(ts.unit)
+
+    return pd.DataFrame(
+        {name: values.to_numpy() if isinstance(values, pd.Series) else values for name, values in parts.items()},
+        index=labels,
+    )
+
+
+def _spread(values, at: np.ndarray, n: int, *, zero: bool) -> np.ndarray:
+    """
+    Place per-chunk `values` at positions `at` of an `n`-long array; empty
+    chunks get 0 (`zero`) or the missing value groupby would produce.
+    """
+    values = values.to_numpy() if isinstance(values, pd.Series) else values
+    if zero:
+        out = np.zeros(n, dtype=values.dtype)
+    elif values.dtype.kind in "biuf":
+        out = np.full(n, np.nan)
+    elif values.dtype.kind in "Mm":
+        out = np.full(n, np.datetime64("NaT") if values.dtype.kind == "M" else np.timedelta64("NaT"), dtype=values.dtype)
+    else:
+        out = np.full(n, None, dtype=object)
+    out[at] = values
+    return out
+
+
+def _chunk_metrics_grouped(
+    df: pd.DataFrame,
+    *,
+    ts_col: str | None,
+    pandas_freq: str,
+    metrics: list[MetricSpec],
+    include_all_wall_clock_chunks: bool,
+) -> pd.DataFrame:
+    """pandas Grouper path (non-UTC timezones, index levels): one named agg."""
+    grouped = groupby_time(
+        df=df,
+        ts_col=ts_col,
+        freq=pandas_freq,
+    )
+
+    out_df = grouped.size().rename("src_row_count").to_frame()
+    if metrics:
+        agg_names = {
+            Aggregation.COUNT_TRUE: "sum",
+            Aggregation.MIN: "min",
+            Aggregation.MAX: "max",
+            Aggregation.FIRST: "first",
+            Aggregation.LAST: "last",
+            Aggregation.SUM: "sum",
+            Aggregation.MEDIAN: "median",
+        }
+        aggs = grouped.agg(**{m.resolve_out_name(): (m.col, agg_names[m.agg]) for m in metrics})
+        out_df = pd.concat([out_df, aggs], axis=1)
 
     if not include_all_wall_clock_chunks:
         out_df = out_df.loc[out_df["src_row_count"] > 0]
@@ -117,14 +219,4 @@ def to_row_per_time_chunk(
     if include_all_wall_clock_chunks:
         out_df["src_row_count"] = out_df["src_row_count"].fillna(0).astype(int)
 
-    # also for count_true metrics (otherwise this would be NA, but we likely want zero)
-    for m in metrics:
-        if m.agg == Aggregation.COUNT_TRUE:
-            out_df[m.resolve_out_name()] = (
-                out_df[m.resolve_out_name()].fillna(0).astype(int)
-            )
-
-
-    out_df = out_df.reset_index().rename(columns={"index": "dt"})
-
     return out_df
@@ -6,32 +6,24 @@ import pandas as _pd
 
 from qlir.df.filtering import session as fsession
 from qlir.time.constants import DEFAULT_TS_COL
-from qlir.time.ensure_utc import ensure_utc_df_strict
+from qlir.time.ensure_utc import ensure_utc_series_strict_string
 
 
-def _left_mark(
+def _mark_sessions(
     df: _pd.DataFrame,
-    subset: _pd.DataFrame,
-    *,
-    key: str,
-    out_col: str,
-    value=True,
+    col: str,
+    out_cols: dict[str, str],
 ) -> _pd.DataFrame:
     """
-    Generic "filter then self-join" marker.
-    df: full dataframe
-    subset: filtered dataframe (same key col)
-    key: name of the timestamp column (usually tz_start)
-    out_col: name of the column to add
-    value: value to write for matching rows
-    """
-    df = df.copy()
-    df[out_col] = False if isinstance(value, bool) else None
+    Add one boolean column per session in a single pass.
 
-    # use index-based set for speed instead of an actual merge
-    match_idx = df[key].isin(subset[key])
-    df.loc[match_idx, out_col] = value
-    return df
+    out_cols: session name (see `filtering.session.session_masks`) → column
+    to add. `col` is normalized to UTC in the output, like the filters do.
+    The input frame is not modified; the only frame built is the returned one.
+    """
+    ts = ensure_utc_series_strict_string(df[col])
+    masks = fsession.session_masks(ts, list(out_cols))
+    return df.assign(**{col: ts}, **{out: masks[name] for name, out in out_cols.items()})
 
 
 def mark_ny_cash(
@@ -41,11 +33,9 @@ def mark_ny_cash(
 ) -> _pd.DataFrame:
     """
     Mark rows that are inside NY cash session (09:30–16:00 America/New_York).
-    Uses filtering.session.ny_cash_session(...) under the hood.
+    Uses the same session calendar as filtering.session.ny_cash_session(...).
     """
-    df = ensure_utc_df_strict(df, col)
-    ny_df = fsession.ny_cash_session(df, col=col, add_label=False)
-    return _left_mark(df, ny_df, key=col, out_col=out_col, value=True)
+    return _mark_sessions(df, col, {"ny_cash": out_col})
 
 
 def mark_ny_premarket(
@@ -53,9 +43,7 @@ def mark_ny_premarket(
     col: str = DEFAULT_TS_COL,
     out_col: str = "in_ny_premarket",
 ) -> _pd.DataFrame:
-    df = ensure_utc_df_strict(df, col)
-    pre_df = fsession.ny_premarket(df, col=col, add_label=False)
-    return _left_mark(df, pre_df, key=col, out_col=out_col, value=True)
+    return _mark_sessions(df, col, {"ny_premarket": out_col})
 
 
 def mark_ny_afterhours(
@@ -63,9 +51,7 @@ def mark_ny_afterhours(
     col: str = DEFAULT_TS_COL,
     out_col: str = "in_ny_afterhours",
 ) -> _pd.DataFrame:
-    df = ensure_utc_df_strict(df, col)
-    aft_df = fsession.ny_afterhours(df, col=col, add_label=False)
-    return _left_mark(df, aft_df, key=col, out_col=out_col, value=True)
+    return _mark_sessions(df, col, {"ny_afterhours": out_col})
 
 
 def mark_ny_extended(
@@ -73,9 +59,7 @@ def mark_ny_extended(
     col: str = DEFAULT_TS_COL,
     out_col: str = "in_ny_extended",
 ) -> _pd.DataFrame:
-    df = ensure_utc_df_strict(df, col)
-    ext_df = fsession.ny_extended(df, col=col, add_label=False)
-    return _left_mark(df, ext_df, key=col, out_col=out_col, value=True)
+    return _mark_sessions(df, col, {"ny_extended": out_col})
 
 
 def mark_london(
@@ -83,9 +67,7 @@ def mark_london(
     col: str = DEFAULT_TS_COL,
     out_col: str = "in_london_session",
 ) -> _pd.DataFrame:
-    df = ensure_utc_df_strict(df, col)
-    ldn_df = fsession.london_session(df, col=col, add_label=False)
-    return _left_mark(df, ldn_df, key=col, out_col=out_col, value=True)
+    return _mark_sessions(df, col, {"london": out_col})
 
 
 def mark_frankfurt(
@@ -93,9 +75,7 @@ def mark_frankfurt(
     col: str = DEFAULT_TS_COL,
     out_col: str = "in_frankfurt_session",
 ) -> _pd.DataFrame:
-    df = ensure_utc_df_strict(df, col)
-    ffm_df = fsession.frankfurt_session(df, col=col, add_label=False)
-    return _left_mark(df, ffm_df, key=col, out_col=out_col, value=True)
+    return _mark_sessions(df, col, {"ffm": out_col})
 
 
 def mark_london_ny_overlap(
@@ -103,9 +83,7 @@ def mark_london_ny_overlap(
     col: str = DEFAULT_TS_COL,
     out_col: str = "in_ldn_ny_overlap",
 ) -> _pd.DataFrame:
-    df = ensure_utc_df_strict(df, col)
-    ov_df = fsession.london_newyork_overlap(df, col=col, add_label=False)
-    return _left_mark(df, ov_df, key=col, out_col=out_col, value=True)
+    return _mark_sessions(df, col, {"ldn_ny_overlap": out_col})
 
 
 def mark_all_common_sessions(
@@ -114,13 +92,19 @@ def mark_all_common_sessions(
 ) -> _pd.DataFrame:
     """
     Convenience: add a bunch of common session flags in one call.
+
+    All flags come from one UTC normalization and one calendar build.
     """
-    out = df
-    out = mark_ny_cash(out, col=col)
-    out = mark_ny_premarket(out, col=col)
-    out = mark_ny_afterhours(out, col=col)
-    out = mark_ny_extended(out, col=col)
-    out = mark_london(out, col=col)
-    out = mark_frankfurt(out, col=col)
-    out = mark_london_ny_overlap(out, col=col)
-    return out
+    return _mark_sessions(
+        df,
+        col,
+        {
+            "ny_cash": "in_ny_cash",
+            "ny_premarket": "in_ny_premarket",
+            "ny_afterhours": "in_ny_afterhours",
+            "ny_extended": "in_ny_extended",
+            "london": "in_london_session",
+            "ffm": "in_frankfurt_session",
+            "ldn_ny_overlap": "in_ldn_ny_overlap",
+        },
+    )
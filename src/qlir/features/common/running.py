@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pandas as _pd
 
+from qlir.core.counters._runs import run_lengths
 from qlir.df.utils import _ensure_columns
 from qlir.perf.df_copy import df_copy_measured
 from qlir.perf.logging import log_memory_debug
@@ -74,14 +75,18 @@ def with_counts_running(
     out, ev = df_copy_measured(df=df, label="with_counts_running")
     log_memory_debug(ev=ev, log=log)
 
+    keys = ("above", "below", "touch")
+    rel = out[rel_col]
+    masks = _pd.DataFrame({key: rel.eq(key).astype("int8") for key in keys}, index=out.index)
+
+    # one grouped pass for all relation states
     if group_col:
-        groups = out[group_col]
+        counts = masks.groupby(out[group_col]).cumsum()
     else:
-        groups = _pd.Series(0, index=out.index)
+        counts = masks.cumsum()
 
-    for key in ("above", "below", "touch"):
-        mask = out[rel_col].eq(key).astype("int8")
-        out[f"{out_prefix}{key}"] = mask.groupby(groups).cumsum().astype("int32")
+    for key in keys:
+        out[f"{out_prefix}{key}"] = counts[key].astype("int32")
     return out
 
 
@@ -143,6 +148,7 @@ def with_streaks(
     boundary_change = out[rel_col].ne(out[rel_col].shift(1))
     if group_col:
         boundary_change |= out[group_col].ne(out[group_col].shift(1))
-    out[out_id] = boundary_change.cumsum()
-    out[out_len] = out.groupby(out_id, sort=False).cumcount().add(1).astype("int32")
+    ids, lens = run_lengths(boundary_change.to_numpy()[:, None])
+    out[out_id] = ids[:, 0]
+    out[out_len] = lens[:, 0].astype("int32")
     return out 
\ No newline at end of file
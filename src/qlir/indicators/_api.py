@@ -3,6 +3,7 @@ from __future__ import annotations
 import pandas as pd
 
 from .arp import arp
+from .grid import bollinger_grid, ema_grid, macd_grid, rsi_grid, sma_grid
 from .rsi import rsi
 from .sma import sma
 
@@ -10,6 +11,11 @@ __all__ = [
     "arp",
     "sma",
     "rsi",  
+    "sma_grid",
+    "ema_grid",
+    "rsi_grid",
+    "bollinger_grid",
+    "macd_grid",
 ]
 
 _INDICATORS = {
@@ -0,0 +1,259 @@
+"""
+Grid-aware indicator variants: many parameter sets in one pass.
+
+Parameter studies (SMA 5..200, Bollinger windows × k, RSI periods, MACD
+triples) used to call the single-parameter indicator once per setting,
+rescanning the price column and inserting one column at a time. Here every
+grid shares its expensive intermediate and lands in one 2-D block:
+
+- SMA: one cumulative sum (and one cumulative valid-count), then every window
+  is a difference of two prefix sums.
+- Bollinger: the SMA block above for the mid line; one rolling std per
+  window; every k is a broadcast of the same std.
+- RSI: one diff / gain / loss pass; Wilder smoothing per period.
+- EMA / MACD: one EMA per *distinct* span across the whole grid (MACD fast
+  and slow legs that repeat across triples are computed once).
+
+EMAs are inherently sequential; without a compiled kernel (numba is not a
+dependency) each span runs pandas' C `ewm` over the shared float array, which
+is already the per-span minimum of work.
+
+`rolling_mean_block` / `ema_block` are the raw array kernels. The `*_grid`
+functions return an `AnnotatedDF` whose frame is the input plus all new
+columns, concatenated once; every new column is registered under its own
+name as key.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as _np
+import pandas as _pd
+
+from qlir.core.registries.columns.registry import ColRegistry
+from qlir.core.types.annotated_df import AnnotatedDF
+from qlir.df.utils import _ensure_columns
+
+__all__ = ["sma_grid", "ema_grid", "rsi_grid", "bollinger_grid", "macd_grid"]
+
+
+# ----------------------------------------------------------------------
+# kernels
+# ----------------------------------------------------------------------
+
+def _as_float(df: _pd.DataFrame, col: str) -> _np.ndarray:
+    return df[col].to_numpy(dtype="float64", na_value=_np.nan)
+
+
+def rolling_mean_block(
+    x: _np.ndarray,
+    windows: Sequence[int],
+    *,
+    min_periods: Sequence[int] | None = None,
+) -> _np.ndarray:
+    """
+    `rolling(w, min_periods).mean()` for every window from one prefix sum.
+
+    NaNs are skipped (mean over the valid values in the window, NaN if fewer
+    than `min_periods` of them), like pandas. Values are centred on the first
+    valid value before summing to keep the prefix sums small.
+    """
+    n = len(x)
+    valid = ~_np.isnan(x)
+    all_valid = bool(valid.all())
+    ref = x[valid][0] if valid.any() else 0.0
+    csum = _np.concatenate(([0.0], _np.cumsum(_np.where(valid, x - ref, 0.0))))
+    ccount = None if all_valid else _np.concatenate(([0], _np.cumsum(valid, dtype="int64")))
+
+    ramp = _np.arange(1, n + 1, dtype="float64")
+
+    # (k, n) so every window writes one contiguous row
+    out = _np.empty((len(windows), n))
+    for j, w in enumerate(windows):
+        row = out[j]
+        need = max(w if min_periods is None else min_periods[j], 1)
+        w = min(w, n)
+        row[:w] = csum[1:w + 1]
+        row[w:] = csum[w + 1:] - csum[1:n - w + 1]
+
+        if all_valid:
+            row[:w] /= ramp[:w]
+            row[w:] /= w
+            row += ref
+            row[:need - 1] = _np.nan
+        else:
+            count = _np.empty(n, dtype="int64")
+            count[:w] = ccount[1:w + 1]
+            count[w:] = ccount[w + 1:] - ccount[1:n - w + 1]
+            with _np.errstate(invalid="ignore", divide="ignore"):
+                row /= count
+            row += ref
+            row[count < need] = _np.nan
+    return out.T
+
+
+def ema_block(x: _np.ndarray, spans: Iterable[int], *, min_periods: int = 0) -> dict[int, _np.ndarray]:
+    """
+    `ewm(span=s, adjust=False).mean()` for every distinct span (computed once each).
+    """
+    s = _pd.Series(x)
+    return {
+        span: s.ewm(span=span, adjust=False, min_periods=min_periods).mean().to_numpy()
+        for span in dict.fromkeys(spans)
+    }
+
+
+def _wilder_rsi(gain: _pd.Series, loss: _pd.Series, period: int) -> _np.ndarray:
+    roll_up = gain.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    roll_dn = loss.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    rs = roll_up / roll_dn.replace(0.0, _np.nan)
+    return (100 - (100 / (1 + rs))).to_numpy()
+
+
+def _assemble(df: _pd.DataFrame, block: _np.ndarray, names: list[str], *, label: str) -> AnnotatedDF:
+    """Attach a 2-D block to `df` as new columns in one concat."""
+    if len(set(names)) != len(names):
+        raise ValueError(f"{label}: duplicate parameter sets in grid")
+    wide = _pd.DataFrame(block, index=df.index, columns=names)
+    out = _pd.concat([df.drop(columns=[c for c in names if c in df.columns]), wide], axis=1)
+
+    new_cols = ColRegistry()
+    for name in names:
+        new_cols.add(key=name, column=name)
+    return AnnotatedDF(df=out, new_cols=new_cols, label=label)
+
+
+# ----------------------------------------------------------------------
+# public grids
+# ----------------------------------------------------------------------
+
+def sma_grid(
+    df: _pd.DataFrame,
+    *,
+    col: str,
+    windows: Iterable[int],
+    min_periods: int | None = None,
+    decimals: int | None = None,
+) -> AnnotatedDF:
+    """
+    `indicators.sma` for many windows at once (same column names:
+    `<col>_sma_<window>`).
+
+    Values match `rolling().mean()` up to floating-point summation order
+    (prefix sums instead of pandas' running window sums).
+    """
+    _ensure_columns(df=df, cols=col, caller="sma_grid")
+    windows = list(windows)
+    mins = None if min_periods is None else [min_periods] * len(windows)
+
+    block = rolling_mean_block(_as_float(df, col), windows, min_periods=mins)
+    if decimals is not None:
+        block = _np.round(block, decimals)
+
+    return _assemble(df, block, [f"{col}_sma_{w}" for w in windows], label="sma_grid")
+
+
+def ema_grid(
+    df: _pd.DataFrame,
+    *,
+    col: str,
+    spans: Iterable[int],
+) -> AnnotatedDF:
+    """EMAs (`adjust=False`) for many spans: `<col>_ema_<span>`."""
+    _ensure_columns(df=df, cols=col, caller="ema_grid")
+    spans = list(spans)
+    emas = ema_block(_as_float(df, col), spans)
+    block = _np.column_stack([emas[s] for s in spans]) if spans else _np.empty((len(df), 0))
+    return _assemble(df, block, [f"{col}_ema_{s}" for s in spans], label="ema_grid")
+
+
+def rsi_grid(
+    df: _pd.DataFrame,
+    *,
+    close_col: str = "close",
+    periods: Iterable[int],
+    out_prefix: str = "rsi",
+) -> AnnotatedDF:
+    """
+    `indicators.rsi` for many periods sharing one diff / gain / loss pass:
+    `<out_prefix>_<period>`.
+    """
+    _ensure_columns(df=df, cols=close_col, caller="rsi_grid")
+    periods = list(periods)
+
+    delta = _pd.Series(_as_float(df, close_col)).diff()
+    gain = delta.clip(lower=0)
+    loss = (-delta).clip(lower=0)
+
+    block = _np.empty((len(df), len(periods)))
+    for j, p in enumerate(periods):
+        block[:, j] = _wilder_rsi(gain, loss, p)
+
+    return _assemble(df, block, [f"{out_prefix}_{p}" for p in periods], label="rsi_grid")
+
+
+def bollinger_grid(
+    df: _pd.DataFrame,
+    *,
+    close_col: str = "close",
+    periods: Iterable[int],
+    ks: Iterable[float] = (2.0,),
+) -> AnnotatedDF:
+    """
+    Bollinger bands (as `with_bollinger`) for every period × k.
+
+    Columns: `boll_mid_<period>`, then `boll_upper_<period>_<k>` /
+    `boll_lower_<period>_<k>` per k. The mean and std are computed once per
+    period and shared by every k.
+    """
+    _ensure_columns(df=df, cols=close_col, caller="bollinger_grid")
+    periods = list(periods)
+    ks = list(ks)
+
+    x = _as_float(df, close_col)
+    mid = rolling_mean_block(x, periods, min_periods=[p // 2 for p in periods])
+    s = _pd.Series(x)
+
+    cols: list[_np.ndarray] = []
+    names: list[str] = []
+    for j, p in enumerate(periods):
+        sd = s.rolling(window=p, min_periods=p // 2).std(ddof=0).to_numpy()
+        cols.append(mid[:, j])
+        names.append(f"boll_mid_{p}")
+        for k in ks:
+            cols.extend((mid[:, j] + k * sd, mid[:, j] - k * sd))
+            names.extend((f"boll_upper_{p}_{k:g}", f"boll_lower_{p}_{k:g}"))
+
+    block = _np.column_stack(cols) if cols else _np.empty((len(df), 0))
+    return _assemble(df, block, names, label="bollinger_grid")
+
+
+def macd_grid(
+    df: _pd.DataFrame,
+    *,
+    close_col: str = "close",
+    params: Iterable[tuple[int, int, int]],
+) -> AnnotatedDF:
+    """
+    MACD (as `with_macd`) for many `(fast, slow, signal)` triples.
+
+    Columns per triple: `macd_<f>_<s>_<g>`, `macd_signal_<f>_<s>_<g>`,
+    `macd_hist_<f>_<s>_<g>`. Each distinct fast/slow span is smoothed once.
+    """
+    _ensure_columns(df=df, cols=close_col, caller="macd_grid")
+    params = list(params)
+
+    emas = ema_block(_as_float(df, close_col), [span for f, s, _ in params for span in (f, s)])
+
+    cols: list[_np.ndarray] = []
+    names: list[str] = []
+    for fast, slow, signal in params:
+        macd = emas[fast] - emas[slow]
+        sig = _pd.Series(macd).ewm(span=signal, adjust=False).mean().to_numpy()
+        tag = f"{fast}_{slow}_{signal}"
+        cols.extend((macd, sig, macd - sig))
+        names.extend((f"macd_{tag}", f"macd_signal_{tag}", f"macd_hist_{tag}"))
+
+    block = _np.column_stack(cols) if cols else _np.empty((len(df), 0))
+    return _assemble(df, block, names, label="macd_grid")
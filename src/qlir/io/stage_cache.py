@@ -0,0 +1,307 @@
+"""
+Content-addressed on-disk cache for intermediate research frames.
+
+Iterating on a study reruns the same upstream stages (load, DQ, gap
+materialization, indicators, annotation) on identical inputs. A stage
+decorated with `@cached_stage()` is keyed by
+
+    function identity (module, qualname, source) + every argument,
+
+where DataFrame / AnnotatedDF arguments contribute a content fingerprint of
+their data (values, index, column names and dtypes) rather than their
+identity. The result is stored as parquet under the cache root; a later call
+with the same key reads it back instead of recomputing. An `AnnotatedDF`
+result keeps its `new_cols` declarations and label (stored in the parquet
+schema metadata).
+
+The cache is bounded by total size: every hit refreshes the entry's mtime,
+and after each write the least recently used entries are removed until the
+directory fits in `max_bytes`.
+
+Usage with `@new_col_func` (put the cache *inside* so column announcements
+still happen on a hit):
+
+    @new_col_func(specs=...)
+    @cached_stage()
+    def my_indicator(df, *, col, window) -> AnnotatedDF: ...
+
+Cached stages must be pure: a hit returns the stored frame and does not
+reproduce any in-place mutation of the arguments.
+
+Invalidation: only the decorated function's own source is part of the key.
+Changing a helper, indicator or constant it calls does NOT change the key and
+stale frames keep being served; bump the stage's `version=` (or `clear()` the
+cache) when a callee changes:
+
+    @cached_stage(version=2)  # 2: with_macd warm-up changed
+    def my_stage(df) -> AnnotatedDF: ...
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import enum
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Optional, TypeVar
+import uuid
+
+import pandas as _pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from qlir.core.registries.columns.registry import ColRegistry
+from qlir.core.types.annotated_df import AnnotatedDF
+from qlir.data.core.paths import get_data_root
+
+log = logging.getLogger(__name__)
+
+__all__ = ["StageCache", "cached_stage", "frame_fingerprint", "get_stage_cache", "stage_key"]
+
+_META_KEY = b"qlir_stage"
+_DEFAULT_MAX_BYTES = 2 * 1024**3
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class UncacheableArgument(TypeError):
+    """An argument has no stable content representation (e.g. an arbitrary object)."""
+
+
+# ---------- Keys ----------
+def frame_fingerprint(df: _pd.DataFrame) -> str:
+    """
+    Hash of a frame's contents: values, index, column names and dtypes.
+
+    Raises UncacheableArgument for cells pandas cannot hash (lists, dicts).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    h.update(repr((df.index.name, str(df.index.dtype), df.shape)).encode())
+    try:
+        values = _pd.util.hash_pandas_object(df, index=True)
+    except TypeError as e:
+        raise UncacheableArgument(f"frame has unhashable cells ({e})") from e
+    h.update(values.to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _stable(value: Any) -> Any:
+    """JSON-able, process-independent representation of an argument."""
+    if isinstance(value, AnnotatedDF):
+        return {"annotated_df": frame_fingerprint(value.df)}
+    if isinstance(value, _pd.DataFrame):
+        return {"df": frame_fingerprint(value)}
+    if isinstance(value, _pd.Series):
+        return {"series": frame_fingerprint(value.to_frame(name=str(value.name)))}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, enum.Enum):
+        return f"{type(value).__qualname__}.{value.name}"
+    if isinstance(value, (list, tuple)):
+        return [_stable(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_stable(v) for v in value)
+    if isinstance(value, dict):
+        return {str(k): _stable(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {type(value).__qualname__: _stable(dataclasses.asdict(value))}
+    if isinstance(value, (_pd.Timestamp, _pd.Timedelta, Path)):
+        return repr(value)
+    if callable(value) and hasattr(value, "__qualname__"):
+        return _callable_identity(value)
+    raise UncacheableArgument(f"no stable cache key for argument of type {type(value).__name__}")
+
+
+def _callable_identity(fn: Callable) -> str:
+    # lambdas and nested functions share a qualname across definitions, and a
+    # closure's behaviour depends on its cells: neither has a stable key
+    qualname = fn.__qualname__
+    if "<lambda>" in qualname or "<locals>" in qualname or getattr(fn, "__closure__", None):
+        raise UncacheableArgument(f"no stable cache key for lambda / closure {qualname}")
+    return _fn_identity(fn)
+
+
+def _fn_identity(fn: Callable) -> str:
+    fn = inspect.unwrap(fn)
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = fn.__code__.co_code.hex() if hasattr(fn, "__code__") else ""
+    return f"{fn.__module__}.{fn.__qualname__}:{hashlib.blake2b(source.encode(), digest_size=8).hexdigest()}"
+
+
+def stage_key(fn: Callable, args: tuple, kwargs: dict, *, version: int | str = 0) -> str:
+    """Cache key for calling `fn(*args, **kwargs)` (raises UncacheableArgument)."""
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    bound.apply_defaults()
+    payload = json.dumps(
+        {
+            "fn": _fn_identity(fn),
+            "version": version,
+            "args": {k: _stable(v) for k, v in bound.arguments.items()},
+        },
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+
+# ---------- Storage ----------
+def _touch(path: Path) -> None:
+    # explicit ns timestamps: the filesystem's own clock can be too coarse to order entries
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+class StageCache:
+    """
+    Parquet files under `root`, one per key, evicted LRU by total size.
+
+    Parameters
+    ----------
+    root : Path | str | None
+        Cache directory. Default: `$QLIR_STAGE_CACHE_DIR`, else
+        `<data root>/_stage_cache` (see `data.core.paths.get_data_root`).
+    max_bytes : int
+        Size budget for the whole directory.
+    """
+
+    def __init__(self, root: Optional[Path | str] = None, *, max_bytes: int = _DEFAULT_MAX_BYTES):
+        if root is None:
+            env = os.environ.get("QLIR_STAGE_CACHE_DIR")
+            root = Path(env) if env else get_data_root() / "_stage_cache"
+        self.root = Path(root).expanduser()
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.parquet"
+
+    def get(self, key: str) -> _pd.DataFrame | AnnotatedDF | None:
+        path = self._path(key)
+        try:
+            table = pq.read_table(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, pa.ArrowException):
+            log.warning("Dropping unreadable stage cache entry %s", path, exc_info=True)
+            path.unlink(missing_ok=True)
+            return None
+
+        _touch(path)  # LRU: mark as recently used
+        df = table.to_pandas()
+        meta = (table.schema.metadata or {}).get(_META_KEY)
+        if meta is None:
+            return df
+
+        info = json.loads(meta)
+        new_cols = ColRegistry()
+        for key_, column in info["new_cols"]:
+            new_cols.add(key=key_, column=column)
+        return AnnotatedDF(df=df, new_cols=new_cols, label=info["label"])
+
+    def put(self, key: str, value: _pd.DataFrame | AnnotatedDF) -> bool:
+        """Store a result; returns False (and logs) if it cannot be written as parquet."""
+        df = value.df if isinstance(value, AnnotatedDF) else value
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=True)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            log.warning("Stage result not cacheable as parquet (%s); not cached", e)
+            return False
+
+        if isinstance(value, AnnotatedDF):
+            info = {
+                "new_cols": [[d.key, d.column] for d in value.new_cols.values()],
+                "label": value.label,
+            }
+            table = table.replace_schema_metadata(
+                {**(table.schema.metadata or {}), _META_KEY: json.dumps(info).encode()}
+            )
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+        _touch(path)
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        entries = []
+        for p in self.root.glob("*.parquet"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, p))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            log.debug("Evicted stage cache entry %s (%d bytes)", p.name, size)
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.root.glob("*.parquet"))
+
+    def clear(self) -> None:
+        for p in self.root.glob("*.parquet"):
+            p.unlink(missing_ok=True)
+
+
+_default_cache: Optional[StageCache] = None
+
+
+def get_stage_cache() -> StageCache:
+    """Process-wide default cache (created on first use)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = StageCache()
+    return _default_cache
+
+
+# ---------- Decorator ----------
+def cached_stage(cache: Optional[StageCache] = None, *, version: int | str = 0) -> Callable[[F], F]:
+    """
+    Serve a DataFrame / AnnotatedDF-returning stage from the stage cache.
+
+    `version` is part of the key: bump it whenever something the stage calls
+    changes its output (see the module docstring). Calls with an argument
+    that has no stable representation run uncached. Set `QLIR_STAGE_CACHE=0`
+    to bypass the cache entirely.
+    """
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if os.environ.get("QLIR_STAGE_CACHE", "1") == "0":
+                return fn(*args, **kwargs)
+
+            store = cache or get_stage_cache()
+            try:
+                key = stage_key(fn, args, kwargs, version=version)
+            except UncacheableArgument as e:
+                log.debug("%s: running uncached (%s)", fn.__qualname__, e)
+                return fn(*args, **kwargs)
+
+            hit = store.get(key)
+            if hit is not None:
+                log.info("[stage cache] hit %s (%s)", fn.__qualname__, key[:12])
+                return hit
+
+            result = fn(*args, **kwargs)
+            if isinstance(result, (_pd.DataFrame, AnnotatedDF)):
+                store.put(key, result)
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
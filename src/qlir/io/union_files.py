@@ -1,45 +1,219 @@
+from collections import defaultdict
 import logging
 from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
 
 import pandas as _pd
+import pyarrow as pa
 import pyarrow.dataset as ds
 
 from .filetype import FileType
-from .helpers import detect_homogeneous_filetype
 from .reader import read
 
 log = logging.getLogger(__name__)
 
-def union_file_datasets(dir_path: str | Path) -> _pd.DataFrame: # type: ignore
-    log.info(dir_path)
-    dir = Path(dir_path)
-    log.info(f"Unioning files in {dir_path}")
-    #check for homogenous extensions
-    filetype = detect_homogeneous_filetype(dir_path)
-    
-    #if heterogenous extensions, then warn, but proceed file by file 
-    if filetype is None:
+_DEFAULT_BATCH_SIZE = 131_072
+
+# extension -> FileType; parquet is scanned lazily by pyarrow, csv / json go
+# through the pandas readers (see _pandas_datasets)
+_FORMATS = {
+    "parquet": FileType.PARQUET,
+    "csv": FileType.CSV,
+    "test_csv": FileType.CSV,
+    "json": FileType.JSON,
+}
+
+
+# ---------- Sources ----------
+def _source_files(dir_path: str | Path) -> dict[str, list[Path]]:
+    """Files directly in `dir_path`, grouped by FileType."""
+    groups: dict[str, list[Path]] = defaultdict(list)
+    for f in sorted(Path(dir_path).iterdir()):
+        if not f.is_file():
+            continue
+        ext = f.suffix.lower().lstrip(".")
+        if ext not in _FORMATS:
+            raise ValueError(f"Unsupported extension: .{ext} ({f}). Use .csv, .parquet, or .json.")
+        groups[_FORMATS[ext]].append(f)
+    return groups
+
+
+def _parquet_dataset(files: list[Path]) -> ds.Dataset:
+    """
+    One lazy dataset over the parquet files, with the union of their schemas
+    (columns missing from a file read as nulls, like the old pandas concat).
+    """
+    paths = [str(f) for f in files]
+    dataset = ds.dataset(paths, format=FileType.PARQUET)
+    schemas = [frag.physical_schema for frag in dataset.get_fragments()]
+    if len(schemas) > 1 and any(not s.equals(schemas[0]) for s in schemas[1:]):
+        dataset = ds.dataset(paths, format=FileType.PARQUET, schema=pa.unify_schemas(schemas, promote_options="permissive"))
+    return dataset
+
+
+def _pandas_datasets(files: list[Path], time_col: Optional[str], start: Any, end: Any) -> Iterator[ds.Dataset]:
+    """
+    CSV and JSON are read one file at a time with the pandas readers, so they
+    keep pandas typing (e.g. ISO timestamps in a CSV stay strings), and are
+    scanned from memory. The time range is applied here, in pandas.
+    """
+    for f in files:
+        df = _frame_time_filter(read(f), time_col, start, end)
+        yield ds.dataset(pa.Table.from_pandas(df, preserve_index=False))
+
+
+def _datasets(
+    dir_path: str | Path, time_col: Optional[str], start: Any, end: Any
+) -> Iterator[tuple[ds.Dataset, Optional[ds.Expression]]]:
+    """Datasets in `dir_path`, each with the time filter still to apply to it."""
+    groups = _source_files(dir_path)
+    if len(groups) > 1:
         log.info("Multiple file types found in: %s", dir_path)
-        dfs: list[_pd.DataFrame] = []
-        for file in dir.iterdir():
-            dfs.append(read(file))
-        data = _pd.concat(dfs, ignore_index=True)
-        return data
-    
-    # Process Homogeneous 
-    if filetype:
-        # Fast path for parquet files 
-        if filetype == FileType.PARQUET:
-            dataset = ds.dataset(dir_path, format="parquet")
-            table = dataset.to_table()
-            df = table.to_pandas()
-            return df
+    for fmt, files in groups.items():
+        if fmt == FileType.PARQUET:
+            dataset = _parquet_dataset(files)
+            yield dataset, _time_filter(dataset.schema, time_col, start, end)
         else:
-            # Going for a list of dataframes rather than straight append for debuggability purposes
-            dfs: list[_pd.DataFrame] = []
-            for file in dir.iterdir():
-                dfs.append(read(file))
-            data = _pd.concat(dfs, ignore_index=True)
-            return data
-
-        
+            for dataset in _pandas_datasets(files, time_col, start, end):
+                yield dataset, None
+
+
+# ---------- Projection / filters ----------
+def _bound(value: Any, typ: pa.DataType) -> pa.Scalar:
+    """A filter bound in the column's own type (tz-aware bounds vs naive columns are taken as UTC)."""
+    if pa.types.is_timestamp(typ):
+        ts = _pd.Timestamp(value)
+        if typ.tz is None:
+            ts = ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo else ts
+        elif ts.tzinfo is None:
+            ts = ts.tz_localize("UTC")
+        return pa.scalar(ts, type=typ)
+    try:
+        return pa.scalar(value).cast(typ)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise TypeError(f"Cannot use {value!r} as a bound for a {typ} column") from e
+
+
+def _time_filter(
+    schema: pa.Schema,
+    time_col: Optional[str],
+    start: Any,
+    end: Any,
+) -> Optional[ds.Expression]:
+    if time_col is None or (start is None and end is None):
+        return None
+    if schema.get_field_index(time_col) < 0:
+        raise KeyError(f"time_col '{time_col}' not found; columns: {schema.names}")
+
+    typ = schema.field(time_col).type
+    field = ds.field(time_col)
+    expr = None
+    if start is not None:
+        expr = field >= _bound(start, typ)
+    if end is not None:
+        upper = field < _bound(end, typ)
+        expr = upper if expr is None else expr & upper
+    return expr
+
+
+def _utc(value: Any) -> _pd.Timestamp:
+    ts = _pd.Timestamp(value)
+    return ts.tz_convert("UTC") if ts.tzinfo else ts.tz_localize("UTC")
+
+
+def _frame_time_filter(df: _pd.DataFrame, time_col: Optional[str], start: Any, end: Any) -> _pd.DataFrame:
+    """`_time_filter` for a pandas-read source: timestamp strings are parsed, naive ones as UTC."""
+    if time_col is None or (start is None and end is None):
+        return df
+    if time_col not in df.columns:
+        raise KeyError(f"time_col '{time_col}' not found; columns: {list(df.columns)}")
+
+    col = df[time_col]
+    if _pd.api.types.is_numeric_dtype(col):
+        lo, hi = start, end
+    else:
+        col = _pd.to_datetime(col, utc=True)
+        lo = None if start is None else _utc(start)
+        hi = None if end is None else _utc(end)
+    mask = _pd.Series(True, index=df.index)
+    if lo is not None:
+        mask &= col >= lo
+    if hi is not None:
+        mask &= col < hi
+    return df[mask]
+
+
+def _projection(schema: pa.Schema, columns: Optional[Sequence[str]]) -> Optional[list[str]]:
+    if columns is None:
+        return None
+    return [c for c in columns if schema.get_field_index(c) >= 0]
+
+
+# ---------- Public API ----------
+def scan_file_datasets(
+    dir_path: str | Path,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    time_col: Optional[str] = None,
+    start: Any = None,
+    end: Any = None,
+    batch_size: int = _DEFAULT_BATCH_SIZE,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Scan every csv / parquet / json file in `dir_path` as record batches.
+
+    Parameters
+    ----------
+    columns : sequence[str] | None
+        Only read these columns (columns a source does not have are skipped).
+    time_col, start, end : optional
+        Keep rows with `start <= time_col < end` (either bound may be None).
+        Bounds are converted to the column's type (timestamp strings in CSV /
+        JSON are parsed for the comparison); pushed down to parquet row-group
+        statistics.
+    batch_size : int
+        Maximum rows per yielded batch.
+
+    Parquet is scanned lazily: only the requested columns and matching rows
+    are materialized, one batch at a time. CSV and JSON files are read whole,
+    one file at a time, with pandas typing. Batches from different file types
+    may carry different schemas.
+    """
+    for dataset, time_filter in _datasets(dir_path, time_col, start, end):
+        yield from dataset.to_batches(
+            columns=_projection(dataset.schema, columns),
+            filter=time_filter,
+            batch_size=batch_size,
+        )
+
+
+def union_file_datasets(
+    dir_path: str | Path,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    time_col: Optional[str] = None,
+    start: Any = None,
+    end: Any = None,
+) -> _pd.DataFrame:
+    """
+    Union every csv / parquet / json file in `dir_path` into one DataFrame.
+
+    Accepts the same projection and time-range arguments as
+    `scan_file_datasets`; with none given, every row and column is loaded.
+    Columns missing from some files are null for their rows.
+    """
+    log.info(f"Unioning files in {dir_path}")
+
+    tables = [
+        dataset.to_table(columns=_projection(dataset.schema, columns), filter=time_filter)
+        for dataset, time_filter in _datasets(dir_path, time_col, start, end)
+    ]
+    if not tables:
+        return _pd.DataFrame(columns=list(columns or []))
+
+    try:
+        table = pa.concat_tables(tables, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # incompatible types across file formats: let pandas reconcile them
+        return _pd.concat([t.to_pandas() for t in tables], ignore_index=True)
+    return table.to_pandas()
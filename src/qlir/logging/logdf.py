@@ -1,4 +1,6 @@
 import logging
+import sys
+import time
 from typing import Iterable, Sequence
 
 import pandas as _pd
@@ -16,6 +18,9 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Last emit time (monotonic seconds) per rate-limit key; see `logdf(rate_limit_s=...)`.
+_LAST_EMIT_AT: dict[str, float] = {}
+
 
 
 def _filter_df_by_row_idx(
@@ -49,29 +54,42 @@ def _filter_df_by_row_idx(
     if df is None or len(df) == 0:
         return df.iloc[0:0]
 
-    n = len(df)
+    start, end = _resolve_row_bounds(len(df), start_incl, end_excl)
 
-    # Normalize Python-style negative indices
-    if start_incl < 0:
-        start = max(0, n + start_incl)
-    else:
-        start = start_incl
+    # Empty slice if invalid range
+    if start >= end:
+        return df.iloc[0:0]
+
+    # Use positional slicing
+    return df.iloc[start:end]
 
-    if end_excl < 0:
-        end = max(0, n + end_excl)
-    else:
-        end = end_excl
+
+def _resolve_row_bounds(n: int, start_incl: int, end_excl: int) -> tuple[int, int]:
+    """
+    Normalize Python-style (possibly negative) row bounds against a frame of
+    length `n` and clamp them to [0, n].
+    """
+    # Normalize Python-style negative indices
+    start = max(0, n + start_incl) if start_incl < 0 else start_incl
+    end = max(0, n + end_excl) if end_excl < 0 else end_excl
 
     # Clamp to valid boundaries
     start = max(0, min(start, n))
     end   = max(0, min(end, n))
+    return start, end
 
-    # Empty slice if invalid range
-    if start >= end:
-        return df.iloc[0:0]
 
-    # Use positional slicing
-    return df.iloc[start:end]
+def _rate_limited(key: str, rate_limit_s: float) -> bool:
+    """
+    Return True if a logdf call for `key` was emitted less than `rate_limit_s`
+    seconds ago. Otherwise record this call as emitted and return False.
+    """
+    now = time.monotonic()
+    last = _LAST_EMIT_AT.get(key)
+    if last is not None and now - last < rate_limit_s:
+        return True
+    _LAST_EMIT_AT[key] = now
+    return False
 
 
 def _warn_invalid_columns(
@@ -125,12 +143,15 @@ def _fmt_df(df: _pd.DataFrame, max_width: int = 120, fmt_bool_cols: bool = False
     """
     Formats a DataFrame into a human-readable table that fits within max_width.
     Falls back to df.to_string() if tabulate isn't available.
+
+    Callers are expected to pass an already row/column-sliced view; only the
+    display columns are materialized (the input is never copied).
     """
-    df_copy = df.copy()
+    display_cols: dict = {}
 
     # Normalize NA policy
     if na_as_empty is True:
-        na_cols = set(df_copy.columns)
+        na_cols = set(df.columns)
     elif na_as_empty:
         na_cols = set(
         _warn_invalid_columns(
@@ -152,7 +173,9 @@ def _fmt_df(df: _pd.DataFrame, max_width: int = 120, fmt_bool_cols: bool = False
         int_cols = set()
 
 
-    for col in df_copy.columns:
+    per_col_width = max(1, max_width // max(1, len(df.columns)))
+
+    for col in df.columns:
 
         orig = df[col]
 
@@ -172,19 +195,20 @@ def _fmt_df(df: _pd.DataFrame, max_width: int = 120, fmt_bool_cols: bool = False
 
         # ---- Width / truncation (DISPLAY ONLY) ----
         max_len = disp.str.len().max()
-        per_col_width = max(1, max_width // max(1, len(df_copy.columns)))
 
         if max_len > per_col_width:
             cutoff = per_col_width - 3
             disp = disp.str.slice(0, cutoff) + "…"
 
         # ---- Commit ----
-        df_copy[col] = disp
+        display_cols[col] = disp
+
+    df_disp = _pd.DataFrame(display_cols, index=df.index, columns=df.columns)
 
     if _HAS_TABULATE:
-        return tabulate(df_copy, headers="keys", tablefmt="github", showindex=True)
+        return tabulate(df_disp, headers="keys", tablefmt="github", showindex=True)
     else:
-        return df_copy.to_string(index=True)
+        return df_disp.to_string(index=True)
 
 
 def logdf(
@@ -199,7 +223,8 @@ def logdf(
     fmt_bool_cols: bool = False,
     na_as_empty: bool | Sequence[str] = False,
     display_as_int: bool | Sequence[str] = False,
-
+    rate_limit_s: float | None = None,
+    rate_limit_key: str | None = None,
 ) -> None:
     """
     Log a DataFrame (or collection of DataFrames) in a compact, human-readable
@@ -279,6 +304,12 @@ def logdf(
       safely on the same columns.
     - **Non-fatal diagnostics**: Invalid column names are logged as warnings
       and ignored, never raised.
+    - **Lazy**: nothing is sliced, formatted or stringified unless the
+      `qlir.logdf` logger is enabled for `level`. A disabled call (e.g. a
+      `level="debug"` inspection point in a server running at INFO) returns
+      after a single `isEnabledFor` check. When enabled, only the requested
+      rows are sliced *before* column filtering and formatting, so the cost
+      scales with `max_rows`, not with `len(df)`.
 
     Parameters
     ----------
@@ -286,7 +317,8 @@ def logdf(
         A pandas DataFrame, NamedDF, or an iterable of either.
 
     from_row_idx : int, default 0
-        Starting row index (after filtering) for display.
+        Starting row index (after filtering) for display. Negative values count
+        from the end, so `from_row_idx=-20, max_rows=20` renders the tail.
 
     max_rows : int, default 10
         Maximum number of rows to display per DataFrame.
@@ -319,6 +351,15 @@ def logdf(
         point (e.g. 22.0 → "22"), without changing underlying dtype or missingness.
         May be applied globally or per-column.
 
+    rate_limit_s : float | None, default None
+        If set, emit at most once every `rate_limit_s` seconds per call site.
+        Suppressed calls return before any rendering, which makes `logdf`
+        safe to leave inside per-candle / per-slice loops.
+
+    rate_limit_key : str | None
+        Explicit key for rate limiting. Defaults to the caller's
+        `filename:lineno`, so distinct call sites are throttled independently.
+
     Returns
     -------
     None
@@ -328,9 +369,25 @@ def logdf(
 
     logger = logging.getLogger("qlir.logdf")
 
-    # Map level string → log method with a safe default.
-    level_str = (level or "info").lower()
-    emit = getattr(logger, level_str, logger.info)
+    # Map level string → numeric level with a safe default.
+    level_str = (level or "info").upper()
+    levelno = logging.getLevelName(level_str)
+    if not isinstance(levelno, int):
+        levelno = logging.INFO
+
+    # ---- Lazy gate: bail out before touching the data ----
+    if not logger.isEnabledFor(levelno):
+        return
+
+    if rate_limit_s is not None:
+        if rate_limit_key is None:
+            caller = sys._getframe(1)
+            rate_limit_key = f"{caller.f_code.co_filename}:{caller.f_lineno}"
+        if _rate_limited(rate_limit_key, rate_limit_s):
+            return
+
+    def emit(msg: str) -> None:
+        logger.log(levelno, msg)
 
     def _log_one(df: _pd.DataFrame,
                  idx: int, 
@@ -340,8 +397,16 @@ def logdf(
             emit(f"{name or 'DataFrame'} is empty.")
             return
 
-        view = df
-        
+        # Slice rows first (a cheap positional view) so column selection and
+        # formatting only ever touch the displayed rows.
+        n = len(df)
+        excl_idx = from_row_idx + max_rows
+        if from_row_idx < 0 and excl_idx >= 0:
+            excl_idx = n
+        start, end = _resolve_row_bounds(n, from_row_idx, excl_idx)
+        filtered = _filter_df_by_row_idx(df, start, end)
+
+        n_cols_shown = len(df.columns)
         if effective_cols is not None:
             effective_cols = _warn_invalid_columns(
                 df=df,
@@ -349,22 +414,19 @@ def logdf(
                 context=f"cols_filter (df_idx={idx})",
                 logger=logger,
             )
-            existing = [c for c in effective_cols if c in df.columns]
-            if existing:
-                view = df[existing]
-        
-        
+            if effective_cols:
+                filtered = filtered[effective_cols]
+                n_cols_shown = len(effective_cols)
+
         col_subset_info = ""
-        if len(view.columns) != len(df.columns):
-            col_subset_info = f"(Showing {len(view.columns)} of {len(df.columns)} columns)"
+        if n_cols_shown != len(df.columns):
+            col_subset_info = f"(Showing {n_cols_shown} of {len(df.columns)} columns)"
         header = f"\n📊 {name or 'DataFrame'} (original_shape={df.shape}) {col_subset_info}"
-        excl_idx = from_row_idx + max_rows
-        filtered = _filter_df_by_row_idx(view, from_row_idx, excl_idx)
         table = _fmt_df(filtered, max_width=max_width, fmt_bool_cols=fmt_bool_cols, na_as_empty=na_as_empty, display_as_int=display_as_int)
 
         footer = ""
-        if len(filtered) < len(df):
-            footer = f"\n… showing rows {from_row_idx}:{min(excl_idx, len(df))} of {len(df)}"
+        if len(filtered) < n:
+            footer = f"\n… showing rows {start}:{max(start, end)} of {n}"
 
         emit(f"\n{header}\n{table}{footer}\n")
 
@@ -17,6 +17,7 @@ from qlir.data.agg.engine import AggConfig, run_agg_daemon
 from qlir.data.agg.paths import DatasetPaths
 from qlir.data.core.paths import get_data_root
 from qlir.servers.logging.logging_setup import LogProfile, setup_logging
+from qlir.telemetry.heartbeat import start_heartbeat
 
 # Logging is infra-owned (same as data_server)
 setup_logging(profile=LogProfile.QLIR_DEBUG)
@@ -143,6 +144,7 @@ def main() -> None:
         f"  agg_root={agg_root}"
     )
 
+    start_heartbeat("agg_server")
     run_agg_daemon(
         paths=paths,
         dataset_meta=dataset_meta,
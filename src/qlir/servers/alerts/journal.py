@@ -0,0 +1,381 @@
+"""
+Append-only, segment-rotated alert journal (one per outbox).
+
+Layout::
+
+    $QLIR_ALERTS_DIR/_journal/<outbox>/
+        00000001.log          segments, appended in order
+        00000002.log
+        notification-server.offset   committed consumer offset
+        failed.jsonl          every `failed` record, one JSON line each (never compacted)
+        .lock                 producer lock (flock)
+        .tail                 end of the last append ("<segment>:<pos>")
+
+Every record is a frame: 8-byte header (payload length, CRC32 of payload,
+little endian) followed by the JSON payload. A record's id / offset is
+`"<segment>:<byte position>"`.
+
+Producers (`emit_alert`, `ops_watcher.outbox.emit_event` in journal mode, the
+notification server's file bridge) append a *batch* of records with one
+write and one fsync under an exclusive `flock`, so several processes can
+share an outbox. A torn tail frame (crash mid-write) is truncated before the
+next append; only the bytes after the last known-good end (`.tail`, or what
+this instance appended itself) are checked, never the whole segment.
+Producers should keep one instance per outbox (`open_journal`).
+
+Consumers track a committed offset per consumer name (written atomically).
+Record kinds:
+
+    alert   {"kind": "alert", "alert": {...the file contract...}}
+    retry   {"kind": "retry", "ref": <id>, "retries": n, "not_before": epoch_s, "alert": {...}}
+    failed  {"kind": "failed", "ref": <id>, "retries": n, "error": str, "alert": {...}}
+            (an alert file that never parsed: "ref" is its name, "alert" is
+            null and "raw" holds its text)
+
+Segments entirely before the committed offset can be dropped with `compact`.
+`failed` records are also mirrored to `failed.jsonl`, which compaction does
+not touch, so it stays the permanent record of alerts that were given up on.
+
+Inspect the journals with
+
+    python -m qlir.servers.alerts.journal [outbox ...] [--failed]
+
+(segments, committed offset, records pending / awaiting retry / failed per
+outbox; `--failed` prints the failed records).
+
+Producers use the journal when `QLIR_ALERT_TRANSPORT=journal`; the default
+(`files`) keeps writing one JSON file per alert, which the notification
+server bridges into the journal on arrival.
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import contextmanager
+from dataclasses import dataclass
+import fcntl
+from functools import lru_cache
+import json
+import os
+from pathlib import Path
+import struct
+import time
+from typing import Any, Iterable, Iterator
+import zlib
+
+from qlir.servers.alerts.paths import get_alerts_root
+
+_HEADER = struct.Struct("<II")  # payload length, crc32
+_SEGMENT_SUFFIX = ".log"
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+DEFAULT_CONSUMER = "notification-server"
+FAILED_LOG = "failed.jsonl"
+
+
+@dataclass(frozen=True, order=True)
+class Offset:
+    segment: int
+    pos: int
+
+    def __str__(self) -> str:
+        return f"{self.segment}:{self.pos}"
+
+    @classmethod
+    def parse(cls, s: str) -> "Offset":
+        seg, pos = s.split(":")
+        return cls(int(seg), int(pos))
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    offset: Offset
+    next_offset: Offset
+    record: dict[str, Any]
+
+    @property
+    def id(self) -> str:
+        return str(self.offset)
+
+
+def journal_dir(outbox: str) -> Path:
+    return get_alerts_root() / "_journal" / outbox
+
+
+def journal_transport_enabled() -> bool:
+    return os.environ.get("QLIR_ALERT_TRANSPORT", "files").lower() == "journal"
+
+
+def _frame(record: dict[str, Any]) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode()
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _scan(buf: bytes, start: int = 0) -> Iterator[tuple[int, int, bytes]]:
+    """(pos, end, payload) for every complete, intact frame from `start`."""
+    pos = start
+    while pos + _HEADER.size <= len(buf):
+        length, crc = _HEADER.unpack_from(buf, pos)
+        end = pos + _HEADER.size + length
+        if end > len(buf):
+            return
+        payload = buf[pos + _HEADER.size:end]
+        if zlib.crc32(payload) != crc:
+            return
+        yield pos, end, payload
+        pos = end
+
+
+class AlertJournal:
+    """
+    Journal for one outbox directory.
+
+    Parameters
+    ----------
+    directory : Path
+        Journal directory (see `journal_dir`).
+    segment_bytes : int
+        Start a new segment once the active one reaches this size.
+    """
+
+    def __init__(self, directory: Path, *, segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._checked_tail: tuple[int, int] | None = None  # (segment, size) known intact
+
+    @classmethod
+    def for_outbox(cls, outbox: str, **kw) -> "AlertJournal":
+        return cls(journal_dir(outbox), **kw)
+
+    # -------------------------------------------------
+    # segments
+    # -------------------------------------------------
+
+    def segments(self) -> list[int]:
+        return sorted(int(p.stem) for p in self.directory.glob(f"*{_SEGMENT_SUFFIX}") if p.stem.isdigit())
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}{_SEGMENT_SUFFIX}"
+
+    @contextmanager
+    def _locked(self):
+        with open(self.directory / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _known_good(self, segment: int, size: int) -> int:
+        """A frame boundary at or before `size` in `segment` (0 if none is known)."""
+        best = 0
+        if self._checked_tail is not None and self._checked_tail[0] == segment:
+            best = self._checked_tail[1]
+        try:
+            tail = Offset.parse((self.directory / ".tail").read_text().strip())
+        except (OSError, ValueError):
+            pass  # missing / torn: fall back to what we know
+        else:
+            if tail.segment == segment:
+                best = max(best, tail.pos)
+        return best if best <= size else 0
+
+    def _write_tail(self, segment: int, pos: int) -> None:
+        tmp = self.directory / ".tail.tmp"
+        tmp.write_text(str(Offset(segment, pos)))
+        tmp.replace(self.directory / ".tail")
+
+    def _repair_tail(self, segment: int) -> None:
+        path = self._segment_path(segment)
+        size = path.stat().st_size if path.exists() else 0
+        if self._checked_tail == (segment, size):
+            return
+        good = self._known_good(segment, size)
+        if good < size:
+            with open(path, "rb") as f:
+                f.seek(good)
+                buf = f.read()
+            start = good
+            for _, end, _ in _scan(buf):
+                good = start + end
+            if good != size:
+                with open(path, "r+b") as f:
+                    f.truncate(good)
+        self._checked_tail = (segment, good)
+
+    # -------------------------------------------------
+    # producer
+    # -------------------------------------------------
+
+    def append(self, records: Iterable[dict[str, Any]]) -> list[str]:
+        """Append records as one batch (one write, one fsync); returns their ids."""
+        records = list(records)
+        frames = [_frame(r) for r in records]
+        if not frames:
+            return []
+        failed = [r for r in records if r.get("kind") == "failed"]
+
+        with self._locked():
+            segments = self.segments()
+            segment = segments[-1] if segments else 1
+            self._repair_tail(segment)
+
+            path = self._segment_path(segment)
+            size = path.stat().st_size if path.exists() else 0
+            if size >= self.segment_bytes:
+                segment, size = segment + 1, 0
+                path = self._segment_path(segment)
+
+            ids = []
+            pos = size
+            for frame in frames:
+                ids.append(str(Offset(segment, pos)))
+                pos += len(frame)
+
+            with open(path, "ab") as f:
+                f.write(b"".join(frames))
+                f.flush()
+                os.fsync(f.fileno())
+            self._checked_tail = (segment, pos)
+            self._write_tail(segment, pos)
+
+            if failed:
+                with open(self.directory / FAILED_LOG, "a", encoding="utf-8") as f:
+                    for record, id_ in zip(records, ids):
+                        if record.get("kind") == "failed":
+                            f.write(json.dumps({"id": id_, **record}, separators=(",", ":")) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        return ids
+
+    # -------------------------------------------------
+    # consumer
+    # -------------------------------------------------
+
+    def read(self, start: Offset | None = None) -> Iterator[JournalEntry]:
+        """Intact records from `start` (default: the beginning) to the current end."""
+        segments = self.segments()
+        if not segments:
+            return
+        start = start or Offset(segments[0], 0)
+
+        for segment in segments:
+            if segment < start.segment:
+                continue
+            first = start.pos if segment == start.segment else 0
+            with open(self._segment_path(segment), "rb") as f:
+                f.seek(first)
+                buf = f.read()
+            last_end = 0
+            for pos, end, payload in _scan(buf):
+                last_end = end
+                yield JournalEntry(Offset(segment, first + pos), Offset(segment, first + end), json.loads(payload))
+            if last_end < len(buf):
+                return  # torn / in-progress tail: stop here, retry next read
+
+    def end_offset(self) -> Offset:
+        segments = self.segments()
+        if not segments:
+            return Offset(1, 0)
+        return Offset(segments[-1], self._segment_path(segments[-1]).stat().st_size)
+
+    def committed_offset(self, consumer: str = DEFAULT_CONSUMER) -> Offset | None:
+        try:
+            return Offset.parse((self.directory / f"{consumer}.offset").read_text().strip())
+        except FileNotFoundError:
+            return None
+
+    def commit(self, offset: Offset, consumer: str = DEFAULT_CONSUMER) -> None:
+        path = self.directory / f"{consumer}.offset"
+        tmp = path.with_suffix(".offset.tmp")
+        tmp.write_text(str(offset))
+        tmp.replace(path)
+
+    def failed(self) -> list[dict[str, Any]]:
+        """Every `failed` record ever appended (from `failed.jsonl`, oldest first)."""
+        try:
+            lines = (self.directory / FAILED_LOG).read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+        out = []
+        for line in lines:
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue  # torn last line
+        return out
+
+    def compact(self, upto: Offset, *, keep: int = 0) -> list[int]:
+        """
+        Delete segments entirely before `upto`, keeping the newest `keep` of
+        them. `failed.jsonl` is never compacted.
+        """
+        done = [s for s in self.segments() if s < upto.segment]
+        drop = done[:-keep] if keep else done
+        for s in drop:
+            self._segment_path(s).unlink(missing_ok=True)
+        return drop
+
+
+@lru_cache(maxsize=None)
+def open_journal(directory: Path) -> AlertJournal:
+    """The process-wide `AlertJournal` for `directory` (its checked tail carries over)."""
+    return AlertJournal(directory)
+
+
+def alert_record(alert: dict[str, Any]) -> dict[str, Any]:
+    return {"kind": "alert", "alert": alert}
+
+
+# -------------------------------------------------
+# inspection CLI
+# -------------------------------------------------
+
+def summarize(journal: AlertJournal, consumer: str = DEFAULT_CONSUMER) -> dict[str, Any]:
+    """Segments, committed offset and record counts after it for one journal."""
+    committed = journal.committed_offset(consumer)
+    now = time.time()
+    pending = waiting = 0
+    for entry in journal.read(committed):
+        kind = entry.record.get("kind")
+        if kind == "alert" or (kind == "retry" and entry.record.get("not_before", 0) <= now):
+            pending += 1
+        elif kind == "retry":
+            waiting += 1
+    return {
+        "segments": journal.segments(),
+        "committed": str(committed) if committed else None,
+        "end": str(journal.end_offset()),
+        "pending": pending,
+        "retry_waiting": waiting,
+        "failed_total": len(journal.failed()),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect the per-outbox alert journals.")
+    parser.add_argument("outboxes", nargs="*", help="default: every journal under $QLIR_ALERTS_DIR/_journal")
+    parser.add_argument("--failed", action="store_true", help="print the failed records")
+    args = parser.parse_args(argv)
+
+    root = get_alerts_root() / "_journal"
+    names = args.outboxes
+    if not names and root.is_dir():
+        names = sorted(p.name for p in root.iterdir() if p.is_dir())
+    for name in names:
+        journal = AlertJournal(root / name)
+        s = summarize(journal)
+        print(
+            f"{name}: segments={len(s['segments'])} committed={s['committed']} end={s['end']} "
+            f"pending={s['pending']} retry_waiting={s['retry_waiting']} failed={s['failed_total']}"
+        )
+        if args.failed:
+            for record in journal.failed():
+                alert = record.get("alert") or {}
+                print(f"  {record.get('id')} ref={record.get('ref')} retries={record.get('retries')} "
+                      f"error={record.get('error')!r} ts={alert.get('ts')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,8 +17,5 @@ def registry_path() -> Path:
 def get_outbox_dir(name: str) -> Path:
     return get_alerts_root() / name
 
-def get_sent_dir() -> Path:
-    return get_alerts_root() / "_sent"
-
-def get_failed_dir() -> Path:
-    return get_alerts_root() / "_failed"
+def get_traces_dir() -> Path:
+    return get_alerts_root() / "_traces"
@@ -7,14 +7,18 @@ from qlir.features.macd.crosses import with_macd_cross_flags
 from qlir.features.macd.histogram import with_colored_histogram
 from qlir.features.macd.histogram_pyramid import detect_histogram_pyramids, macd_full_pyramidal_annotation
 from qlir.indicators.macd import with_macd
+from qlir.io.stage_cache import cached_stage
 from qlir.logging.logdf import logdf
 from qlir.df.scalars.units import delta_in_bps
 
 import logging
 log = logging.getLogger(__name__)
 
+# Bump `version` when anything this calls (MACD, histogram colors, pyramid
+# annotation) changes its output: only this function's source is in the key.
+@cached_stage(version=1)
 def df_macd_full_pyramidal_annotation(clean_data: pd.DataFrame) -> AnnotatedDF:
-    df = with_macd(df=clean_data)
+    df = with_macd(df=clean_data, in_place=False)  # pure: a cache hit cannot mutate clean_data
     df["normalized_macd_Δ"] = delta_in_bps(df["macd"], df["close"])
     adf = with_colored_histogram(df=df, hist_col="macd_hist")
     colored_hist_cols = adf.new_cols
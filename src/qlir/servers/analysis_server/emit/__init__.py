@@ -1,3 +1,3 @@
-from .alert import emit_alert
+from .alert import emit_alert, emit_alerts
 
-__all__ = ["emit_alert"]
+__all__ = ["emit_alert", "emit_alerts"]
@@ -3,10 +3,12 @@
 from datetime import datetime, timezone
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Mapping, Optional
 
 
+from qlir.servers.alerts.journal import alert_record, journal_transport_enabled, open_journal
 from qlir.servers.alerts.paths import get_alerts_root
+from qlir.telemetry import latency_trace
 
 ALERTS_DIR = get_alerts_root()
 OUTBOX_REGISTRY_PATH = ALERTS_DIR / "analysis_outboxes.json"
@@ -53,7 +55,14 @@ def ensure_outbox_declared(outbox: str) -> None:
 # Alert emission
 # -------------------------------
 
-def emit_alert(*, outbox: str, data: Any) -> None:
+def _with_trace(alert: Dict[str, Any], trace: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    trace = latency_trace.stamp(trace, "detected")
+    if trace is not None:
+        alert[latency_trace.TRACE_KEY] = trace
+    return alert
+
+
+def emit_alert(*, outbox: str, data: Any, trace: Optional[Mapping[str, Any]] = None) -> None:
     """
     Emit an alert into a specific outbox.
 
@@ -61,19 +70,49 @@ def emit_alert(*, outbox: str, data: Any) -> None:
     {
       "ts": <UTC now>,
       "outbox": <outbox name>,
-      "data": <opaque payload>
+      "data": <opaque payload>,
+      "trace": <optional latency trace, stamped "detected">
     }
     """
     ensure_outbox_declared(outbox)
 
-    alert = {
-        "ts": utc_now_iso(),
-        "outbox": outbox,
-        "data": data,
-    }
+    alert = _with_trace(
+        {
+            "ts": utc_now_iso(),
+            "outbox": outbox,
+            "data": data,
+        },
+        trace,
+    )
+
+    if journal_transport_enabled():
+        open_journal(ALERTS_DIR / "_journal" / outbox).append([alert_record(alert)])
+        return
 
     # Filename is for uniqueness + debugging only
     fname = f"{alert['ts']}.json"
     path = ALERTS_DIR / outbox / fname
 
-    path.write_text(json.dumps(alert))
+    # write-then-rename: the notification server never sees a partial file
+    tmp = path.with_name(fname + ".tmp")
+    tmp.write_text(json.dumps(alert))
+    tmp.replace(path)
+
+
+def emit_alerts(*, outbox: str, datas: Iterable[Any], trace: Optional[Mapping[str, Any]] = None) -> None:
+    """
+    Emit several alerts into one outbox.
+
+    In journal mode they are appended as one batch (one fsync); otherwise
+    this is `emit_alert` per payload.
+    """
+    if not journal_transport_enabled():
+        for data in datas:
+            emit_alert(outbox=outbox, data=data, trace=trace)
+        return
+
+    ensure_outbox_declared(outbox)
+    ts = utc_now_iso()
+    open_journal(ALERTS_DIR / "_journal" / outbox).append(
+        alert_record(_with_trace({"ts": ts, "outbox": outbox, "data": data}, trace)) for data in datas
+    )
@@ -12,7 +12,7 @@ from qlir.time.timeunit import TimeUnit
 log = logging.getLogger(__name__)
 
 
-@telemetry(console=True, log_path=Path("telemetry/etl_times.log"))
+@telemetry(log_path=Path("etl_times.log"))
 def clean_data(df):
     df.rename(columns={"open_time": "tz_start"}, inplace=True)
     clean_df, dq_report = DQ.validate_candles(df, TimeFreq(1, TimeUnit.MINUTE))
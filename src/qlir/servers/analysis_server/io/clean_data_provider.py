@@ -41,7 +41,7 @@ log = logging.getLogger(__name__)
 FULL_EACH_LOOP = "full_each_loop"
 INCREMENTAL = "incremental"
 VALID_MODES = (FULL_EACH_LOOP, INCREMENTAL)
-_ETL_LOG = Path("telemetry/etl_times.log")
+_ETL_LOG = Path("etl_times.log")
 
 
 class CleanDataProvider:
@@ -102,7 +102,7 @@ class CleanDataProvider:
 
     # -- full mode --------------------------------------------------------
 
-    @telemetry(console=True, log_path=_ETL_LOG)
+    @telemetry(log_path=_ETL_LOG)
     def _get_full(self) -> pd.DataFrame:
         sealed, head = pdir.classify(self.agg_dir)
         window = self._window_sealed(sealed) + ([head] if head is not None else [])
@@ -113,7 +113,7 @@ class CleanDataProvider:
 
     # -- incremental mode -------------------------------------------------
 
-    @telemetry(console=True, log_path=_ETL_LOG)
+    @telemetry(log_path=_ETL_LOG)
     def _get_incremental(self) -> pd.DataFrame:
         sealed, head = pdir.classify(self.agg_dir)
         window_sealed = self._window_sealed(sealed)
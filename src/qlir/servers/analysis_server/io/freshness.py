@@ -22,7 +22,7 @@ from qlir.telemetry.telemetry import telemetry
 DirFingerprint = tuple[int, int]
 
 
-@telemetry(console=True)
+@telemetry()
 def dir_data_fingerprint(agg_dir: Path, *, pattern: str = "*.parquet") -> DirFingerprint:
     """Return a cheap change-signal for `agg_dir` without reading any row data."""
     max_mtime = 0
@@ -5,6 +5,8 @@ from pathlib import Path
 from datetime import datetime, date
 from typing import Any
 
+from qlir.telemetry import heartbeat
+
 
 RUNTIME_STATE: dict[str, Any] = {}
 
@@ -73,4 +75,8 @@ def end_loop_and_sleep(*, state_path: str | Path, sleep_sec: int) -> None:
         # Store the failure in-state; keep going.
         update_runtime_state("state_write.error", repr(e))
         update_runtime_state("state_write.error_at", datetime.utcnow().isoformat())
-    time.sleep(sleep_sec)
\ No newline at end of file
+
+    # loop heartbeat for the ops_watcher (no-op unless start_heartbeat() ran)
+    heartbeat.beat(processed_ts=runtime_state_get("last_processed_ts"))
+    time.sleep(sleep_sec)
+    heartbeat.begin()
\ No newline at end of file
@@ -9,6 +9,8 @@ from typing import Any, Mapping
 
 import pandas as pd
 from qlir.io.writer import write
+from qlir.telemetry.heartbeat import start_heartbeat
+from qlir.telemetry.latency_trace import read_manifest_trace
 from qlir.telemetry.telemetry import telemetry
 from qlir.servers.analysis_server.io.freshness import DirFingerprint, dir_data_fingerprint
 from qlir.servers.analysis_server.io.clean_data_provider import CleanDataProvider
@@ -91,7 +93,7 @@ def is_data_stale(data_ts: datetime, max_lag_sec: int) -> bool:
     return (utc_now() - data_ts).total_seconds() > max_lag_sec
 
 
-@telemetry(console=True, log_path=Path("telemetry/etl_times.log"))
+@telemetry(log_path=Path("etl_times.log"))
 def get_clean_data() -> pd.DataFrame:
     return load_clean_data(
         PARQUET_CHUNKS_DIR,
@@ -256,6 +258,10 @@ def run_loop_iteration(
         return last_processed_ts, fingerprint
     last_fingerprint = fingerprint
 
+    # Latency trace of the newest closed candle the agg server has published.
+    # Read before the data so it never names a candle the loaded data lacks.
+    trace = read_manifest_trace(Path(parquet_dir).parent / "manifest.json")
+
     base_df = provider.get()
     if base_df.empty:
         handle_empty_base_df()
@@ -319,6 +325,7 @@ def run_loop_iteration(
                         "column": col,
                         "data_ts": data_ts.isoformat(),
                     },
+                    trace=trace,
                 )
 
     # ----------------------------------------------------------------------
@@ -362,6 +369,7 @@ def run_loop_iteration(
                         "events": events,
                         "data_ts": data_ts.isoformat(),
                     },
+                    trace=trace,
                 )
 
     # ----------------------------------------------------------------------
@@ -385,6 +393,10 @@ def main() -> None:
     # Startup (control plane)
     # ----------------------------------------------------------------------
 
+    # The live frame changes every loop, so cached stages (qlir.io.stage_cache)
+    # would only miss and write a new entry per loop; they are for research runs.
+    os.environ.setdefault("QLIR_STAGE_CACHE", "0")
+
     outboxes = load_outboxes()
     update_runtime_state("outboxes", outboxes)
 
@@ -427,6 +439,7 @@ def main() -> None:
     # ----------------------------------------------------------------------
 
     last_fingerprint: DirFingerprint | None = None
+    start_heartbeat("analysis_server")
 
     while True:
         now = utc_now()
@@ -0,0 +1,79 @@
+"""
+Loop latency with a deliberately slow log sink: synchronous handlers vs
+queued handlers (drop / block on overflow).
+
+    python -m qlir.servers.logging.bench_queued [iterations] [sink_ms]
+
+Each loop iteration does ~1 ms of work and logs `RECORDS_PER_LOOP` INFO lines
+through the real qlir formatter; the sink sleeps `sink_ms` per write (a slow
+terminal, journald under pressure, a network filesystem).
+"""
+
+import io
+import logging
+import statistics
+import sys
+import time
+
+from .handler_factories import make_simple_handler
+from .queued import make_queued_handler, stop_queued_logging
+
+RECORDS_PER_LOOP = 5
+
+
+class _SlowStream(io.StringIO):
+    def __init__(self, delay_s: float):
+        super().__init__()
+        self.delay_s = delay_s
+
+    def write(self, s: str) -> int:
+        time.sleep(self.delay_s)
+        return len(s)
+
+
+def _run(label: str, iterations: int, sink_s: float, *, queued: bool, **queue_kw) -> None:
+    logger = logging.getLogger("qlir.bench_queued")
+    logger.handlers.clear()
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    sink = make_simple_handler(logging.INFO)
+    sink.setStream(_SlowStream(sink_s))
+    handler = make_queued_handler([sink], **queue_kw) if queued else sink
+    logger.addHandler(handler)
+
+    latencies = []
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        deadline = t0 + 0.001
+        while time.perf_counter() < deadline:  # the loop's own work
+            pass
+        for j in range(RECORDS_PER_LOOP):
+            logger.info("loop %d: manifest updated slice=%d rows=%d", i, j, i * j)
+        latencies.append(time.perf_counter() - t0)
+
+    dropped = getattr(handler, "dropped", 0)
+    t0 = time.perf_counter()
+    stop_queued_logging()
+    drain = time.perf_counter() - t0
+    logger.handlers.clear()
+
+    latencies.sort()
+    print(
+        f"  {label:<26}: loop p50 {statistics.median(latencies) * 1000:6.2f} ms, "
+        f"p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:6.2f} ms, "
+        f"dropped {dropped:5d}, drain at exit {drain:5.2f} s"
+    )
+
+
+def main(iterations: int = 300, sink_ms: float = 2.0) -> None:
+    sink_s = sink_ms / 1000
+    print(f"{iterations} loops x {RECORDS_PER_LOOP} records, sink {sink_ms:g} ms per write")
+    _run("synchronous", iterations, sink_s, queued=False)
+    _run("queued, drop (10000)", iterations, sink_s, queued=True)
+    _run("queued, drop (100)", iterations, sink_s, queued=True, queue_size=100)
+    _run("queued, block (100)", iterations, sink_s, queued=True, queue_size=100, overflow="block")
+
+
+if __name__ == "__main__":
+    main(*(float(a) if i else int(a) for i, a in enumerate(sys.argv[1:3])))
@@ -1,4 +1,5 @@
 import logging
+import os
 
 from qlir.servers.logging.filters import HasTagFilter, NoTagFilter
 from qlir.servers.logging.handler_factories import (
@@ -8,16 +9,54 @@ from qlir.servers.logging.handler_factories import (
 )
 from qlir.servers.logging.level_resolution import resolve_levels
 from qlir.servers.logging.logging_profiles import LogProfile
+from qlir.servers.logging.queued import (
+    DEFAULT_QUEUE_SIZE,
+    Overflow,
+    make_queued_handler,
+    stop_queued_logging,
+)
 
 
-def setup_logging(profile: LogProfile, *, enable_telemetry: bool = False) -> None:
+def setup_logging(
+    profile: LogProfile,
+    *,
+    enable_telemetry: bool = False,
+    queued: bool | None = None,
+    queue_size: int | None = None,
+    overflow: Overflow | None = None,
+) -> None:
+    """
+    Configure root / qlir / telemetry handlers for a server process.
+
+    With `queued` the handlers run on a listener thread behind a bounded
+    queue (see `queued`), so log I/O never blocks the caller. Defaults come
+    from `QLIR_LOG_QUEUED` (1/0, default 0), `QLIR_LOG_QUEUE_SIZE` and
+    `QLIR_LOG_OVERFLOW` (drop/block, default drop).
+    """
     root_level, qlir_level = resolve_levels(profile)
 
+    if queued is None:
+        queued = os.environ.get("QLIR_LOG_QUEUED", "0") == "1"
+    queue_size = queue_size or int(os.environ.get("QLIR_LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+    overflow = overflow or os.environ.get("QLIR_LOG_OVERFLOW", "drop")  # type: ignore[assignment]
+
+    # reconfiguring: detach first, then drain the listeners of a previous setup
+    for name in ("", "qlir", "qlir.telemetry"):
+        logging.getLogger(name or None).handlers.clear()
+    stop_queued_logging()
+
+    def attach(logger: logging.Logger, handlers: list[logging.Handler]) -> None:
+        if queued:
+            logger.addHandler(make_queued_handler(handlers, queue_size=queue_size, overflow=overflow))
+        else:
+            for h in handlers:
+                logger.addHandler(h)
+
     # ---- ROOT ----
     root = logging.getLogger()
     root.handlers.clear()
     root.setLevel(root_level)
-    root.addHandler(make_simple_handler(root_level))
+    attach(root, [make_simple_handler(root_level)])
 
     # ---- QLIR (normal logs) ----
     qlir = logging.getLogger("qlir")
@@ -26,12 +65,11 @@ def setup_logging(profile: LogProfile, *, enable_telemetry: bool = False) -> Non
     qlir.propagate = False
     simple = make_simple_handler(qlir_level)
     simple.addFilter(NoTagFilter())
-    qlir.addHandler(simple)
 
     # tagged handler (only sees tagged records)
     tagged = make_tagged_handler(qlir_level)
     tagged.addFilter(HasTagFilter())
-    qlir.addHandler(tagged)
+    attach(qlir, [simple, tagged])
 
     # ---- TELEMETRY (scaffolded) ----
     if enable_telemetry:
@@ -39,7 +77,7 @@ def setup_logging(profile: LogProfile, *, enable_telemetry: bool = False) -> Non
         tlog.handlers.clear()
         tlog.setLevel(qlir_level)
         tlog.propagate = False
-        tlog.addHandler(make_telemetry_handler(qlir_level))
+        attach(tlog, [make_telemetry_handler(qlir_level)])
 
     print("Open logging.logging_setup to debug logging (also ensure main has a logprofile chosen)")
     # dump_logging_tree("qlir")
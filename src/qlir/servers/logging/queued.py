@@ -0,0 +1,128 @@
+"""
+Queued (non-blocking) logging for server loops.
+
+In queued mode the stream handlers built by `logging_setup` sit behind a
+`QueueListener` thread. The loop thread only copies the record onto a bounded
+queue; filtering (tag / no-tag), formatting (colors, full-text style rules)
+and the actual write to the terminal / journald / a network filesystem
+happen on the listener thread, so slow log I/O no longer stalls the loop.
+
+When the queue is full:
+
+* ``"drop"`` (default): the record is dropped and counted; the next record
+  that fits is preceded by a WARNING saying how many were lost.
+* ``"block"``: the loop waits for space (no loss, but a stuck sink stalls
+  the loop again once the queue has filled).
+
+Message arguments are interpolated on the listener thread: log values, not
+objects that are mutated right after the call.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import sys
+import threading
+from typing import Literal
+
+Overflow = Literal["drop", "block"]
+
+DEFAULT_QUEUE_SIZE = 10_000
+
+_listeners: list[QueueListener] = []
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, q: queue.Queue, *, overflow: Overflow = "drop"):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"overflow must be 'drop' or 'block', got {overflow!r}")
+        super().__init__(q)
+        self.overflow = overflow
+        self.dropped = 0
+        self._pending_drops = 0
+        self._lock_drops = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # No formatting here (the stdlib version formats on the caller thread);
+        # only make the record safe to hand to another thread.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+
+        # take the whole pending count at once, so each drop is reported by one thread only
+        with self._lock_drops:
+            pending, self._pending_drops = self._pending_drops, 0
+        if pending:
+            try:
+                self.queue.put_nowait(self._drop_notice(pending, record))
+            except queue.Full:
+                pending += 1  # the notice did not fit: neither does this record
+                with self._lock_drops:
+                    self.dropped += 1
+                    self._pending_drops += pending
+                return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock_drops:
+                self.dropped += 1
+                self._pending_drops += 1
+
+    def _drop_notice(self, n: int, like: logging.LogRecord) -> logging.LogRecord:
+        return logging.LogRecord(
+            name=like.name,
+            level=logging.WARNING,
+            pathname=__file__,
+            lineno=0,
+            msg="log queue full: dropped %d record(s)",
+            args=(n,),
+            exc_info=None,
+        )
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # the stdlib uses put_nowait, which fails on a full bounded queue
+        self.queue.put(self._sentinel)
+
+
+def make_queued_handler(
+    handlers: list[logging.Handler],
+    *,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    overflow: Overflow = "drop",
+) -> BoundedQueueHandler:
+    """
+    Put `handlers` behind a bounded queue; returns the handler to attach to
+    the logger. The listener thread is started here and stopped (after
+    draining) at exit or by `stop_queued_logging`.
+    """
+    q: queue.Queue = queue.Queue(maxsize=queue_size)
+    listener = _Listener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return BoundedQueueHandler(q, overflow=overflow)
+
+
+def stop_queued_logging() -> None:
+    """Flush and stop every listener started by `make_queued_handler`."""
+    # Telemetry's exit flush logs through these handlers, but its atexit hook
+    # may have been registered first (and so runs after this one): flush it
+    # while the listeners are still running.
+    telemetry = sys.modules.get("qlir.telemetry.telemetry")
+    if telemetry is not None and _listeners:
+        telemetry.flush_telemetry()
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(stop_queued_logging)
@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
+
+
+class RateLimited(RuntimeError):
+    """The destination rejected a send for rate reasons (e.g. HTTP 429)."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class NotificationAdapter(ABC):
@@ -7,6 +15,32 @@ class NotificationAdapter(ABC):
     def send(self, data: Any) -> None:
         """
         Send the alert payload.
-        Raise on failure.
+        Raise on failure (`RateLimited` when the destination asks to back off).
         """
         ...
+
+    @property
+    def destination(self) -> str:
+        """
+        Key for per-destination concurrency limits (adapters sharing a key
+        share the limit, e.g. one Telegram bot).
+        """
+        return type(self).__name__
+
+    @property
+    def rate_limit(self) -> Optional[tuple[float, float]]:
+        """
+        (sends per second, burst) the destination tolerates, or None for
+        unpaced. Sends to one destination are paced with a token bucket.
+        """
+        return None
+
+    def coalesce(self, datas: list[Any]) -> Optional[Any]:
+        """
+        One payload carrying several alerts, or None if they cannot go out
+        as a single send (unsupported, or too large).
+        """
+        return None
+
+    def close(self) -> None:
+        """Release pooled connections."""
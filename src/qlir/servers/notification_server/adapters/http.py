@@ -0,0 +1,16 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def pooled_session(pool_maxsize: int = 4) -> requests.Session:
+    """
+    A `requests.Session` that keeps TCP/TLS connections alive between sends.
+
+    `pool_maxsize` bounds the concurrent connections per host; it should be at
+    least the delivery engine's per-destination parallelism.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
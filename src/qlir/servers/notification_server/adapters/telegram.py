@@ -1,20 +1,55 @@
 import json
-from typing import Any
+from typing import Any, Optional
 
-import requests
+from .base import NotificationAdapter, RateLimited
+from .http import pooled_session
 
-from .base import NotificationAdapter
+# sendMessage rejects longer texts
+MAX_MESSAGE_CHARS = 4096
+COALESCE_SEPARATOR = "\n\n"
+
+
+def _text(data: Any) -> str:
+    if isinstance(data, str):
+        return data
+    return json.dumps(data, indent=2, sort_keys=True)
 
 
 class TelegramAdapter(NotificationAdapter):
-    def __init__(self, bot_token: str, chat_id: str, timeout: float = 5.0):
+    def __init__(
+        self,
+        bot_token: str,
+        chat_id: str,
+        timeout: float = 5.0,
+        pool_maxsize: int = 4,
+        messages_per_sec: float = 1.0,
+        burst: int = 3,
+    ):
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.timeout = timeout
+        # Telegram asks bots to stay around one message per second per chat
+        self.messages_per_sec = messages_per_sec
+        self.burst = burst
 
         self.url = (
             f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
         )
+        self.session = pooled_session(pool_maxsize)
+
+    @property
+    def destination(self) -> str:
+        # Telegram rate-limits per bot (the token's numeric prefix is the bot id)
+        return f"telegram:{self.bot_token.split(':', 1)[0]}"
+
+    @property
+    def rate_limit(self) -> Optional[tuple[float, float]]:
+        return (self.messages_per_sec, self.burst)
+
+    def coalesce(self, datas: list[Any]) -> Optional[str]:
+        """Alerts as one message, separated by blank lines, if it fits."""
+        text = COALESCE_SEPARATOR.join(_text(d) for d in datas)
+        return text if len(text) <= MAX_MESSAGE_CHARS else None
 
     def send(self, data: Any) -> None:
         """
@@ -24,21 +59,25 @@ class TelegramAdapter(NotificationAdapter):
         - If it's a string, send directly
         - Otherwise, JSON-dump it
         """
-        if isinstance(data, str):
-            text = data
-        else:
-            text = json.dumps(data, indent=2, sort_keys=True)
-
         payload = {
             "chat_id": self.chat_id,
-            "text": text,
+            "text": _text(data),
         }
 
-        resp = requests.post(
+        resp = self.session.post(
             self.url,
             json=payload,
             timeout=self.timeout,
         )
+        if resp.status_code == 429:
+            try:
+                retry_after = float(resp.json()["parameters"]["retry_after"])
+            except (ValueError, KeyError, TypeError):
+                retry_after = 1.0
+            raise RateLimited(f"429: {resp.text}", retry_after=retry_after)
         if not resp.ok:
             raise RuntimeError(f"{resp.status_code}: {resp.text}")
         resp.raise_for_status()
+
+    def close(self) -> None:
+        self.session.close()
@@ -1,19 +1,60 @@
-from typing import Any
+from typing import Any, Optional
 
-import requests
-
-from .base import NotificationAdapter
+from .base import NotificationAdapter, RateLimited
+from .http import pooled_session
 
 
 class WebhookAdapter(NotificationAdapter):
-    def __init__(self, url: str, timeout: float = 5.0):
+    """
+    POSTs each payload as JSON.
+
+    With `batch=True` the endpoint also accepts a JSON array of payloads (at
+    most `max_batch`), so coalesced alerts go out as one request.
+    `rate_limit=(per_sec, burst)` paces sends to this URL.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 5.0,
+        pool_maxsize: int = 4,
+        batch: bool = False,
+        max_batch: int = 50,
+        rate_limit: Optional[tuple[float, float]] = None,
+    ):
         self.url = url
         self.timeout = timeout
+        self.batch = batch
+        self.max_batch = max_batch
+        self._rate_limit = rate_limit
+        self.session = pooled_session(pool_maxsize)
+
+    @property
+    def destination(self) -> str:
+        return f"webhook:{self.url}"
+
+    @property
+    def rate_limit(self) -> Optional[tuple[float, float]]:
+        return self._rate_limit
+
+    def coalesce(self, datas: list[Any]) -> Optional[list[Any]]:
+        if self.batch and len(datas) <= self.max_batch:
+            return list(datas)
+        return None
 
     def send(self, data: Any) -> None:
-        resp = requests.post(
+        resp = self.session.post(
             self.url,
             json=data,
             timeout=self.timeout,
         )
+        if resp.status_code == 429:
+            try:
+                retry_after = float(resp.headers.get("Retry-After", 1.0))
+            except ValueError:
+                retry_after = 1.0
+            raise RateLimited(f"429: {resp.text}", retry_after=retry_after)
         resp.raise_for_status()
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,194 @@
+"""
+Alerts/sec against a local HTTP stand-in: serial one-connection-per-alert
+delivery (the old loop) vs `DeliveryEngine` with pooled webhook sessions.
+
+    python -m qlir.servers.notification_server.bench_delivery [n_alerts] [latency_ms]
+
+The stand-in answers every POST after `latency_ms` (a stand-in for the
+Telegram round trip). Alerts are spread over four outboxes.
+
+A second run replays a storm (`STORM_ALERTS` alerts in one outbox at once)
+against a stand-in that allows `STORM_LIMIT` requests/s and answers 429
+beyond that: unpaced vs token-bucket paced vs paced + coalesced, reporting
+requests, 429s, failed alerts, throughput and emit-to-delivery latency.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from qlir.servers.alerts.journal import AlertJournal
+
+from .adapters.webhook import WebhookAdapter
+from .delivery import DeliveryEngine
+from .ratelimit import TokenBucket
+
+OUTBOXES = ["qlir-events", "qlir-tradable-human", "qlir-positioning", "qlir-ops"]
+
+STORM_ALERTS = 100
+STORM_LIMIT = (20.0, 5)  # requests/s, burst
+
+
+def _stand_in(latency_s: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        wbufsize = -1  # one write per response (avoids Nagle / delayed-ACK stalls)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency_s)
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _LimitedStandIn:
+    """Rate-limited endpoint: 429 + Retry-After beyond `limit`; records arrival times."""
+
+    def __init__(self, latency_s: float, limit: tuple[float, float]):
+        self.limit = limit
+        self.reset()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            wbufsize = -1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                time.sleep(latency_s)
+                status = stand_in.receive(body)
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def reset(self) -> None:
+        self._bucket = TokenBucket(*self.limit)
+        self._lock = threading.Lock()
+        self.requests = self.rejected = 0
+        self.latencies: list[float] = []
+
+    def receive(self, body) -> int:
+        with self._lock:
+            self.requests += 1
+            if not self._bucket.try_acquire():
+                self.rejected += 1
+                return 429
+            now = time.time()
+            self.latencies.extend(now - item["t"] for item in (body if isinstance(body, list) else [body]))
+            return 200
+
+
+def _write_alerts(root: Path, n: int) -> None:
+    for i in range(n):
+        outbox = root / OUTBOXES[i % len(OUTBOXES)]
+        outbox.mkdir(parents=True, exist_ok=True)
+        (outbox / f"{i:06d}.json").write_text(json.dumps({"ts": i, "data": {"i": i}}))
+
+
+def bench_serial(url: str, n: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        requests.post(url, json={"i": i}, timeout=5).raise_for_status()
+    return n / (time.perf_counter() - t0)
+
+
+def bench_engine(url: str, n: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_alerts(root, n)
+        # one destination per outbox, as with one bot per outbox
+        routes = {name: [WebhookAdapter(f"{url}/{name}")] for name in OUTBOXES}
+        engine = DeliveryEngine(routes, journal_root=root / "_journal")
+        t0 = time.perf_counter()
+        sent = engine.run_once(root / name for name in OUTBOXES)
+        rate = sent / (time.perf_counter() - t0)
+        engine.close()
+    return rate
+
+
+def bench_storm(stand_in: _LimitedStandIn, label: str, **adapter_kw) -> None:
+    stand_in.reset()
+    name = "qlir-tradable-human"
+    coalesce_ms = adapter_kw.pop("coalesce_ms", None)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        outbox = root / name
+        outbox.mkdir()
+        engine = DeliveryEngine(
+            {name: [WebhookAdapter(stand_in.url, **adapter_kw)]},
+            journal_root=root / "_journal",
+            retry_delay=0.5,
+            coalesce_ms={name: coalesce_ms} if coalesce_ms else None,
+        )
+        journal = AlertJournal(root / "_journal" / name)
+
+        t0 = time.perf_counter()
+        for i in range(STORM_ALERTS):
+            (outbox / f"{i:06d}.json").write_text(json.dumps({"ts": i, "data": {"i": i, "t": time.time()}}))
+        failed = 0
+        while time.perf_counter() - t0 < 60:
+            engine.run_once([outbox])
+            failed = sum(e.record["kind"] == "failed" for e in journal.read())
+            if len(stand_in.latencies) + failed >= STORM_ALERTS:
+                break
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - t0
+        engine.close()
+
+    lat = sorted(stand_in.latencies) or [float("nan")]
+    p99 = lat[min(len(lat) - 1, int(0.99 * len(lat)))]
+    print(
+        f"  {label:<28}: {stand_in.requests:4d} requests, {stand_in.rejected:4d} x 429, "
+        f"{failed:3d} failed, {len(stand_in.latencies) / elapsed:6.1f} alerts/s, "
+        f"latency p50 {statistics.median(lat) * 1000:6.0f} ms / p99 {p99 * 1000:6.0f} ms"
+    )
+
+
+def main(n: int = 200, latency_ms: float = 20.0) -> None:
+    server = _stand_in(latency_ms / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        print(f"{n} alerts, {latency_ms:g} ms per request")
+        print(f"  serial, new connection per alert : {bench_serial(url, n):7.1f} alerts/s")
+        print(f"  DeliveryEngine, pooled sessions  : {bench_engine(url, n):7.1f} alerts/s")
+    finally:
+        server.shutdown()
+
+    stand_in = _LimitedStandIn(latency_ms / 1000, STORM_LIMIT)
+    try:
+        print(f"storm: {STORM_ALERTS} alerts in one outbox, endpoint allows {STORM_LIMIT[0]:g} req/s (burst {STORM_LIMIT[1]})")
+        bench_storm(stand_in, "unpaced")
+        bench_storm(stand_in, "token bucket", rate_limit=STORM_LIMIT)
+        bench_storm(stand_in, "token bucket + 50 ms window", rate_limit=STORM_LIMIT, batch=True, coalesce_ms=50)
+    finally:
+        stand_in.server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*(float(a) if i else int(a) for i, a in enumerate(sys.argv[1:3])))
@@ -0,0 +1,489 @@
+"""
+Concurrent alert delivery from the per-outbox alert journals.
+
+One poll pass hands every routed outbox to its own worker, so a burst in
+`qlir-events` does not delay `qlir-positioning`. Within an outbox, records
+are delivered one at a time in journal order, so ordering per outbox is
+preserved. The adapters for a single alert send concurrently. Sends to one
+destination (see `NotificationAdapter.destination`, e.g. one Telegram bot)
+are capped at `per_destination` in flight, whichever outboxes they come from.
+
+Each pass over an outbox:
+
+1. File bridge: legacy `<outbox>/*.json` alert files (the original file
+   contract, still written unless `QLIR_ALERT_TRANSPORT=journal`) are
+   appended to the journal as one batch and removed. A file that does not
+   parse (possibly still being written) is left for the next pass; only
+   once it has stayed unparsable for `unparsable_grace_s` is it recorded as
+   `failed` (with its raw text) and removed.
+2. Records after the consumer's position are delivered. Each adapter that
+   fails an alert gets its own `retry` record (that adapter only, due after
+   an exponential backoff with jitter, see `backoff_delay`); adapters that
+   succeeded are not sent the alert again. Once `retries_exceeded`, a
+   `failed` record is appended instead. Nothing is moved or rewritten.
+3. The committed offset is advanced (never past a retry that is not due
+   yet) and fully consumed segments are compacted.
+
+Retries never hold up the queue: records that are not due yet are set aside
+and later records keep flowing. A destination that just failed is also
+backed off as a whole: until its next attempt time, alerts for it are
+rescheduled (without using up their retries) instead of each waiting out a
+timeout against a dead endpoint.
+
+Delivery is at-least-once: after a restart, records after the committed
+offset (including ones already sent behind a pending retry) are sent again.
+
+Storms: an outbox with a coalescing window (`coalesce_ms`) waits that long
+after the first pending alert for the rest of the burst, then hands the
+alerts to each adapter in as few sends as its `coalesce` allows (e.g. one
+Telegram message per ~4 KB of text). Sends to a destination with a
+`rate_limit` are paced by a token bucket (see `ratelimit`), so bursts queue
+locally instead of drawing 429s: a send that finds no token is not waited
+for, its alerts (and the rest of that adapter's batch, to keep their order)
+are rescheduled like a backed-off destination, due when the next token is.
+A paced destination never holds up the poll pass or the other outboxes.
+Accounting stays per alert: every alert in
+a failed send gets its own retry / failed record; the others count as sent.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import json
+import logging
+from pathlib import Path
+import random
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+from qlir.servers.alerts.journal import AlertJournal, JournalEntry, Offset, alert_record
+from qlir.telemetry import latency_trace
+
+from .adapters.base import NotificationAdapter, RateLimited
+from .ratelimit import TokenBucket
+
+logger = logging.getLogger("notification-server")
+
+MAX_RETRIES = 3
+
+
+def retries_exceeded(retries: int) -> bool:
+    return retries >= MAX_RETRIES
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Delay before retry `attempt` (1-based): `base * 2**(attempt-1)` capped at
+    `cap`, with equal jitter (uniform in [d/2, d]) so retries of a burst do
+    not fire in lockstep.
+    """
+    d = min(cap, base * 2 ** (attempt - 1))
+    return d / 2 + random.uniform(0, d / 2)
+
+
+@dataclass
+class _OutboxState:
+    journal: AlertJournal
+    read_pos: Optional[Offset]
+    committed: Optional[Offset]
+    deferred: list[JournalEntry] = field(default_factory=list)
+    unparsable: dict[str, float] = field(default_factory=dict)  # file name -> first seen unparsable
+
+
+class DeliveryEngine:
+    """
+    Parameters
+    ----------
+    outbox_adapters : dict[str, list[NotificationAdapter]]
+        Routing table (see `server.build_outbox_adapters`).
+    journal_root : Path
+        `$QLIR_ALERTS_DIR/_journal`; one journal directory per routed outbox
+        is created up front.
+    max_outboxes : int
+        Outboxes drained concurrently.
+    max_sends : int
+        Adapter sends in flight across all outboxes.
+    per_destination : int
+        Sends in flight per destination.
+    retry_delay : float
+        Base backoff (seconds) after a failed attempt; doubles per retry.
+    max_retry_delay : float
+        Backoff cap.
+    keep_segments : int
+        Fully consumed journal segments kept for inspection.
+    coalesce_ms : dict[str, float] | None
+        Coalescing window per outbox name; outboxes not listed send every
+        alert on its own, as soon as it is read.
+    trace_log : Path | None
+        Where the latency traces of delivered alerts are appended, stamped
+        "sent" (see `qlir.telemetry.latency_trace`); None disables it.
+    unparsable_grace_s : float
+        How long an alert file may stay unparsable before it is given up on.
+    """
+
+    def __init__(
+        self,
+        outbox_adapters: dict[str, list[NotificationAdapter]],
+        *,
+        journal_root: Path,
+        max_outboxes: int = 8,
+        max_sends: int = 16,
+        per_destination: int = 2,
+        retry_delay: float = 0.0,
+        max_retry_delay: float = 300.0,
+        keep_segments: int = 2,
+        coalesce_ms: Optional[dict[str, float]] = None,
+        trace_log: Optional[Path] = None,
+        unparsable_grace_s: float = 60.0,
+    ):
+        self.outbox_adapters = outbox_adapters
+        self.journal_root = journal_root
+        self.per_destination = per_destination
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.keep_segments = keep_segments
+        self.coalesce_ms = dict(coalesce_ms or {})
+        self.trace_log = trace_log
+        self.unparsable_grace_s = unparsable_grace_s
+        self._trace_lock = threading.Lock()
+
+        self._outboxes: dict[str, _OutboxState] = {}
+        for name in outbox_adapters:
+            journal = AlertJournal(journal_root / name)
+            committed = journal.committed_offset()
+            self._outboxes[name] = _OutboxState(journal=journal, read_pos=committed, committed=committed)
+
+        self._outbox_pool = ThreadPoolExecutor(max_outboxes, thread_name_prefix="outbox")
+        self._send_pool = ThreadPoolExecutor(max_sends, thread_name_prefix="send")
+        self._limits: dict[str, threading.BoundedSemaphore] = {}
+        self._buckets: dict[str, Optional[TokenBucket]] = {}
+        self._down_until: dict[str, float] = {}
+        self._dest_failures: dict[str, int] = {}
+        self._limits_lock = threading.Lock()
+        self._warned_unrouted: set[str] = set()
+
+    def journal_dirs(self) -> dict[str, Path]:
+        """Outbox name -> journal directory, for every routed outbox."""
+        return {name: st.journal.directory for name, st in self._outboxes.items()}
+
+    # -------------------------------------------------
+    # poll pass
+    # -------------------------------------------------
+
+    def run_once(self, outbox_dirs: Iterable[Path]) -> int:
+        """Drain every routed outbox once; returns the number of alerts sent."""
+        futures = []
+        for outbox in outbox_dirs:
+            adapters = self.outbox_adapters.get(outbox.name)
+            if not adapters:
+                if outbox.name not in self._warned_unrouted:
+                    logger.warning("no adapters configured for outbox '%s'; skipping", outbox.name)
+                    self._warned_unrouted.add(outbox.name)
+                continue
+            futures.append(self._outbox_pool.submit(self.drain_outbox, outbox, adapters))
+
+        wait(futures)
+        return sum(f.result() for f in futures)
+
+    def drain_outbox(self, outbox: Path, adapters: list[NotificationAdapter]) -> int:
+        st = self._outboxes[outbox.name]
+        logger.debug(f"checking {outbox.name}")
+
+        self._bridge_files(outbox, st)
+        pending = self._pending(st)
+
+        window = self.coalesce_ms.get(outbox.name, 0) / 1000
+        if not window:
+            sent = sum(self._deliver(outbox.name, st.journal, [e], adapters) for e in pending)
+        else:
+            if pending:
+                time.sleep(window)  # let the rest of the burst land
+                self._bridge_files(outbox, st)
+                pending += self._pending(st)
+            sent = self._deliver(outbox.name, st.journal, pending, adapters)
+
+        self._commit(st)
+        return sent
+
+    def _pending(self, st: _OutboxState) -> list[JournalEntry]:
+        """Deliverable records: due retries, then new records after `read_pos`."""
+        now = time.time()
+        pending = [e for e in st.deferred if e.record["not_before"] <= now]
+        st.deferred = [e for e in st.deferred if e.record["not_before"] > now]
+
+        for entry in st.journal.read(st.read_pos):
+            kind = entry.record.get("kind")
+            if kind == "retry" and entry.record["not_before"] > now:
+                st.deferred.append(entry)
+            elif kind in ("alert", "retry"):
+                pending.append(entry)
+            st.read_pos = entry.next_offset
+        return pending
+
+    # -------------------------------------------------
+    # journal bookkeeping
+    # -------------------------------------------------
+
+    def _bridge_files(self, outbox: Path, st: _OutboxState) -> None:
+        files = sorted(outbox.glob("*.json"))
+        if not files:
+            st.unparsable.clear()
+            return
+
+        now = time.time()
+        records, done, unparsable = [], [], {}
+        for f in files:
+            try:
+                text = f.read_text()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning("cannot read alert file %s (outbox=%s): %s", f.name, outbox.name, e)
+                continue
+            try:
+                records.append(alert_record(json.loads(text)))
+            except ValueError as e:
+                since = unparsable[f.name] = st.unparsable.get(f.name, now)
+                if now - since < self.unparsable_grace_s:
+                    continue  # may still be being written: try again next pass
+                logger.error("unparsable alert file %s (outbox=%s): %s", f.name, outbox.name, e)
+                records.append(
+                    {"kind": "failed", "ref": f.name, "retries": 0, "error": str(e), "alert": None, "raw": text}
+                )
+                del unparsable[f.name]
+            done.append(f)
+        st.unparsable = unparsable
+
+        st.journal.append(records)
+        for f in done:
+            f.unlink(missing_ok=True)
+
+    def _commit(self, st: _OutboxState) -> None:
+        target = min(e.offset for e in st.deferred) if st.deferred else st.read_pos
+        if target is None or target == st.committed:
+            return
+        st.journal.commit(target)
+        st.committed = target
+        for segment in st.journal.compact(target, keep=self.keep_segments):
+            logger.debug("compacted journal segment %d (%s)", segment, st.journal.directory.name)
+
+    # -------------------------------------------------
+    # delivery
+    # -------------------------------------------------
+
+    def _deliver(
+        self,
+        outbox_name: str,
+        journal: AlertJournal,
+        entries: list[JournalEntry],
+        adapters: list[NotificationAdapter],
+    ) -> int:
+        """Send `entries` (in order) through their adapters; returns the number fully sent."""
+        records: list[dict[str, Any]] = []
+        unsent: set[int] = set()
+        targets: dict[int, list[int]] = {}  # adapter index -> entry positions
+        for i, entry in enumerate(entries):
+            alert = entry.record.get("alert")
+            if not isinstance(alert, dict) or "ts" not in alert or "data" not in alert:
+                unsent.add(i)
+                records.append(self._failure_record(outbox_name, entry, None, ValueError("invalid alert contract")))
+                continue
+            for a in self._targets(outbox_name, entry, adapters):
+                targets.setdefault(a, []).append(i)
+
+        def run(a: int):
+            positions = targets[a]
+            datas = [entries[i].record["alert"]["data"] for i in positions]
+            return a, positions, self._send_groups(adapters[a], datas)
+
+        if len(targets) == 1:
+            results = [run(a) for a in targets]
+        else:
+            futures = [self._send_pool.submit(run, a) for a in targets]
+            results = [f.result() for f in futures]
+
+        for a, positions, (failed, deferred) in results:
+            for j, error in failed.items():
+                unsent.add(positions[j])
+                records.append(self._failure_record(outbox_name, entries[positions[j]], (a, adapters[a]), error))
+            for j, until in deferred.items():
+                unsent.add(positions[j])
+                records.append(self._retry_record(entries[positions[j]], (a, adapters[a]), until, attempted=False))
+
+        sent_at = time.time()
+        traces = []
+        for i, entry in enumerate(entries):
+            if i not in unsent:
+                logger.info("sent alert %s (outbox=%s)", entry.record.get("ref", entry.id), outbox_name)
+                trace = entry.record["alert"].get(latency_trace.TRACE_KEY)
+                if isinstance(trace, dict):
+                    traces.append({**latency_trace.stamp(trace, "sent", sent_at), "outbox": outbox_name})
+        journal.append(records)
+        if traces and self.trace_log is not None:
+            self._write_traces(traces)
+        return len(entries) - len(unsent)
+
+    def _write_traces(self, traces: list[dict[str, Any]]) -> None:
+        # tracing must never cost an alert: log and carry on
+        try:
+            with self._trace_lock:
+                latency_trace.append_traces(self.trace_log, traces)
+        except OSError as e:
+            logger.warning("could not write latency traces to %s: %s", self.trace_log, e)
+
+    def _targets(self, outbox_name: str, entry: JournalEntry, adapters: list[NotificationAdapter]) -> list[int]:
+        """Adapters an entry still has to reach: the failed one for a retry, else all."""
+        a = entry.record.get("adapter")
+        if a is None:
+            return list(range(len(adapters)))
+        if a < len(adapters) and adapters[a].destination == entry.record.get("destination"):
+            return [a]
+        logger.warning("retry %s targets an adapter no longer routed (outbox=%s); sending to all", entry.id, outbox_name)
+        return list(range(len(adapters)))
+
+    def _retry_record(
+        self,
+        entry: JournalEntry,
+        target: Optional[tuple[int, NotificationAdapter]],
+        not_before: float,
+        *,
+        attempted: bool,
+    ) -> dict[str, Any]:
+        rec = entry.record
+        record = {
+            "kind": "retry",
+            "ref": rec.get("ref", entry.id),
+            "retries": rec.get("retries", 0) + int(attempted),
+            "not_before": not_before,
+            "alert": rec.get("alert"),
+        }
+        if target is not None:
+            record["adapter"], record["destination"] = target[0], target[1].destination
+        return record
+
+    def _failure_record(
+        self,
+        outbox_name: str,
+        entry: JournalEntry,
+        target: Optional[tuple[int, NotificationAdapter]],
+        error: Exception,
+    ) -> dict[str, Any]:
+        retries = entry.record.get("retries", 0) + 1
+        ref = entry.record.get("ref", entry.id)
+        where = f"{target[1].destination}, " if target else ""
+        logger.warning("failed alert %s (%soutbox=%s): %s", ref, where, outbox_name, error)
+
+        if not retries_exceeded(retries):
+            not_before = time.time() + backoff_delay(retries, self.retry_delay, self.max_retry_delay)
+            return self._retry_record(entry, target, not_before, attempted=True)
+
+        logger.error("alert %s marked failed (%soutbox=%s)", ref, where, outbox_name)
+        record = {"kind": "failed", "ref": ref, "retries": retries, "error": str(error), "alert": entry.record.get("alert")}
+        if target is not None:
+            record["adapter"], record["destination"] = target[0], target[1].destination
+        return record
+
+    @staticmethod
+    def _groups(adapter: NotificationAdapter, datas: list[Any]) -> list[tuple[list[int], Any]]:
+        """Consecutive runs of alerts that fit one send, with their payload."""
+        groups: list[tuple[list[int], Any]] = []
+        idx: list[int] = []
+        payload: Any = None
+        for i, data in enumerate(datas):
+            merged = adapter.coalesce([datas[j] for j in idx] + [data]) if idx else None
+            if merged is not None:
+                idx.append(i)
+                payload = merged
+            else:
+                if idx:
+                    groups.append((idx, payload))
+                idx, payload = [i], data
+        if idx:
+            groups.append((idx, payload))
+        return groups
+
+    def _send_groups(
+        self, adapter: NotificationAdapter, datas: list[Any]
+    ) -> tuple[dict[int, Exception], dict[int, float]]:
+        """
+        Send `datas` through one adapter, in order. Returns failures by index,
+        and alerts not attempted because the destination is backed off or has
+        no rate-limit token yet (index -> when it may be tried again).
+        """
+        failed: dict[int, Exception] = {}
+        deferred: dict[int, float] = {}
+        bucket = self._bucket(adapter)
+        hold: Optional[float] = None
+        for idx, payload in self._groups(adapter, datas):
+            until = hold or self._backed_off_until(adapter.destination)
+            if until is None and bucket is not None and not bucket.try_acquire():
+                until = time.time() + bucket.wait_time()
+            if until is not None:
+                hold = until  # later alerts must not overtake these
+                deferred.update((i, until) for i in idx)
+                continue
+            try:
+                self._send(adapter, payload)
+            except Exception as e:
+                failed.update((i, e) for i in idx)
+                self._destination_failed(adapter.destination, e)
+            else:
+                self._destination_ok(adapter.destination)
+        return failed, deferred
+
+    def _backed_off_until(self, destination: str) -> Optional[float]:
+        with self._limits_lock:
+            until = self._down_until.get(destination)
+        return until if until is not None and until > time.time() else None
+
+    def _destination_failed(self, destination: str, error: Exception) -> None:
+        with self._limits_lock:
+            n = self._dest_failures[destination] = self._dest_failures.get(destination, 0) + 1
+            if isinstance(error, RateLimited):
+                delay = error.retry_after
+            else:
+                delay = backoff_delay(n, self.retry_delay, self.max_retry_delay)
+            self._down_until[destination] = time.time() + delay
+
+    def _destination_ok(self, destination: str) -> None:
+        with self._limits_lock:
+            self._dest_failures.pop(destination, None)
+            self._down_until.pop(destination, None)
+
+    def _send(self, adapter: NotificationAdapter, data: Any) -> None:
+        """One send (its rate-limit token already taken)."""
+        bucket = self._bucket(adapter)
+        with self._limit(adapter.destination):
+            try:
+                adapter.send(data)
+            except RateLimited as e:
+                logger.warning("%s rate limited; pausing %.1fs", adapter.destination, e.retry_after)
+                if bucket is not None:
+                    bucket.pause(e.retry_after)
+                raise
+
+    def _bucket(self, adapter: NotificationAdapter) -> Optional[TokenBucket]:
+        with self._limits_lock:
+            key = adapter.destination
+            if key not in self._buckets:
+                limit = adapter.rate_limit
+                self._buckets[key] = TokenBucket(*limit) if limit else None
+            return self._buckets[key]
+
+    def _limit(self, destination: str) -> threading.BoundedSemaphore:
+        with self._limits_lock:
+            sem = self._limits.get(destination)
+            if sem is None:
+                sem = self._limits[destination] = threading.BoundedSemaphore(self.per_destination)
+            return sem
+
+    # -------------------------------------------------
+    # lifecycle
+    # -------------------------------------------------
+
+    def close(self) -> None:
+        self._outbox_pool.shutdown(wait=True)
+        self._send_pool.shutdown(wait=True)
+        for adapters in self.outbox_adapters.values():
+            for adapter in adapters:
+                adapter.close()
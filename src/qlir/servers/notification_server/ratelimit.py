@@ -0,0 +1,78 @@
+"""
+Token bucket pacing per destination.
+
+Rather than sending as fast as possible and retrying on HTTP 429, every send
+to a destination takes a token first (`try_acquire`; the delivery engine
+reschedules a send that finds no token for `wait_time` later instead of
+blocking on it); tokens refill at the destination's
+`rate_limit` up to its burst size. A 429 that gets through anyway (limits
+shared with other clients, a stricter chat limit) pauses the bucket for the
+server's `retry_after`.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Parameters
+    ----------
+    rate : float
+        Tokens (sends) per second.
+    burst : float
+        Bucket capacity; the bucket starts full.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"invalid token bucket rate={rate} burst={burst}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()  # refill starts here (in the future while paused)
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + max(0.0, now - self._last) * self.rate)
+        self._last = max(self._last, now)
+
+    def reserve(self) -> float:
+        """Take a token; returns how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0
+            return max(0.0, self._last - now) + max(0.0, -self._tokens) / self.rate
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available now."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._last > now or self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def wait_time(self) -> float:
+        """How long until a token is available (without taking one)."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return max(0.0, self._last - now) + max(0.0, 1.0 - self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the time waited."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        """No tokens for `seconds`, then refill from empty."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+            self._last = max(self._last, now + seconds)
@@ -1,23 +1,33 @@
-import json
 import os
-import shutil
 import time
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Iterable
 
 from .adapters.base import NotificationAdapter
 from .adapters.telegram import TelegramAdapter
+from .delivery import DeliveryEngine
 from .logging import setup_logging
+from .watcher import make_watcher
 
-from qlir.servers.alerts.paths import get_alerts_root
+from qlir.servers.alerts.paths import get_alerts_root, get_traces_dir
+from qlir.telemetry.heartbeat import Heartbeat
 
 
 ALERTS_ROOT = get_alerts_root()
-SENT_ROOT = ALERTS_ROOT / "_sent"
-FAILED_ROOT = ALERTS_ROOT / "_failed"
+JOURNAL_ROOT = ALERTS_ROOT / "_journal"
 
+# With inotify, alerts are sent as soon as they land; every outbox is still
+# swept at this interval (retries, anything a notification missed).
 POLL_INTERVAL_SEC = 2.0
-MAX_RETRIES = 3
+
+# Outboxes drained in parallel / sends in flight per destination (e.g. one bot)
+MAX_CONCURRENT_OUTBOXES = 8
+PER_DESTINATION_SENDS = 2
+
+# Coalescing window (ms) for the qlir-tradable-* outboxes, where many triggers
+# fire on the same candle: alerts landing within it after the first pending
+# one go out merged (one Telegram message per ~4 KB of text).
+TRADABLE_COALESCE_MS = 250.0
 
 
 # -------------------------------------------------
@@ -129,20 +139,6 @@ def iter_outbox_dirs() -> Iterable[Path]:
         yield d
 
 
-def load_alert(path: Path) -> dict[str, Any]:
-    with path.open("r") as f:
-        return json.load(f)
-
-
-def increment_retry(alert: dict[str, Any]) -> None:
-    meta = alert.setdefault("_meta", {})
-    meta["retries"] = meta.get("retries", 0) + 1
-
-
-def retries_exceeded(alert: dict[str, Any]) -> bool:
-    return alert.get("_meta", {}).get("retries", 0) >= MAX_RETRIES
-
-
 # -------------------------------------------------
 # Main loop
 # -------------------------------------------------
@@ -152,15 +148,11 @@ logger = setup_logging()
 def main() -> None:
     
     ALERTS_ROOT.mkdir(parents=True, exist_ok=True)
-    SENT_ROOT.mkdir(parents=True, exist_ok=True)
-    FAILED_ROOT.mkdir(parents=True, exist_ok=True)
+    JOURNAL_ROOT.mkdir(parents=True, exist_ok=True)
 
     logger.info(
         "notification server started (alerts root: %s)", ALERTS_ROOT
     )
-    logger.info(
-        "TODO: WHEN WE CREATE THE BOT TRADER: Work on Perf... it takes a few hundred ms between each alert send... need to figure out where this massive delay is coming from..."
-    )
     logger.info(
         "TODO: Use a logger similar to the data_server and agg_server  found in the example project with all the color formatting"
     )
@@ -172,82 +164,42 @@ def main() -> None:
     
     has_outbox_dirs(ALERTS_ROOT, outbox_routes_keys=list(outbox_adapters.keys()))
 
-    warned_unrouted: set[str] = set()
-
-    while True:
-        if not has_root_outbox_dir(ALERTS_ROOT):
-            raise FileNotFoundError(f"No outbox dirs found in: {ALERTS_ROOT}")
-
-        for outbox in iter_outbox_dirs():
-            outbox_name = outbox.name
-
-            adapters = outbox_adapters.get(outbox_name)
-            if not adapters:
-                if outbox_name not in warned_unrouted:
-                    logger.warning(
-                        "no adapters configured for outbox '%s'; skipping",
-                        outbox_name,
-                    )
-                    warned_unrouted.add(outbox_name)
-                continue
-
-            sent_dir = SENT_ROOT / outbox_name
-            failed_dir = FAILED_ROOT / outbox_name
-            sent_dir.mkdir(parents=True, exist_ok=True)
-            failed_dir.mkdir(parents=True, exist_ok=True)
-            
-            logger.debug(f"checking {outbox_name}")
-            
-            for alert_path in sorted(outbox.glob("*.json")):
-                try:
-                    alert = load_alert(alert_path)
-
-                    if "ts" not in alert or "data" not in alert:
-                        raise ValueError("invalid alert contract")
-
-                    for adapter in adapters:
-                        adapter.send(alert["data"])
-
-                    shutil.move(alert_path, sent_dir / alert_path.name)
-                    logger.info(
-                        "sent alert %s (outbox=%s)",
-                        alert_path.name,
-                        outbox_name,
-                    )
-
-                except Exception as e:
-                    logger.warning(
-                        "failed alert %s (outbox=%s): %s",
-                        alert_path.name,
-                        outbox_name,
-                        e,
-                    )
-
-                    try:
-                        alert = load_alert(alert_path)
-                        increment_retry(alert)
-
-                        if retries_exceeded(alert):
-                            shutil.move(
-                                alert_path, failed_dir / alert_path.name
-                            )
-                            logger.error(
-                                "alert %s moved to failed (outbox=%s)",
-                                alert_path.name,
-                                outbox_name,
-                            )
-                        else:
-                            with alert_path.open("w") as f:
-                                json.dump(alert, f)
-
-                    except Exception as inner:
-                        logger.error(
-                            "failed to update retry metadata for %s: %s",
-                            alert_path.name,
-                            inner,
-                        )
-
-        time.sleep(POLL_INTERVAL_SEC)
+    engine = DeliveryEngine(
+        outbox_adapters,
+        journal_root=JOURNAL_ROOT,
+        max_outboxes=MAX_CONCURRENT_OUTBOXES,
+        per_destination=PER_DESTINATION_SENDS,
+        retry_delay=POLL_INTERVAL_SEC,
+        coalesce_ms={name: TRADABLE_COALESCE_MS for name in outbox_adapters if name.startswith("qlir-tradable")},
+        trace_log=get_traces_dir() / "latency.jsonl",
+    )
+    watcher = make_watcher(ALERTS_ROOT, iter_outbox_dirs())
+    for name, journal_dir in engine.journal_dirs().items():
+        watcher.add(journal_dir, report_as=ALERTS_ROOT / name)
+
+    heartbeat = Heartbeat("notification_server")
+
+    try:
+        last_sweep = 0.0
+        while True:
+            with heartbeat.loop() as it:
+                sent = 0
+                if time.monotonic() - last_sweep >= POLL_INTERVAL_SEC:
+                    if not has_root_outbox_dir(ALERTS_ROOT):
+                        raise FileNotFoundError(f"No outbox dirs found in: {ALERTS_ROOT}")
+                    sent += engine.run_once(iter_outbox_dirs())
+                    last_sweep = time.monotonic()
+                if sent:
+                    it.processed_ts = time.time()
+
+            changed = watcher.wait(timeout=max(0.0, last_sweep + POLL_INTERVAL_SEC - time.monotonic()))
+            if changed:
+                with heartbeat.loop() as it:
+                    if engine.run_once(sorted(changed)):
+                        it.processed_ts = time.time()
+    finally:
+        watcher.close()
+        engine.close()
 
 
 if __name__ == "__main__":
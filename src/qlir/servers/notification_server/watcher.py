@@ -0,0 +1,154 @@
+"""
+Wake the notification server when alerts land, instead of polling.
+
+File producers (`emit_alert`, `ops_watcher.outbox.emit_event`) rename a
+finished `.tmp` into `<outbox>/*.json` (IN_MOVED_TO); other writers may
+write in place (IN_CLOSE_WRITE). Journal producers append to
+`_journal/<outbox>/*.log` and close it (IN_CLOSE_WRITE). `InotifyWatcher`
+subscribes to exactly those two events on every watched directory (plus
+directory creation on the alerts root, so new outboxes are picked up) and
+reports which outboxes received an alert file or journal append.
+
+inotify is Linux-only and reached through libc with ctypes (no extra
+dependency). Elsewhere, or if the kernel refuses (watch limits),
+`make_watcher` falls back to `PollingWatcher`, which just waits out the poll
+interval: the server then sweeps every outbox, as before.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+from pathlib import Path
+import select
+import struct
+import sys
+import time
+from typing import Iterable
+
+logger = logging.getLogger("notification-server")
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_OUTBOX_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE_SELF | IN_ONLYDIR
+_ROOT_MASK = IN_CREATE | IN_MOVED_TO | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _is_outbox_name(name: str) -> bool:
+    return not name.startswith("_")
+
+
+class PollingWatcher:
+    """No notifications: every wait times out and the caller sweeps."""
+
+    def add(self, outbox_dir: Path, *, report_as: Path | None = None) -> None:
+        pass
+
+    def wait(self, timeout: float) -> set[Path]:
+        time.sleep(timeout)
+        return set()
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    inotify watches on the alerts root and each outbox / journal directory.
+
+    `wait(timeout)` blocks until a `.json` / `.log` file is written into or
+    moved into a watched directory (returns those outboxes) or the timeout
+    passes (returns an empty set). On queue overflow every known outbox is
+    returned.
+    """
+
+    def __init__(self, alerts_root: Path, outbox_dirs: Iterable[Path] = ()):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.alerts_root = alerts_root
+        self._dirs: dict[int, Path] = {}
+        self._root_wd = self._add_watch(alerts_root, _ROOT_MASK)
+        for d in outbox_dirs:
+            self.add(d)
+
+    def _add_watch(self, path: Path, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch({path}) failed: {os.strerror(err)}")
+        return wd
+
+    def add(self, outbox_dir: Path, *, report_as: Path | None = None) -> None:
+        """Watch a directory; events are reported as `report_as` (default: the directory)."""
+        wd = self._add_watch(outbox_dir, _OUTBOX_MASK)
+        self._dirs[wd] = report_as or outbox_dir
+
+    def wait(self, timeout: float) -> set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        # let a burst of writes coalesce into one wake-up
+        time.sleep(0.001)
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        return self._parse(buf)
+
+    def _parse(self, buf: bytes) -> set[Path]:
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflow; sweeping all outboxes")
+                changed.update(self._dirs.values())
+            elif wd == self._root_wd:
+                if mask & IN_ISDIR and _is_outbox_name(name):
+                    new_dir = self.alerts_root / name
+                    logger.info("watching new outbox %s", new_dir)
+                    self.add(new_dir)
+                    changed.add(new_dir)  # files may have landed before the watch
+            elif mask & (IN_IGNORED | IN_DELETE_SELF):
+                self._dirs.pop(wd, None)
+            elif name.endswith((".json", ".log")) and wd in self._dirs:
+                changed.add(self._dirs[wd])
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(alerts_root: Path, outbox_dirs: Iterable[Path]) -> InotifyWatcher | PollingWatcher:
+    """inotify when available, else polling."""
+    outbox_dirs = list(outbox_dirs)
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(alerts_root, outbox_dirs)
+        except (OSError, AttributeError) as e:
+            logger.warning("inotify unavailable (%s); falling back to polling", e)
+    else:
+        logger.info("inotify unavailable on %s; polling outboxes", sys.platform)
+    return PollingWatcher()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Any
+
+from qlir.telemetry.heartbeat import HeartbeatRecord
+
+from .config import HeartbeatCheckConfig
+
+
+def eval_heartbeat_check(
+    cfg: HeartbeatCheckConfig,
+    record: HeartbeatRecord | None,
+    *,
+    now: float,
+) -> tuple[bool, dict[str, Any]]:
+    """
+    Judge one server from its latest heartbeat (see qlir.telemetry.heartbeat).
+
+    Failure types, most severe first: heartbeat_missing, heartbeat_stalled
+    (no beat within max_silence_seconds), loop_slow, processing_lag.
+    """
+    payload: dict[str, Any] = {
+        "check_kind": "heartbeat",
+        "name": cfg.name,
+        "server": cfg.server,
+    }
+    if cfg.note:
+        payload["note"] = cfg.note
+
+    if record is None:
+        payload.update(type="heartbeat_missing", severity=cfg.severity)
+        return False, payload
+
+    age = record.age_s(now)
+    lag = record.lag_s(now)
+    payload.update(
+        pid=record.pid,
+        loop=record.loop,
+        heartbeat_age_s=round(age, 3),
+        loop_duration_s=record.loop_duration_s,
+        lag_s=None if lag is None else round(lag, 3),
+    )
+
+    if age > cfg.max_silence_seconds:
+        etype = "heartbeat_stalled"
+        payload["max_silence_seconds"] = cfg.max_silence_seconds
+    elif (
+        cfg.max_loop_seconds is not None
+        and record.loop_duration_s is not None
+        and record.loop_duration_s > cfg.max_loop_seconds
+    ):
+        etype = "loop_slow"
+        payload["max_loop_seconds"] = cfg.max_loop_seconds
+    elif cfg.max_lag_seconds is not None and lag is not None and lag > cfg.max_lag_seconds:
+        etype = "processing_lag"
+        payload["max_lag_seconds"] = cfg.max_lag_seconds
+    else:
+        payload.update(type="heartbeat_ok", severity="info")
+        return True, payload
+
+    payload.update(type=etype, severity=cfg.severity)
+    return False, payload
@@ -1,34 +1,95 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import Any
+from functools import lru_cache
+import re
+from typing import Any, Iterable, Optional
 
 import psutil
 
 from .config import ProcessCheckConfig, SelfCheckConfig
 
 
-def _iter_proc_cmdlines() -> list[str]:
-    out: list[str] = []
-    for p in psutil.process_iter(attrs=["cmdline"]):
-        cmd = p.info.get("cmdline") or []
-        if not cmd:
-            continue
-        out.append(" ".join(cmd))
-    return out
+class CmdlineCache:
+    """
+    Joined cmdlines keyed by (pid, create_time, name), kept across ticks.
 
+    A process's cmdline is read from /proc once; later ticks only list PIDs,
+    start times and names. The start time guards against PID reuse, the name
+    against exec (which keeps both PID and start time).
+    """
 
-def count_matching_proc_cmdline(selector: str) -> int:
-    # substring match, conservative
-    cnt = 0
-    for cmdline in _iter_proc_cmdlines():
-        if selector in cmdline:
-            cnt += 1
-    return cnt
+    def __init__(self) -> None:
+        self._cmdlines: dict[tuple[int, float, str], str] = {}
 
+    def cmdlines(self) -> list[str]:
+        seen: dict[tuple[int, float, str], str] = {}
+        for p in psutil.process_iter():
+            try:
+                with p.oneshot():
+                    key = (p.pid, p.create_time(), p.name())
+                    cmdline = self._cmdlines.get(key)
+                    if cmdline is None:
+                        cmdline = " ".join(p.cmdline() or [])
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            seen[key] = cmdline
+        self._cmdlines = seen  # drop exited processes
+        return [c for c in seen.values() if c]
 
-def eval_process_check(cfg: ProcessCheckConfig) -> tuple[bool, dict[str, Any]]:
-    cnt = count_matching_proc_cmdline(cfg.proc_cmdline_contains)
+
+_CMDLINE_CACHE = CmdlineCache()
+
+
+@lru_cache(maxsize=32)
+def _any_selector(selectors: tuple[str, ...]) -> re.Pattern[str]:
+    # one scan per cmdline tells whether any selector occurs at all
+    return re.compile("|".join(re.escape(s) for s in sorted(selectors, key=len, reverse=True)))
+
+
+class ProcessSnapshot:
+    """
+    The process table as of one ops_watcher tick; every selector of the tick
+    is matched against it (substring match, conservative).
+    """
+
+    def __init__(self, cmdlines: list[str]):
+        self.cmdlines = cmdlines
+        self._counts: dict[str, int] = {}
+
+    @classmethod
+    def take(cls, cache: Optional[CmdlineCache] = None) -> "ProcessSnapshot":
+        return cls((cache or _CMDLINE_CACHE).cmdlines())
+
+    def counts(self, selectors: Iterable[str]) -> dict[str, int]:
+        """Matching cmdlines per selector, all selectors in one pass."""
+        wanted = tuple(sorted({s for s in selectors if s not in self._counts}))
+        if wanted:
+            counts = dict.fromkeys(wanted, 0)
+            if "" in counts:
+                counts[""] = len(self.cmdlines)
+            rest = tuple(s for s in wanted if s)
+            if rest:
+                pattern = _any_selector(rest)
+                for cmdline in self.cmdlines:
+                    if pattern.search(cmdline) is None:
+                        continue  # the common case: no selector occurs
+                    for s in rest:
+                        if s in cmdline:
+                            counts[s] += 1
+            self._counts.update(counts)
+        return {s: self._counts[s] for s in selectors}
+
+    def count(self, selector: str) -> int:
+        return self.counts([selector])[selector]
+
+
+def count_matching_proc_cmdline(selector: str, snapshot: Optional[ProcessSnapshot] = None) -> int:
+    return (snapshot or ProcessSnapshot.take()).count(selector)
+
+
+def eval_process_check(cfg: ProcessCheckConfig, snapshot: Optional[ProcessSnapshot] = None) -> tuple[bool, dict[str, Any]]:
+    cnt = count_matching_proc_cmdline(cfg.proc_cmdline_contains, snapshot)
     ok = cnt >= 1
     payload: dict[str, Any] = {
         "type": "process_missing" if not ok else "process_ok",
@@ -43,8 +104,8 @@ def eval_process_check(cfg: ProcessCheckConfig) -> tuple[bool, dict[str, Any]]:
     return ok, payload
 
 
-def eval_self_check(cfg: SelfCheckConfig) -> tuple[bool, dict[str, Any]]:
-    cnt = count_matching_proc_cmdline(cfg.proc_cmdline_contains)
+def eval_self_check(cfg: SelfCheckConfig, snapshot: Optional[ProcessSnapshot] = None) -> tuple[bool, dict[str, Any]]:
+    cnt = count_matching_proc_cmdline(cfg.proc_cmdline_contains, snapshot)
 
     # For "self", missing should never happen while we're running,
     # but duplicates can happen (e.g., launched twice).
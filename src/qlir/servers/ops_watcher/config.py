@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Literal
 
@@ -19,6 +19,7 @@ class ServiceConfig:
     interval_seconds: int
     emit_outbox: Path
     state_path: Path
+    heartbeat_dir: Path | None = None  # None: qlir.telemetry.heartbeat default
 
 
 @dataclass(frozen=True)
@@ -46,12 +47,24 @@ class LogGrowthCheckConfig:
     note: str | None = None
 
 
+@dataclass(frozen=True)
+class HeartbeatCheckConfig:
+    name: str
+    server: str
+    max_silence_seconds: float
+    max_loop_seconds: float | None = None
+    max_lag_seconds: float | None = None
+    severity: Severity = "critical"
+    note: str | None = None
+
+
 @dataclass(frozen=True)
 class OpsWatcherConfig:
     service: ServiceConfig
     self_check: SelfCheckConfig | None
     process_checks: list[ProcessCheckConfig]
     log_growth_checks: list[LogGrowthCheckConfig]
+    heartbeat_checks: list[HeartbeatCheckConfig] = field(default_factory=list)
 
 
 def _req(d: dict[str, Any], k: str) -> Any:
@@ -70,6 +83,7 @@ def load_config(path: str | Path) -> OpsWatcherConfig:
         interval_seconds=int(_req(svc, "interval_seconds")),
         emit_outbox=Path(_req(svc, "emit_outbox")),
         state_path=Path(svc.get("state_path", "/tmp/qlir_ops_watcher_state.json")),
+        heartbeat_dir=Path(svc["heartbeat_dir"]) if "heartbeat_dir" in svc else None,
     )
 
     self_cfg: SelfCheckConfig | None = None
@@ -105,9 +119,24 @@ def load_config(path: str | Path) -> OpsWatcherConfig:
             )
         )
 
+    hbs: list[HeartbeatCheckConfig] = []
+    for item in raw.get("heartbeat_checks", []):
+        hbs.append(
+            HeartbeatCheckConfig(
+                name=str(_req(item, "name")),
+                server=str(item.get("server", item["name"])),
+                max_silence_seconds=float(_req(item, "max_silence_seconds")),
+                max_loop_seconds=float(item["max_loop_seconds"]) if "max_loop_seconds" in item else None,
+                max_lag_seconds=float(item["max_lag_seconds"]) if "max_lag_seconds" in item else None,
+                severity=str(item.get("severity", "critical")),  # type: ignore
+                note=item.get("note"),
+            )
+        )
+
     return OpsWatcherConfig(
         service=service,
         self_check=self_cfg,
         process_checks=pcs,
         log_growth_checks=lgs,
+        heartbeat_checks=hbs,
     )
@@ -6,6 +6,8 @@ import time
 from pathlib import Path
 from typing import Any
 
+from qlir.servers.alerts.journal import alert_record, journal_transport_enabled, open_journal
+
 
 def _iso_utc(ts: float) -> str:
     # simple ISO-ish UTC; good enough for ops events
@@ -20,6 +22,11 @@ def emit_event(outbox_dir: Path, *, event: dict[str, Any]) -> Path:
     event.setdefault("ts", ts)
     event.setdefault("ts_utc", _iso_utc(ts))
 
+    if journal_transport_enabled():
+        journal_dir = outbox_dir.parent / "_journal" / outbox_dir.name
+        open_journal(journal_dir).append([alert_record(event)])
+        return journal_dir
+
     # Unique filename, atomic write
     fname = f"{int(ts)}-{os.getpid()}-{event.get('type','event')}.json"
     tmp = outbox_dir / (fname + ".tmp")
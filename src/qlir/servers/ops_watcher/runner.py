@@ -26,12 +26,22 @@ def run_once(cfg: OpsWatcherConfig, state: WatcherState, *, repeat_fail_seconds:
     now = time.time()
     outbox = cfg.service.emit_outbox
 
+    # One process-table read per tick, shared by every process selector
+    from .checks_process import ProcessSnapshot
+
+    selectors = [pc.proc_cmdline_contains for pc in cfg.process_checks]
+    if cfg.self_check and cfg.self_check.enabled:
+        selectors.append(cfg.self_check.proc_cmdline_contains)
+    snapshot = ProcessSnapshot.take() if selectors else None
+    if snapshot is not None:
+        snapshot.counts(selectors)
+
     # --- self check ---
     if cfg.self_check and cfg.self_check.enabled:
         from .checks_process import eval_self_check
 
         st = get_check_state(state, "self", "self")
-        ok, payload = eval_self_check(cfg.self_check)
+        ok, payload = eval_self_check(cfg.self_check, snapshot)
 
         new_status = "ok" if ok else "fail"
         if _should_emit(st.status, new_status, st.last_emit_ts, now=now, repeat_fail_seconds=repeat_fail_seconds):
@@ -44,7 +54,7 @@ def run_once(cfg: OpsWatcherConfig, state: WatcherState, *, repeat_fail_seconds:
 
     for pc in cfg.process_checks:
         st = get_check_state(state, "process", pc.name)
-        ok, payload = eval_process_check(pc)
+        ok, payload = eval_process_check(pc, snapshot)
         new_status = "ok" if ok else "fail"
 
         if _should_emit(st.status, new_status, st.last_emit_ts, now=now, repeat_fail_seconds=repeat_fail_seconds):
@@ -53,6 +63,23 @@ def run_once(cfg: OpsWatcherConfig, state: WatcherState, *, repeat_fail_seconds:
             st.last_emit_ts = now
         st.status = new_status
 
+    # --- heartbeat checks (one small file per server, no /proc scan) ---
+    if cfg.heartbeat_checks:
+        from qlir.telemetry.heartbeat import read_heartbeats
+
+        from .checks_heartbeat import eval_heartbeat_check
+
+        heartbeats = read_heartbeats(cfg.service.heartbeat_dir)
+        for hc in cfg.heartbeat_checks:
+            st = get_check_state(state, "heartbeat", hc.name)
+            ok, payload = eval_heartbeat_check(hc, heartbeats.get(hc.server), now=now)
+            new_status = "ok" if ok else "fail"
+
+            if _should_emit(st.status, new_status, st.last_emit_ts, now=now, repeat_fail_seconds=repeat_fail_seconds):
+                emit_event(outbox, event=payload)
+                st.last_emit_ts = now
+            st.status = new_status
+
     # --- log growth checks ---
     from .checks_log_growth import eval_log_growth_check
 
@@ -76,11 +103,15 @@ def run_once(cfg: OpsWatcherConfig, state: WatcherState, *, repeat_fail_seconds:
 
 
 def run_forever(cfg: OpsWatcherConfig, state: WatcherState) -> None:
+    from qlir.telemetry.heartbeat import Heartbeat
+
     interval = max(5, int(cfg.service.interval_seconds))
+    heartbeat = Heartbeat(cfg.service.name, directory=cfg.service.heartbeat_dir)
 
     while True:
         t0 = time.time()
-        run_once(cfg, state)
+        with heartbeat.loop():
+            run_once(cfg, state)
         elapsed = time.time() - t0
         sleep_s = max(0.0, interval - elapsed)
         time.sleep(sleep_s)
@@ -0,0 +1,191 @@
+"""
+Fan one study function out over symbols / timeframes / parameter sets.
+
+    def my_study(df: pd.DataFrame, *, fast: int, slow: int) -> pd.DataFrame:
+        ...  # indicator -> feature -> granularity chain, returns a summary
+
+    run = run_studies(base_df, my_study, [
+        StudyTask("12_26", {"fast": 12, "slow": 26}),
+        StudyTask("5_35", {"fast": 5, "slow": 35}),
+    ])
+    run.results["12_26"]   # summary frame
+    run.metrics            # one row per task: wall time, RSS, status
+
+The base frame is published once (`shared_frame.SharedFrame`) and attached by
+each worker process when it starts, so tasks read it zero-copy instead of
+receiving a pickled copy. Only the task parameters go out and only the
+(small) summary frames come back.
+
+`study_fn` must be importable from the worker (a module-level function), take
+the base frame as its first argument and the task params as keyword
+arguments, and must not modify base columns in place (see `SharedFrame`).
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import logging
+import os
+import time
+import traceback
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+import pandas as _pd
+import psutil
+
+from qlir.perf.logging import memory_event_str
+from qlir.perf.memory_event import MemoryEvent
+from qlir.studies.shared_frame import SharedFrame, SharedFrameHandle, attach
+
+log = logging.getLogger(__name__)
+
+__all__ = ["StudyTask", "StudyRun", "run_studies"]
+
+StudyFn = Callable[..., _pd.DataFrame]
+
+
+@dataclass(frozen=True)
+class StudyTask:
+    """One unit of work: a unique name and the keyword params for the study."""
+    name: str
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class StudyRun:
+    """
+    results : task name -> summary frame (successful tasks only)
+    errors  : task name -> formatted traceback
+    metrics : one row per task (task, ok, wall_s, rss_before, rss_after,
+              rss_delta, result_bytes, pid), in submission order
+    """
+    results: dict[str, _pd.DataFrame]
+    errors: dict[str, str]
+    metrics: _pd.DataFrame
+
+
+# ----------------------------------------------------------------------
+# worker side
+# ----------------------------------------------------------------------
+
+_worker_df: Optional[_pd.DataFrame] = None
+_process = psutil.Process(os.getpid())
+
+
+def _init_worker(handle: SharedFrameHandle) -> None:
+    global _worker_df, _process
+    _process = psutil.Process(os.getpid())
+    _worker_df = attach(handle)
+
+
+def _run_task(study_fn: StudyFn, task: StudyTask):
+    rss_before = _process.memory_info().rss
+    t0 = time.perf_counter()
+    try:
+        result, error = study_fn(_worker_df, **task.params), None
+    except Exception:
+        result, error = None, traceback.format_exc()
+    elapsed = time.perf_counter() - t0
+
+    event = MemoryEvent(
+        label=task.name,
+        df_bytes_before=None,
+        df_bytes_after=None if result is None else int(result.memory_usage(deep=True).sum()),
+        rss_before=rss_before,
+        rss_after=_process.memory_info().rss,
+        elapsed_s=elapsed,
+    )
+    return result, error, event, os.getpid()
+
+
+# ----------------------------------------------------------------------
+# driver
+# ----------------------------------------------------------------------
+
+def run_studies(
+    base_df: _pd.DataFrame,
+    study_fn: StudyFn,
+    tasks: Iterable[StudyTask],
+    *,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int, StudyTask, MemoryEvent], None]] = None,
+    raise_on_error: bool = False,
+) -> StudyRun:
+    """
+    Run `study_fn(base_df, **task.params)` for every task on a process pool.
+
+    Parameters
+    ----------
+    base_df : _pd.DataFrame
+        Shared, read-only input for every task (published once).
+    study_fn : callable
+        Module-level function returning a summary DataFrame.
+    tasks : iterable[StudyTask]
+        Task names must be unique.
+    max_workers : int | None
+        Pool size (default: `os.cpu_count()`, capped at the number of tasks).
+    progress : callable | None
+        Called as `progress(done, total, task, event)` after each task.
+        Defaults to an INFO log line per task.
+    raise_on_error : bool
+        Raise RuntimeError after the run if any task failed (errors are
+        always collected in `StudyRun.errors`).
+    """
+    tasks = list(tasks)
+    names = [t.name for t in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError("StudyTask names must be unique")
+    if not tasks:
+        return StudyRun(results={}, errors={}, metrics=_metrics_frame([]))
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    results: dict[str, _pd.DataFrame] = {}
+    errors: dict[str, str] = {}
+    rows: dict[str, dict] = {}
+
+    with SharedFrame(base_df) as shared, ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(shared.handle,),
+    ) as pool:
+        futures = {pool.submit(_run_task, study_fn, t): t for t in tasks}
+        for done, fut in enumerate(as_completed(futures), start=1):
+            task = futures[fut]
+            result, error, event, pid = fut.result()
+
+            if error is None:
+                results[task.name] = result
+            else:
+                errors[task.name] = error
+                log.error("study task %s failed:\n%s", task.name, error)
+
+            rows[task.name] = {
+                "task": task.name,
+                "ok": error is None,
+                "wall_s": event.elapsed_s,
+                "rss_before": event.rss_before,
+                "rss_after": event.rss_after,
+                "rss_delta": event.rss_delta_bytes,
+                "result_bytes": event.df_bytes_after,
+                "pid": pid,
+            }
+
+            if progress is not None:
+                progress(done, len(tasks), task, event)
+            else:
+                log.info("[study %d/%d] %s", done, len(tasks), memory_event_str(event))
+
+    run = StudyRun(
+        results={n: results[n] for n in names if n in results},
+        errors=errors,
+        metrics=_metrics_frame([rows[n] for n in names]),
+    )
+    if errors and raise_on_error:
+        raise RuntimeError(f"{len(errors)} of {len(tasks)} study tasks failed: {sorted(errors)}")
+    return run
+
+
+def _metrics_frame(rows: list[dict]) -> _pd.DataFrame:
+    cols = ["task", "ok", "wall_s", "rss_before", "rss_after", "rss_delta", "result_bytes", "pid"]
+    return _pd.DataFrame(rows, columns=cols)
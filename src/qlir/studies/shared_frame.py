@@ -0,0 +1,84 @@
+"""
+Publish a base frame once so worker processes can read it without copies.
+
+Fanning a study out over a process pool normally pickles the base OHLCV frame
+into every task. `SharedFrame` instead writes it once as an uncompressed Arrow
+IPC file (on `/dev/shm` when available, i.e. RAM-backed) and hands workers a
+small picklable `SharedFrameHandle`. `attach` memory-maps the file, so the
+numeric columns of the resulting DataFrame are views over the shared pages:
+every worker reads the same physical memory.
+
+The attached frame is read-only. Studies that want to modify a base column
+must copy it first; adding new columns is fine.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import os
+from pathlib import Path
+import tempfile
+
+import pandas as _pd
+import pyarrow as _pa
+
+log = logging.getLogger(__name__)
+
+__all__ = ["SharedFrame", "SharedFrameHandle", "attach"]
+
+_SHM_DIR = "/dev/shm"
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """What a worker needs to attach: the Arrow IPC file path."""
+    path: str
+    n_rows: int
+
+
+class SharedFrame:
+    """
+    Owner of a published base frame (use as a context manager).
+
+    Example
+    -------
+    >>> with SharedFrame(df) as shared:
+    ...     run(shared.handle)
+    """
+
+    def __init__(self, df: _pd.DataFrame, *, directory: str | None = None):
+        if directory is None and os.path.isdir(_SHM_DIR) and os.access(_SHM_DIR, os.W_OK):
+            directory = _SHM_DIR
+
+        fd, path = tempfile.mkstemp(prefix="qlir_frame_", suffix=".arrow", dir=directory)
+        os.close(fd)
+
+        table = _pa.Table.from_pandas(df, preserve_index=True)
+        with _pa.OSFile(path, "wb") as sink, _pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        self.handle = SharedFrameHandle(path=path, n_rows=len(df))
+        log.debug("published %d rows (%d bytes) to %s", len(df), os.path.getsize(path), path)
+
+    def close(self) -> None:
+        """Remove the backing file. Attached workers keep their mapping until they exit."""
+        Path(self.handle.path).unlink(missing_ok=True)
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach(handle: SharedFrameHandle) -> _pd.DataFrame:
+    """
+    Memory-map a published frame.
+
+    Numeric / datetime columns without nulls are zero-copy views over the
+    mapping; other columns (strings, nullable data) are materialized.
+    """
+    source = _pa.memory_map(handle.path, "r")
+    table = _pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=False)
@@ -0,0 +1,188 @@
+"""
+Loop heartbeats for long-running qlir servers.
+
+Each server loop publishes one tiny JSON record per iteration:
+
+    {"server": "analysis_server", "pid": 1234, "started_at": ..., "beat_at": ...,
+     "loop": 812, "loop_duration_s": 0.41, "last_processed_ts": 1767916502.0}
+
+to `<heartbeat dir>/<server>.json`, written to a temp file and renamed, so a
+reader never sees a partial record. The default directory lives on tmpfs
+(`/dev/shm/qlir-heartbeats`), so a beat costs no disk I/O; override it with
+`QLIR_HEARTBEAT_DIR`.
+
+The ops_watcher reads one file per server (`read_heartbeats`) instead of
+scanning `/proc`, and flags stalls (no beat), slow loops and processing lag.
+
+Loops that own their lifecycle use a `Heartbeat` directly. Library loops
+(`run_agg_daemon`, the klines worker, the analysis loop) call the module
+level `begin()` / `beat()`, which are no-ops unless the process entrypoint
+called `start_heartbeat(server)`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+import json
+import logging
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Any, Optional
+
+log = logging.getLogger(__name__)
+
+
+def get_heartbeat_dir() -> Path:
+    raw = os.environ.get("QLIR_HEARTBEAT_DIR")
+    if raw:
+        return Path(raw).expanduser()
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return base / "qlir-heartbeats"
+
+
+def _epoch(ts: Any) -> Optional[float]:
+    """Epoch seconds from a datetime / pandas Timestamp / number (naive = UTC)."""
+    if ts is None:
+        return None
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    if isinstance(ts, datetime):
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp()
+    raise TypeError(f"unsupported processed timestamp type: {type(ts).__name__}")
+
+
+@dataclass(frozen=True)
+class HeartbeatRecord:
+    server: str
+    pid: int
+    started_at: float
+    beat_at: float
+    loop: int
+    loop_duration_s: Optional[float]
+    last_processed_ts: Optional[float]
+
+    def age_s(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.beat_at
+
+    def lag_s(self, now: Optional[float] = None) -> Optional[float]:
+        if self.last_processed_ts is None:
+            return None
+        return (time.time() if now is None else now) - self.last_processed_ts
+
+
+class Heartbeat:
+    """
+    Heartbeat writer for one server loop.
+
+    Call `begin()` when an iteration starts and `beat()` when it ends (or use
+    `with hb.loop():`). `beat()` without a preceding `begin()` times the loop
+    from the previous beat.
+    """
+
+    def __init__(self, server: str, *, directory: Optional[Path] = None):
+        self.server = server
+        self.directory = Path(directory) if directory is not None else get_heartbeat_dir()
+        self.path = self.directory / f"{server}.json"
+        self.started_at = time.time()
+        self.loop_count = 0
+        self.last_processed_ts: Optional[float] = None
+        self._loop_start = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def begin(self) -> None:
+        self._loop_start = time.monotonic()
+
+    def beat(self, *, processed_ts: Any = None) -> HeartbeatRecord:
+        now = time.monotonic()
+        self.loop_count += 1
+        if processed_ts is not None:
+            self.last_processed_ts = _epoch(processed_ts)
+
+        record = HeartbeatRecord(
+            server=self.server,
+            pid=os.getpid(),
+            started_at=self.started_at,
+            beat_at=time.time(),
+            loop=self.loop_count,
+            loop_duration_s=now - self._loop_start,
+            last_processed_ts=self.last_processed_ts,
+        )
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(asdict(record)))
+        os.replace(tmp, self.path)
+
+        self._loop_start = now
+        return record
+
+    class _Loop:
+        def __init__(self, hb: "Heartbeat"):
+            self.hb = hb
+            self.processed_ts: Any = None
+
+        def __enter__(self):
+            self.hb.begin()
+            return self
+
+        def __exit__(self, *exc):
+            self.hb.beat(processed_ts=self.processed_ts)
+            return False
+
+    def loop(self) -> "_Loop":
+        """`with hb.loop() as it: ...; it.processed_ts = ts` times one iteration."""
+        return Heartbeat._Loop(self)
+
+
+def read_heartbeat(server: str, directory: Optional[Path] = None) -> Optional[HeartbeatRecord]:
+    path = (Path(directory) if directory is not None else get_heartbeat_dir()) / f"{server}.json"
+    try:
+        return HeartbeatRecord(**json.loads(path.read_text()))
+    except (FileNotFoundError, ValueError, TypeError):
+        return None
+
+
+def read_heartbeats(directory: Optional[Path] = None) -> dict[str, HeartbeatRecord]:
+    """Latest record per server (one small file read per server)."""
+    directory = Path(directory) if directory is not None else get_heartbeat_dir()
+    out: dict[str, HeartbeatRecord] = {}
+    for path in directory.glob("*.json"):
+        try:
+            rec = HeartbeatRecord(**json.loads(path.read_text()))
+        except (FileNotFoundError, ValueError, TypeError):
+            continue  # removed or foreign file
+        out[rec.server] = rec
+    return out
+
+
+# -------------------------------------------------
+# Process-wide heartbeat (for library loops)
+# -------------------------------------------------
+
+_current: Optional[Heartbeat] = None
+
+
+def start_heartbeat(server: str, *, directory: Optional[Path] = None) -> Heartbeat:
+    """Make this process publish heartbeats as `server` (see module docstring)."""
+    global _current
+    _current = Heartbeat(server, directory=directory)
+    return _current
+
+
+def begin() -> None:
+    if _current is not None:
+        _current.begin()
+
+
+def beat(*, processed_ts: Any = None) -> None:
+    if _current is None:
+        return
+    # never let a heartbeat write kill the loop it reports on
+    try:
+        _current.beat(processed_ts=processed_ts)
+    except (OSError, TypeError) as e:
+        log.warning("heartbeat write failed (%s): %s", _current.server, e)
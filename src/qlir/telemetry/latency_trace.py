@@ -0,0 +1,201 @@
+"""
+Candle-to-alert latency tracing.
+
+A trace is a small dict of epoch-second stamps for the newest *closed*
+candle, carried forward by each server:
+
+    closed      candle close time on the exchange      (data server)
+    received    first persist of a slice holding it    (data server, raw slice meta)
+    aggregated  first agg manifest write covering it   (agg server, manifest "trace")
+    detected    alert emitted for it                   (analysis server, alert "trace")
+    sent        alert delivered to every adapter       (notification server)
+
+Each stage is stamped the first time the stage sees that candle, so a slice
+that is re-fetched (or a head that is rewritten) every poll does not move
+the stamps forward. The notification server appends every delivered trace
+as one JSON line to the trace log (`<alerts root>/_traces/latency.jsonl`),
+and
+
+    python -m qlir.telemetry.latency_trace [trace_log] [--since-hours H]
+
+reports p50 / p99 per stage, which shows which polling loop dominates.
+
+Traces older than `MAX_TRACE_LAG_S` when received (backfill, not live data)
+are not started.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Iterable, Mapping, Optional
+
+STAGES = ("closed", "received", "aggregated", "detected", "sent")
+TRACE_KEY = "trace"
+
+# a slice whose newest closed candle is older than this is backfill
+MAX_TRACE_LAG_S = 3600.0
+
+# the trace log is rotated to `<name>.1` beyond this size
+MAX_TRACE_LOG_BYTES = 16 * 1024 * 1024
+
+
+def stamp(trace: Optional[Mapping[str, Any]], stage: str, at: Optional[float] = None) -> Optional[dict]:
+    """Copy of `trace` with `stage` stamped (now by default); None stays None."""
+    if stage not in STAGES:
+        raise ValueError(f"unknown trace stage {stage!r}; expected one of {STAGES}")
+    if trace is None:
+        return None
+    out = dict(trace)
+    out[stage] = time.time() if at is None else at
+    return out
+
+
+def start(closed: Optional[float], *, received: Optional[float] = None) -> Optional[dict]:
+    """New trace for a candle that closed at `closed`; None for missing or backfill candles."""
+    received = time.time() if received is None else received
+    if closed is None or received - closed > MAX_TRACE_LAG_S:
+        return None
+    return {"closed": closed, "received": received}
+
+
+def carry(prev: Optional[Mapping[str, Any]], new: Optional[Mapping[str, Any]], stage: str) -> Optional[dict]:
+    """
+    Trace to record at `stage`: `prev` if it already traces the same or a
+    newer candle (keeps the first stamp), else `new` stamped at `stage`
+    (unless `new` already carries that stamp).
+    """
+    if new is None:
+        return dict(prev) if prev is not None else None
+    if prev is not None and prev.get("closed", 0) >= new["closed"]:
+        return dict(prev)
+    return dict(new) if stage in new else stamp(new, stage)
+
+
+def newest(traces: Iterable[Optional[Mapping[str, Any]]]) -> Optional[dict]:
+    """The trace of the newest closed candle among `traces` (None entries skipped)."""
+    best: Optional[Mapping[str, Any]] = None
+    for t in traces:
+        if t is not None and "closed" in t and (best is None or t["closed"] > best["closed"]):
+            best = t
+    return dict(best) if best is not None else None
+
+
+def read_manifest_trace(manifest_path: Path) -> Optional[dict]:
+    """The `trace` of an agg manifest, or None if it is missing / unreadable."""
+    try:
+        with Path(manifest_path).open("r", encoding="utf-8") as f:
+            trace = json.load(f).get(TRACE_KEY)
+    except (OSError, ValueError, AttributeError):
+        return None
+    return trace if isinstance(trace, dict) else None
+
+
+# -------------------------------------------------
+# Trace log (notification server) + report
+# -------------------------------------------------
+
+def append_traces(path: Path, traces: Iterable[Mapping[str, Any]]) -> None:
+    """Append one JSON line per trace (one write; rotates past `MAX_TRACE_LOG_BYTES`)."""
+    payload = "".join(json.dumps(t, separators=(",", ":")) + "\n" for t in traces)
+    if not payload:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if path.stat().st_size > MAX_TRACE_LOG_BYTES:
+            os.replace(path, path.with_name(path.name + ".1"))
+    except FileNotFoundError:
+        pass
+    with path.open("a", encoding="utf-8") as f:
+        f.write(payload)
+
+
+def read_traces(path: Path, *, since: Optional[float] = None) -> list[dict]:
+    out: list[dict] = []
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    t = json.loads(line)
+                except ValueError:
+                    continue  # torn / foreign line
+                if isinstance(t, dict) and (since is None or t.get("sent", 0) >= since):
+                    out.append(t)
+    except FileNotFoundError:
+        pass
+    return out
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summarize(traces: Iterable[Mapping[str, Any]]) -> dict[str, dict[str, float]]:
+    """
+    Per stage ("received" = closed -> received, ..., "total" = closed -> sent):
+    {"n", "p50", "p99", "max"} in seconds. A stage is only measured on
+    traces that carry both of its stamps.
+    """
+    deltas: dict[str, list[float]] = {stage: [] for stage in STAGES[1:]}
+    deltas["total"] = []
+    for t in traces:
+        for prev, stage in zip(STAGES, STAGES[1:]):
+            if prev in t and stage in t:
+                deltas[stage].append(t[stage] - t[prev])
+        if "closed" in t and "sent" in t:
+            deltas["total"].append(t["sent"] - t["closed"])
+
+    out: dict[str, dict[str, float]] = {}
+    for stage, values in deltas.items():
+        if values:
+            values.sort()
+            out[stage] = {
+                "n": len(values),
+                "p50": _percentile(values, 0.50),
+                "p99": _percentile(values, 0.99),
+                "max": values[-1],
+            }
+    return out
+
+
+def format_summary(summary: Mapping[str, Mapping[str, float]]) -> str:
+    labels = {
+        "received": "closed -> received (data server)",
+        "aggregated": "received -> aggregated (agg server)",
+        "detected": "aggregated -> detected (analysis server)",
+        "sent": "detected -> sent (notification server)",
+        "total": "closed -> sent (end to end)",
+    }
+    lines = [f"{'stage':<42} {'n':>6} {'p50 s':>9} {'p99 s':>9} {'max s':>9}"]
+    for stage, label in labels.items():
+        s = summary.get(stage)
+        if s is None:
+            lines.append(f"{label:<42} {0:>6} {'-':>9} {'-':>9} {'-':>9}")
+            continue
+        lines.append(f"{label:<42} {int(s['n']):>6} {s['p50']:>9.2f} {s['p99']:>9.2f} {s['max']:>9.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Candle-to-alert latency per pipeline stage.")
+    parser.add_argument("trace_log", nargs="?", type=Path, help="default: <QLIR_ALERTS_DIR>/_traces/latency.jsonl")
+    parser.add_argument("--since-hours", type=float, default=None, help="only alerts sent in the last H hours")
+    args = parser.parse_args(argv)
+
+    path = args.trace_log
+    if path is None:
+        from qlir.servers.alerts.paths import get_traces_dir
+
+        path = get_traces_dir() / "latency.jsonl"
+    since = time.time() - args.since_hours * 3600 if args.since_hours is not None else None
+
+    traces = read_traces(path, since=since)
+    print(f"{len(traces)} traced alerts in {path}")
+    print(format_summary(summarize(traces)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,334 @@
-# This is a first pass to just experiment with 
-# see the chat with chatgpt with a full implementation (core is similr but that are some classes and "config" utils to make things easier)
+"""
+Aggregating function / block timings.
+
+`@telemetry()` and `with span("name"):` no longer print or append a line per
+call. Each call adds its elapsed time to an in-memory per-name summary:
+
+    count, total, self (total minus time spent in nested spans), min, max,
+    a log2 histogram in microseconds (p50 / p99 are read off it), and the
+    total time per calling span.
+
+Summaries are flushed every `flush_interval_s` (checked when a span ends) and
+at exit, through the ``qlir.telemetry`` logger with ``tag="TELEMETRY"``
+(the handler `setup_logging(enable_telemetry=True)` installs) -- the
+console path -- and, per decorated function, appended to ``log_path`` once
+per flush. ``console=True`` additionally prints the summary to stdout, for
+scripts that have no telemetry log handler; servers leave it off. A relative ``log_path`` is rooted at
+`get_telemetry_dir()`, not the working directory. Each flush starts a new
+window.
+
+Sampling: with a sample rate below 1, the decision is taken once per
+top-level span and inherited by everything nested in it, so sampled trees are
+complete and self / parent attribution stays exact. Counts are of sampled
+calls.
+
+Environment: ``QLIR_TELEMETRY_SAMPLE`` (default 1.0),
+``QLIR_TELEMETRY_FLUSH_S`` (default 60), ``QLIR_TELEMETRY_DIR`` (default
+``~/.qlir/telemetry``).
+"""
 
-# qlir/telemetry.py
 from __future__ import annotations
 
+import atexit
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from functools import wraps
+import logging
+import os
 from pathlib import Path
+import random
+import threading
 import time
-from typing import Callable, TypeVar
+from typing import Callable, Iterator, Optional, TypeVar
 
 F = TypeVar("F", bound=Callable)
 
+TELEMETRY_LOGGER = "qlir.telemetry"
+TELEMETRY_TAG = "TELEMETRY"
+
+N_BUCKETS = 40  # bucket i holds [2**(i-1), 2**i) us; bucket 0 is < 1 us
+
+log = logging.getLogger(TELEMETRY_LOGGER)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def get_telemetry_dir() -> Path:
+    raw = os.environ.get("QLIR_TELEMETRY_DIR")
+    return Path(raw or "~/.qlir/telemetry").expanduser()
+
+
+def _bucket(elapsed_s: float) -> int:
+    return min(int(elapsed_s * 1e6).bit_length(), N_BUCKETS - 1)
+
+
+def _fmt_s(s: float) -> str:
+    if s >= 1.0:
+        return f"{s:.3f}s"
+    if s >= 1e-3:
+        return f"{s * 1e3:.2f}ms"
+    return f"{s * 1e6:.0f}us"
+
+
+@dataclass
+class SpanStats:
+    name: str
+    count: int = 0
+    total: float = 0.0
+    self_total: float = 0.0
+    min: float = float("inf")
+    max: float = 0.0
+    buckets: list[int] = field(default_factory=lambda: [0] * N_BUCKETS)
+    parents: dict[Optional[str], float] = field(default_factory=dict)
+
+    def add(self, elapsed: float, self_time: float, parent: Optional[str]) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.self_total += self_time
+        if elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[_bucket(elapsed)] += 1
+        self.parents[parent] = self.parents.get(parent, 0.0) + elapsed
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound (seconds) of the histogram bucket holding quantile `q`."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min((1 << i) * 1e-6, self.max)
+        return self.max
+
+    def summary(self) -> str:
+        parents = ", ".join(
+            f"{p or '<root>'} {_fmt_s(t)}"
+            for p, t in sorted(self.parents.items(), key=lambda kv: -kv[1])
+        )
+        return (
+            f"{self.name} | n={self.count} total={_fmt_s(self.total)} self={_fmt_s(self.self_total)} "
+            f"mean={_fmt_s(self.mean)} min={_fmt_s(self.min)} max={_fmt_s(self.max)} "
+            f"p50<={_fmt_s(self.quantile(0.5))} p99<={_fmt_s(self.quantile(0.99))} | parents: {parents}"
+        )
+
+
+class _Frame:
+    __slots__ = ("name", "start", "child")
+
+    def __init__(self, name: str, start: float):
+        self.name = name
+        self.start = start
+        self.child = 0.0
+
+
+_UNSAMPLED = _Frame("<unsampled>", 0.0)
+
+
+@dataclass(frozen=True)
+class _Sinks:
+    console: bool = False
+    log_path: Optional[Path] = None
+
+
+class Telemetry:
+    """
+    Process-wide timing registry (one per process: see `get_telemetry`).
+
+    `start(name)` / `stop(frame)` bracket one span on the calling thread;
+    `flush()` logs and resets the current window.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: float = 1.0,
+        flush_interval_s: Optional[float] = 60.0,
+        logger: logging.Logger = log,
+    ):
+        self.sample_rate = sample_rate
+        self.flush_interval_s = flush_interval_s
+        self.logger = logger
+        self._stats: dict[str, SpanStats] = {}
+        self._sinks: dict[str, _Sinks] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._window_start = time.perf_counter()
+
+    def _stack(self) -> list[_Frame]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def register(self, name: str, *, console: bool = False, log_path: Optional[Path] = None) -> None:
+        """Also write `name`'s summaries to stdout / `log_path` on flush."""
+        if console or log_path is not None:
+            self._sinks[name] = _Sinks(console, log_path)
+
+    def start(self, name: str) -> _Frame:
+        stack = self._stack()
+        if stack:
+            if stack[-1] is _UNSAMPLED:
+                stack.append(_UNSAMPLED)
+                return _UNSAMPLED
+        elif self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            stack.append(_UNSAMPLED)
+            return _UNSAMPLED
+        frame = _Frame(name, time.perf_counter())
+        stack.append(frame)
+        return frame
+
+    def stop(self, frame: _Frame) -> None:
+        end = time.perf_counter()
+        stack = self._stack()
+        stack.pop()
+        if frame is _UNSAMPLED:
+            return
+
+        elapsed = end - frame.start
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            parent.child += elapsed
+        with self._lock:
+            stats = self._stats.get(frame.name)
+            if stats is None:
+                stats = self._stats[frame.name] = SpanStats(frame.name)
+            stats.add(elapsed, elapsed - frame.child, parent.name if parent else None)
+
+        if self.flush_interval_s is not None and end - self._window_start >= self.flush_interval_s:
+            self.flush(min_window_s=self.flush_interval_s)
+
+    def snapshot(self) -> dict[str, SpanStats]:
+        """Current window, without resetting it."""
+        with self._lock:
+            return {
+                name: SpanStats(
+                    name, s.count, s.total, s.self_total, s.min, s.max, list(s.buckets), dict(s.parents)
+                )
+                for name, s in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+            self._window_start = time.perf_counter()
+
+    def flush(self, *, min_window_s: float = 0.0) -> list[str]:
+        """Log one summary line per span name for the current window, then reset it."""
+        with self._lock:
+            window = time.perf_counter() - self._window_start
+            if window < min_window_s:
+                return []  # another thread just flushed
+            stats, self._stats = self._stats, {}
+            self._window_start += window
+        if not stats:
+            return []
+
+        ordered = sorted(stats.values(), key=lambda s: -s.total)
+        lines = [s.summary() for s in ordered]
+        ts = datetime.now(timezone.utc).isoformat()
+        by_path: dict[Path, list[str]] = {}
+        for s, line in zip(ordered, lines):
+            self.logger.info("%s (window %s)", line, _fmt_s(window), extra={"tag": TELEMETRY_TAG})
+            sinks = self._sinks.get(s.name)
+            if sinks is None:
+                continue
+            if sinks.console:
+                print(f"⏱ {ts} | {line}")
+            if sinks.log_path is not None:
+                by_path.setdefault(sinks.log_path, []).append(f"{ts} | {line}")
+
+        for path, path_lines in by_path.items():
+            if not path.is_absolute():
+                path = get_telemetry_dir() / path
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("a") as f:
+                    f.write("\n".join(path_lines) + "\n")
+            except OSError as e:
+                self.logger.warning("telemetry write to %s failed: %s", path, e)
+        return lines
+
+
+_TELEMETRY = Telemetry(
+    sample_rate=_env_float("QLIR_TELEMETRY_SAMPLE", 1.0),
+    flush_interval_s=_env_float("QLIR_TELEMETRY_FLUSH_S", 60.0),
+)
+
+
+def get_telemetry() -> Telemetry:
+    return _TELEMETRY
+
+
+def set_sample_rate(rate: float) -> None:
+    """Fraction of top-level spans to time (nested spans follow their root)."""
+    if not 0.0 <= rate <= 1.0:
+        raise ValueError(f"sample rate must be in [0, 1], got {rate!r}")
+    _TELEMETRY.sample_rate = rate
+
+
+def set_flush_interval(seconds: Optional[float]) -> None:
+    """Flush every `seconds` (None: only on `flush_telemetry()` / exit)."""
+    _TELEMETRY.flush_interval_s = seconds
+
+
+def flush_telemetry() -> list[str]:
+    return _TELEMETRY.flush()
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block under `name` (nests with decorated functions)."""
+    frame = _TELEMETRY.start(name)
+    try:
+        yield
+    finally:
+        _TELEMETRY.stop(frame)
+
+
 def telemetry(
     *,
+    name: Optional[str] = None,
     log_path: Path | None = None,
-    console: bool = True,
+    console: bool = False,
 ):
+    """
+    Aggregate the wrapped function's timings under `name` (default: its
+    ``__qualname__``). Its summary goes through the telemetry logger and
+    `log_path` on each flush (not a line per call); `console` also prints it
+    to stdout (only for processes without a telemetry log handler).
+    """
+
     def decorator(fn: F) -> F:
+        span_name = name or fn.__qualname__
+        _TELEMETRY.register(span_name, console=console, log_path=log_path)
+        start, stop = _TELEMETRY.start, _TELEMETRY.stop
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            start = time.perf_counter()
+            frame = start(span_name)
             try:
                 return fn(*args, **kwargs)
             finally:
-                elapsed = time.perf_counter() - start
-                ts = datetime.now(timezone.utc).isoformat()
+                stop(frame)
 
-                line = f"{ts} | {fn.__name__} | {elapsed:.6f}s"
-
-                if console:
-                    print(f"⏱ {line}")
+        return wrapper  # type: ignore
+    return decorator
 
-                if log_path:
-                    log_path.parent.mkdir(parents=True, exist_ok=True)
-                    with log_path.open("a") as f:
-                        f.write(line + "\n")
 
-        return wrapper  # type: ignore
-    return decorator
\ No newline at end of file
+atexit.register(flush_telemetry)
@@ -0,0 +1,181 @@
+"""
+Precomputed session calendar: local-time sessions as UTC epoch intervals.
+
+Session filters used to convert every timestamp to the session's timezone
+and compare `.dt.time` objects, once per session. Here each session is
+instead turned into one UTC `[start, end)` interval per local day over the
+span of the data (DST is resolved once per date, by localizing the session
+boundaries), and rows are matched with a binary search on int64 epochs::
+
+    i      = searchsorted(starts, t, side="right") - 1
+    inside = (i >= 0) & (t < ends[i])
+
+This matches the wall-clock comparison exactly as long as no boundary falls
+inside a DST transition (nonexistent or ambiguous local time). For those
+sessions `SessionCalendar.mask` falls back to the wall-clock comparison.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import time
+import logging
+from typing import Dict, Iterable, Mapping, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as _np
+import pandas as _pd
+
+log = logging.getLogger(__name__)
+
+__all__ = ["SessionSpec", "COMMON_SESSIONS", "SessionCalendar"]
+
+_ONE_DAY = _pd.Timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class SessionSpec:
+    """
+    A daily session in local market time, `[start_t, end_t)` in `tz`.
+
+    `start_t >= end_t` means the session wraps past midnight (ends the next
+    local day).
+    """
+    start_t: time
+    end_t: time
+    tz: str
+
+    @property
+    def wraps(self) -> bool:
+        return not self.start_t < self.end_t
+
+
+COMMON_SESSIONS: Dict[str, SessionSpec] = {
+    "ny_cash": SessionSpec(time(9, 30), time(16, 0), "America/New_York"),
+    "ny_premarket": SessionSpec(time(4, 0), time(9, 30), "America/New_York"),
+    "ny_afterhours": SessionSpec(time(16, 0), time(20, 0), "America/New_York"),
+    "ffm": SessionSpec(time(9, 0), time(17, 0), "Europe/Berlin"),
+    "london": SessionSpec(time(8, 0), time(16, 30), "Europe/London"),
+    "tokyo": SessionSpec(time(9, 0), time(15, 0), "Asia/Tokyo"),
+    # NY leg of the London–NY overlap (wider than the cash session)
+    "ny_overlap_leg": SessionSpec(time(8, 0), time(17, 0), "America/New_York"),
+}
+
+
+def _as_utc_ns(ts) -> _np.ndarray:
+    """int64 epoch nanoseconds of a tz-aware (UTC) datetime Series / Index."""
+    idx = _pd.DatetimeIndex(ts)
+    if idx.tz is None:
+        raise ValueError("session lookups need tz-aware (UTC) timestamps")
+    return idx.as_unit("ns").asi8
+
+
+def _time_offset(t: time) -> _pd.Timedelta:
+    return _pd.Timedelta(hours=t.hour, minutes=t.minute, seconds=t.second, microseconds=t.microsecond)
+
+
+class SessionCalendar:
+    """
+    UTC `[start, end)` intervals for a set of sessions over a date range.
+
+    Parameters
+    ----------
+    start, end : timestamp-like
+        UTC span the calendar must cover (inclusive). Local days are padded
+        by one on each side so wraparound and far-east/west sessions that
+        straddle the UTC span are included.
+    sessions : mapping[str, SessionSpec]
+        Sessions to precompute, keyed by name.
+
+    Examples
+    --------
+    >>> cal = SessionCalendar.for_timestamps(df["tz_start"])
+    >>> in_cash = cal.mask("ny_cash", df["tz_start"])
+    """
+
+    def __init__(
+        self,
+        start,
+        end,
+        sessions: Mapping[str, SessionSpec] = COMMON_SESSIONS,
+    ):
+        self.start = _pd.Timestamp(start)
+        self.end = _pd.Timestamp(end)
+        self.sessions = dict(sessions)
+        self._intervals: Dict[str, Tuple[_np.ndarray, _np.ndarray] | None] = {
+            name: self._build(spec) for name, spec in self.sessions.items()
+        }
+
+    @classmethod
+    def for_timestamps(
+        cls,
+        ts,
+        sessions: Mapping[str, SessionSpec] = COMMON_SESSIONS,
+    ) -> "SessionCalendar":
+        """Calendar covering the min/max of a UTC timestamp Series / Index."""
+        ns = _as_utc_ns(ts)
+        if len(ns) == 0:
+            now = _pd.Timestamp(0, tz="UTC")
+            return cls(now, now, sessions)
+        return cls(
+            _pd.Timestamp(int(ns.min()), tz="UTC"),
+            _pd.Timestamp(int(ns.max()), tz="UTC"),
+            sessions,
+        )
+
+    def _build(self, spec: SessionSpec) -> Tuple[_np.ndarray, _np.ndarray] | None:
+        tz = ZoneInfo(spec.tz)
+        first = self.start.tz_convert(tz).normalize().tz_localize(None) - _ONE_DAY
+        last = self.end.tz_convert(tz).normalize().tz_localize(None) + _ONE_DAY
+        days = _pd.date_range(first, last, freq="D")
+
+        end_days = days + _ONE_DAY if spec.wraps else days
+        starts = (days + _time_offset(spec.start_t)).tz_localize(tz, ambiguous="NaT", nonexistent="NaT")
+        ends = (end_days + _time_offset(spec.end_t)).tz_localize(tz, ambiguous="NaT", nonexistent="NaT")
+
+        if starts.hasnans or ends.hasnans:
+            log.debug(f"Session {spec} has a boundary inside a DST transition; using wall-clock matching")
+            return None
+
+        return starts.as_unit("ns").asi8, ends.as_unit("ns").asi8
+
+    def intervals(self, name: str) -> Tuple[_np.ndarray, _np.ndarray] | None:
+        """
+        `(starts_ns, ends_ns)` for session `name`, or None if the session
+        cannot be represented as intervals over this range (DST boundary).
+        """
+        return self._intervals[name]
+
+    def mask(self, name: str, ts) -> _np.ndarray:
+        """
+        Boolean array: which timestamps fall inside session `name`.
+
+        `ts` must be tz-aware and within the calendar's range.
+        """
+        ns = _as_utc_ns(ts)
+        bounds = self._intervals[name]
+        if bounds is None:
+            return _wall_clock_mask(ts, self.sessions[name])
+
+        starts, ends = bounds
+        i = _np.searchsorted(starts, ns, side="right") - 1
+        inside = i >= 0
+        inside[inside] = ns[inside] < ends[i[inside]]
+        return inside
+
+    def masks(self, ts, names: Iterable[str] | None = None) -> Dict[str, _np.ndarray]:
+        """`mask` for several sessions, converting `ts` to epochs once."""
+        names = list(self.sessions) if names is None else list(names)
+        ns = _pd.DatetimeIndex(_as_utc_ns(ts), tz="UTC")
+        return {name: self.mask(name, ns) for name in names}
+
+
+def _wall_clock_mask(ts, spec: SessionSpec) -> _np.ndarray:
+    """Reference implementation: compare local wall-clock times."""
+    local_time = _pd.DatetimeIndex(ts).tz_convert(ZoneInfo(spec.tz)).time
+    local_time = _pd.Series(local_time)
+    if spec.wraps:
+        mask = (local_time >= spec.start_t) | (local_time < spec.end_t)
+    else:
+        mask = (local_time >= spec.start_t) & (local_time < spec.end_t)
+    return mask.to_numpy()
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# keep telemetry summaries written during (and at the end of) the test run out
+# of ~/.qlir; set at import so the atexit flush sees it too
+os.environ.setdefault("QLIR_TELEMETRY_DIR", tempfile.mkdtemp(prefix="qlir-telemetry-"))
+
+# stage cache entries written by tests go to a throwaway directory, not the data root
+os.environ.setdefault("QLIR_STAGE_CACHE_DIR", tempfile.mkdtemp(prefix="qlir-stage-cache-"))
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from qlir.core.counters.multivariate import _consecutive_true
+from qlir.core.counters.streaks import streaks
+from qlir.features.common.running import with_streaks
+
+
+def _frame(n=300, seed=5):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "a": rng.random(n) > 0.3,
+        "b": pd.array(rng.random(n) > 0.5, dtype="boolean"),
+        "rel": rng.choice(["above", "below", "touch"], n),
+        "session": np.repeat(np.arange(n // 50 + 1), 50)[:n],
+    })
+    df.loc[df.index % 17 == 0, "b"] = pd.NA
+    return df
+
+
+def _grouped_reference(mask: pd.Series, groups: pd.Series) -> pd.Series:
+    m = mask.fillna(False).astype(bool)
+    runs = ((~m) | groups.ne(groups.shift(1))).cumsum()
+    return m.astype("int64").groupby(runs).cumsum().astype("Int64")
+
+
+def test_streaks_match_per_column_counters():
+    df = _frame()
+    before = df.copy()
+
+    out = streaks(df, cols=["a", "b"], rel_cols=["rel"], with_ids=True)
+
+    pd.testing.assert_frame_equal(df, before)
+    assert list(out.columns) == ["a__run_true", "a__run_id", "b__run_true", "b__run_id", "rel__streak_id", "rel__streak_len"]
+    for c in ("a", "b"):
+        pd.testing.assert_series_equal(out[f"{c}__run_true"], _consecutive_true(df[c]), check_names=False)
+
+    ref = with_streaks(df, rel_col="rel")
+    np.testing.assert_array_equal(out["rel__streak_id"], ref["streak_id"])
+    np.testing.assert_array_equal(out["rel__streak_len"], ref["streak_len"])
+
+    run_ids = out["a__run_id"]
+    assert run_ids[~df["a"]].isna().all()
+    assert run_ids.dropna().is_monotonic_increasing
+
+
+def test_streaks_restart_per_group():
+    df = _frame()
+
+    out = streaks(df, cols=["a"], rel_cols=["rel"], group_col="session")
+
+    expected = _grouped_reference(df["a"], df["session"])
+    np.testing.assert_array_equal(out["a__run_true"].to_numpy(), expected.to_numpy())
+    ref = with_streaks(df, rel_col="rel", group_col="session")
+    np.testing.assert_array_equal(out["rel__streak_len"], ref["streak_len"])
+
+
+def test_with_streaks_matches_groupby_cumcount():
+    df = _frame()
+    df.loc[df.index % 23 == 0, "rel"] = None  # NaN rows each start a run
+
+    for group_col in (None, "session"):
+        out = with_streaks(df, rel_col="rel", group_col=group_col)
+
+        change = df["rel"].ne(df["rel"].shift(1))
+        if group_col:
+            change |= df[group_col].ne(df[group_col].shift(1))
+        ids = change.cumsum()
+        lens = ids.groupby(ids, sort=False).cumcount().add(1).astype("int32")
+
+        pd.testing.assert_series_equal(out["streak_id"], ids, check_names=False)
+        pd.testing.assert_series_equal(out["streak_len"], lens, check_names=False)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qlir.column_bundles.persistence import persistence_up_legs
+from qlir.core.counters import univariate
+from qlir.core.legs.segments import LegSegments
+from qlir.df.condition_set.assign_group_ids import assign_condition_group_id
+
+
+def _legs(n=300, seed=11):
+    rng = np.random.default_rng(seed)
+    cond = pd.Series(rng.random(n) > 0.4)
+    ids = assign_condition_group_id(pd.DataFrame({"c": cond}), condition_col="c", group_col="leg")[0]["leg"]
+    values = rng.normal(size=n).round(1)  # rounding creates ties
+    values[rng.choice(n, 15, replace=False)] = np.nan
+    return ids, pd.Series(values)
+
+
+def test_primitives_match_groupby():
+    ids, v = _legs()
+    seg = LegSegments.from_ids(ids)
+    g = v.groupby(ids)
+
+    np.testing.assert_array_equal(seg.position(), ids.groupby(ids).cumcount().to_numpy())
+    np.testing.assert_array_equal(seg.length(), g.transform("size").to_numpy())
+    np.testing.assert_array_equal(seg.broadcast(seg.max(v)), g.transform("max").to_numpy())
+    np.testing.assert_array_equal(seg.broadcast(seg.min(v)), g.transform("min").to_numpy())
+    np.testing.assert_array_equal(seg.broadcast(seg.first(v)), g.transform("first").to_numpy())
+    np.testing.assert_array_equal(seg.broadcast(seg.last(v)), g.transform("last").to_numpy())
+
+    rows = seg.argmax(v)
+    valid = g.max().notna().to_numpy()
+    np.testing.assert_array_equal(rows[valid], g.idxmax().dropna().astype(int).to_numpy())
+    assert (rows[~valid] == -1).all()
+
+
+def test_non_contiguous_ids_rejected():
+    with pytest.raises(ValueError, match="not contiguous"):
+        LegSegments.from_ids(pd.Series([1, 1, 2, 1]))
+
+
+def test_persistence_up_legs_matches_groupby():
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({"sign": rng.choice([-1, 0, 1], 200)})
+
+    out = persistence_up_legs(df, "sign", "sma").df
+
+    ref, run_col = univariate.with_running_true(out[["dir_col_up"]], col="dir_col_up")
+    pd.testing.assert_series_equal(out[run_col], ref[run_col])
+    expected = ref[run_col].groupby(out["sma_up_leg_id"]).transform("max")
+    pd.testing.assert_series_equal(out["up_leg_run_len"], expected, check_names=False)
+
+
+def test_distance_to_trendline_per_leg():
+    from qlir.column_bundles.leg_distance import distance_to_trendline_per_leg
+
+    df = pd.DataFrame({
+        "leg": [1, 1, 1, np.nan, 2, 2],
+        "close": [10.0, 12.0, 11.0, 9.0, 8.0, 7.0],
+        "sma": [10.0, 10.0, 10.0, 10.0, 10.0, 10.0],
+    })
+
+    out = distance_to_trendline_per_leg(df, leg_id_col="leg", trendline_col="sma").df
+
+    assert out["is_sma_dist_max_row"].tolist() == [False, True, False, False, False, True]
+    np.testing.assert_allclose(out["sma_dist_max_pct_of_leg"], [1 / 3, 1 / 3, 1 / 3, np.nan, 0.5, 0.5])
+    np.testing.assert_array_equal(out["sma_dist_leg_of_n_bars"], [3, 3, 3, np.nan, 2, 2])
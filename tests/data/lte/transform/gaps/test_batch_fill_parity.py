@@ -0,0 +1,71 @@
+import numpy as _np
+import pandas as _pd
+import pytest
+
+from qlir.data.lte.transform.gaps.blocks import find_missing_blocks
+from qlir.data.lte.transform.gaps.materialization.apply_fill_policy import apply_fill_policy
+from qlir.data.lte.transform.gaps.materialization.markers import ROW_MATERIALIZED_COL
+from qlir.data.lte.transform.gaps.materialization.materialize_missing_rows import (
+    materialize_missing_rows,
+)
+from qlir.data.lte.transform.policy.constant import ConstantFillPolicy
+from qlir.data.lte.transform.policy.windowed_linear import WindowedLinearFillPolicy
+
+
+def _sparse_candles(n: int = 2_000, seed: int = 7) -> _pd.DataFrame:
+    rng = _np.random.default_rng(seed)
+    idx = _pd.date_range("2024-01-01", periods=n, freq="1s", tz="UTC")
+    close = 100 + rng.normal(0, 0.5, n).cumsum()
+    df = _pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.1, n),
+            "high": close + 1.0,
+            "low": close - 1.0,
+            "close": close,
+        },
+        index=idx,
+    )
+    # Drop many small gaps, keeping the first and last rows real.
+    keep = rng.random(n) > 0.3
+    keep[0] = keep[-1] = True
+    return materialize_missing_rows(df[keep], interval_s=1)
+
+
+def _per_block(policy):
+    policy.supports_batch = False
+    return policy
+
+
+@pytest.mark.parametrize(
+    "make_policy",
+    [
+        ConstantFillPolicy,
+        lambda: WindowedLinearFillPolicy(vol_window=3, vol_scale=0.5, min_vol=0.05),
+    ],
+)
+def test_batch_fill_matches_per_block_fill(make_policy):
+    df = _sparse_candles()
+    assert len(find_missing_blocks(df)) > 100
+
+    batch_out = apply_fill_policy(df, interval_s=1, policy=make_policy())
+    block_out = apply_fill_policy(df, interval_s=1, policy=_per_block(make_policy()))
+
+    _pd.testing.assert_frame_equal(batch_out, block_out)
+
+
+def test_find_missing_blocks_edges():
+    idx = _pd.date_range("2024-01-01", periods=7, freq="1min", tz="UTC")
+    df = _pd.DataFrame(
+        {ROW_MATERIALIZED_COL: [True, False, True, True, False, False, True]},
+        index=idx,
+    )
+    blocks = [(b.start_idx, b.end_idx) for b in find_missing_blocks(df)]
+    assert blocks == [(0, 0), (2, 3), (6, 6)]
+
+
+def test_batch_fill_rejects_boundary_block():
+    df = _sparse_candles(50)
+    df.iloc[-1, df.columns.get_loc(ROW_MATERIALIZED_COL)] = True
+
+    with pytest.raises(ValueError, match="dataset boundary"):
+        apply_fill_policy(df, interval_s=1, policy=ConstantFillPolicy())
@@ -0,0 +1,61 @@
+import pytest
+
+pytestmark = pytest.mark.local
+
+import numpy as _np
+import pandas as _pd
+
+from qlir.data.resampling.generate_offset_candles import generate_offset_candles
+
+OHLC_MAP = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def _reference_offset_candles(df, *, period, freq_str, step):
+    """The original copy-shift-resample implementation, kept as an oracle."""
+    out = {}
+    for offset in range(period):
+        shifted = df.copy()
+        shifted.index = shifted.index + step * offset
+        candles = shifted.resample(freq_str).agg(OHLC_MAP).dropna(how="any")
+        candles["candle_freq"] = freq_str
+        candles["offset"] = offset
+        out[f"{freq_str}@{offset}"] = candles
+    return out
+
+
+def _make_1m(n: int = 3_000) -> _pd.DataFrame:
+    rng = _np.random.default_rng(3)
+    idx = _pd.date_range("2024-01-01 23:10", periods=n, freq="1min", tz="UTC", name="timestamp")
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    return _pd.DataFrame(
+        {
+            "open": close - 0.1,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": rng.integers(1, 50, n),
+        },
+        index=idx,
+    )
+
+
+@pytest.mark.parametrize("period", [7, 60])
+def test_offset_candles_match_shift_and_resample(period):
+    df = _make_1m()
+
+    out = generate_offset_candles(df, period=period, unit="minute")
+    expected = _reference_offset_candles(
+        df, period=period, freq_str=f"{period}min", step=_pd.Timedelta(minutes=1)
+    )
+
+    assert list(out) == list(expected)
+    for key, exp in expected.items():
+        _pd.testing.assert_frame_equal(out[key], exp)
+
+
+def test_offset_candles_unknown_key_raises():
+    out = generate_offset_candles(_make_1m(100), period=5)
+    with pytest.raises(KeyError):
+        out["5min@5"]
+    with pytest.raises(KeyError):
+        out["7min@0"]
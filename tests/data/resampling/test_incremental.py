@@ -0,0 +1,68 @@
+import pytest
+
+pytestmark = pytest.mark.local
+
+import numpy as _np
+import pandas as _pd
+
+from qlir.data.resampling.generate_candles import generate_candles_from_1m
+from qlir.data.resampling.incremental import IncrementalResampler
+from qlir.time.timefreq import TimeUnit
+
+
+def _make_1m(n: int) -> _pd.DataFrame:
+    rng = _np.random.default_rng(5)
+    idx = _pd.date_range("2025-01-01 22:37", periods=n, freq="1min", tz="UTC")
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    return _pd.DataFrame(
+        {
+            "tz_start": idx,
+            "open": close - 0.2,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": rng.integers(1, 100, n),
+        }
+    )
+
+
+def test_incremental_matches_full_generation():
+    sizes = [5, 7, 60, 240]
+    df = _make_1m(1_500)
+    full = generate_candles_from_1m(df.copy(), out_unit=TimeUnit.MINUTE, out_agg_candle_sizes=sizes)
+
+    inc = IncrementalResampler(out_unit=TimeUnit.MINUTE, out_candle_sizes=sizes)
+    collected: dict[str, list[_pd.DataFrame]] = {k: [] for k in full}
+
+    rng = _np.random.default_rng(9)
+    pos = 0
+    while pos < len(df):
+        step = int(rng.integers(1, 40))
+        for key, changed in inc.update(df.iloc[pos : pos + step]).items():
+            collected[key].append(changed)
+        pos += step
+
+    assert inc.last_ts == df["tz_start"].iloc[-1]
+
+    for key, expected in full.items():
+        upserted = _pd.concat(collected[key])
+        upserted = upserted[~upserted.index.duplicated(keep="last")]
+        _pd.testing.assert_frame_equal(upserted, expected, check_freq=False)
+
+
+def test_incremental_returns_only_changed_bars():
+    df = _make_1m(30)
+    inc = IncrementalResampler(out_unit=TimeUnit.MINUTE, out_candle_sizes=[5])
+    inc.update(df.iloc[:20])
+
+    # 22:57 → only the open 22:55 bar changes
+    changed = inc.update(df.iloc[20:21])["5min"]
+    assert list(changed.index) == [_pd.Timestamp("2025-01-01 22:55", tz="UTC")]
+
+
+def test_incremental_rejects_out_of_order_candles():
+    df = _make_1m(10)
+    inc = IncrementalResampler(out_unit=TimeUnit.MINUTE, out_candle_sizes=[5])
+    inc.update(df.iloc[5:])
+    with pytest.raises(ValueError):
+        inc.update(df.iloc[:5])
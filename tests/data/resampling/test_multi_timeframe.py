@@ -0,0 +1,55 @@
+import pytest
+
+pytestmark = pytest.mark.local
+
+import numpy as _np
+import pandas as _pd
+
+from qlir.data.resampling.multi_timeframe import can_resample_fast, resample_ohlcv_multi
+
+OHLC_MAP = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def _make_df(n: int, freq: str, start: str, volume_dtype: str) -> _pd.DataFrame:
+    rng = _np.random.default_rng(11)
+    idx = _pd.date_range(start, periods=n, freq=freq, tz="UTC")
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    volume = rng.integers(0, 100, n) if volume_dtype == "int" else rng.random(n) * 10
+    return _pd.DataFrame(
+        {
+            "open": close - 0.25,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": volume,
+        },
+        index=idx,
+    )
+
+
+@pytest.mark.parametrize("volume_dtype", ["int", "float"])
+def test_multi_timeframe_matches_pandas_resample(volume_dtype):
+    # Starts mid-day so origin="start_day" alignment matters for non-divisors (7, 23).
+    df = _make_df(5_000, "1min", "2024-01-01 05:03", volume_dtype)
+    assert can_resample_fast(df)
+
+    sizes = {f"{k}min": k * 60_000_000_000 for k in [2, 3, 5, 7, 15, 23, 60, 240, 1440]}
+    # Smaller than the base cadence: empty buckets get dropped (and upcast OHLC).
+    sizes["30s"] = 30_000_000_000
+
+    fast = resample_ohlcv_multi(df, sizes)
+
+    assert list(fast) == list(sizes)
+    for key in sizes:
+        expected = df.resample(key).agg(OHLC_MAP).dropna(how="any")
+        _pd.testing.assert_frame_equal(
+            fast[key], expected, check_exact=volume_dtype == "int", rtol=1e-12
+        )
+
+
+def test_can_resample_fast_rejects_nans_and_non_utc():
+    df = _make_df(10, "1min", "2024-01-01", "int")
+    assert not can_resample_fast(df.tz_convert("America/New_York"))
+
+    df.iloc[3, df.columns.get_loc("high")] = _np.nan
+    assert not can_resample_fast(df)
@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import numpy as _np
+import pandas as _pd
+import pytest
+
+from qlir.df.filtering.events import after_anchors, around_anchors, before_anchors
+
+
+def _make_df(n: int = 2_000, shuffle: bool = False) -> _pd.DataFrame:
+    ts = _pd.date_range("2024-01-01", periods=n, freq="1min", tz="UTC")
+    df = _pd.DataFrame({"tz_start": ts, "close": _np.arange(n, dtype=float)})
+    if shuffle:
+        df = df.sample(frac=1.0, random_state=1).reset_index(drop=True)
+    return df
+
+
+def _anchors(df: _pd.DataFrame, k: int = 40) -> list:
+    rng = _np.random.default_rng(2)
+    picks = _np.sort(rng.choice(df["tz_start"].to_numpy(), size=k, replace=False))
+    return [_pd.Timestamp(p).to_pydatetime() for p in picks]
+
+
+def _reference(df, windows):
+    """Brute force: one mask per window, first window wins the id."""
+    ts = df["tz_start"]
+    ids = _np.full(len(df), -1)
+    for k, (start, end) in enumerate(windows):
+        hit = ((ts >= start) & (ts <= end)).to_numpy() & (ids < 0)
+        ids[hit] = k
+    return ids
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_around_anchors_matches_brute_force_with_overlaps(shuffle):
+    df = _make_df(shuffle=shuffle)
+    anchors = _anchors(df)
+    before, after = timedelta(minutes=30), timedelta(minutes=45)  # windows overlap
+
+    out = around_anchors(df, anchors, before=before, after=after, add_event_id=True)
+
+    ids = _reference(df, [(a - before, a + after) for a in anchors])
+    expected = df[ids >= 0]
+    assert list(out.index) == list(expected.index)
+    assert list(out["event_id"]) == list(ids[ids >= 0])
+    assert list(out["event_label"]) == [f"event_{i}" for i in ids[ids >= 0]]
+
+
+def test_before_and_after_anchors_match_brute_force():
+    df = _make_df()
+    anchors = _anchors(df)
+    delta = timedelta(minutes=20)
+
+    out_before = before_anchors(df, anchors, before=delta, add_event_id=True)
+    ids = _reference(df, [(a - delta, a) for a in anchors])
+    assert list(out_before.index) == list(df.index[ids >= 0])
+    assert list(out_before["event_id"]) == list(ids[ids >= 0])
+
+    out_after = after_anchors(df, anchors, after=delta)
+    ids = _reference(df, [(a, a + delta) for a in anchors])
+    assert list(out_after.index) == list(df.index[ids >= 0])
+    assert "event_id" not in out_after.columns
+
+
+def test_first_window_wins_for_unordered_nested_windows():
+    df = _make_df()
+    anchors = _anchors(df, k=60)
+    _np.random.default_rng(3).shuffle(anchors)  # window order != time order
+    before, after = timedelta(minutes=90), timedelta(minutes=10)
+
+    out = around_anchors(df, anchors, before=before, after=after, add_event_id=True)
+
+    ids = _reference(df, [(a - before, a + after) for a in anchors])
+    assert list(out.index) == list(df.index[ids >= 0])
+    assert list(out["event_id"]) == list(ids[ids >= 0])
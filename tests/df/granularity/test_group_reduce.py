@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qlir.df.granularity.metric_spec import Aggregation, MetricSpec
+from qlir.df.granularity.to_row_per_event.to_row_per_event import to_row_per_event
+from qlir.df.granularity.to_row_per_time_chunk.time_chunk import (
+    _chunk_metrics_grouped,
+    to_row_per_time_chunk,
+)
+from qlir.time.timefreq import TimeFreq
+from qlir.time.timeunit import TimeUnit
+
+
+def _frame(n=900, seed=7):
+    rng = np.random.default_rng(seed)
+    f = rng.normal(size=n)
+    f[rng.choice(n, 20, replace=False)] = np.nan
+    ts = pd.Series(pd.date_range("2024-01-01 03:17", periods=n, freq="37s", tz="UTC"))
+    # scattered missing rows plus one multi-hour hole (empty chunks)
+    drop = np.union1d(rng.choice(n, 60, replace=False), np.arange(100, 350))
+    ts = ts.drop(drop).reset_index(drop=True)
+    n = len(ts)
+    return pd.DataFrame({
+        "ts": ts,
+        "i": rng.integers(-50, 50, n),
+        "f": f[:n],
+        "b": rng.random(n) > 0.5,
+        "nb": pd.array(rng.random(n) > 0.5, dtype="boolean"),
+        "s": rng.choice(["x", "y", "z"], n),
+    })
+
+
+_METRICS = [
+    MetricSpec("i", agg) for agg in (Aggregation.SUM, Aggregation.MIN, Aggregation.MAX, Aggregation.FIRST, Aggregation.LAST, Aggregation.MEDIAN)
+] + [
+    MetricSpec("f", agg) for agg in (Aggregation.SUM, Aggregation.MIN, Aggregation.MAX, Aggregation.FIRST, Aggregation.LAST)
+] + [
+    MetricSpec("b", Aggregation.COUNT_TRUE),
+    MetricSpec("b", Aggregation.MAX, out="any_b"),
+    MetricSpec("nb", Aggregation.COUNT_TRUE),
+    MetricSpec("ts", Aggregation.MIN, out="start"),
+    MetricSpec("s", Aggregation.LAST),
+]
+
+
+def _reference_events(df, event_id_col, metrics):
+    # the original one-groupby-reduction-per-metric implementation
+    grouped = df.groupby(event_id_col, sort=False)
+    parts = [grouped.size().rename("src_row_count")]
+    for m in metrics:
+        how = "sum" if m.agg == Aggregation.COUNT_TRUE else m.agg.value
+        parts.append(getattr(grouped[m.col], how)().rename(m.resolve_out_name()))
+    return pd.concat(parts, axis=1).reset_index()
+
+
+@pytest.mark.parametrize("layout", ["contiguous", "shuffled", "with_na"])
+def test_to_row_per_event_matches_groupby(layout):
+    df = _frame()
+    ids = np.repeat(np.arange(len(df) // 9 + 1), 9)[: len(df)]
+    if layout == "shuffled":
+        ids = np.random.default_rng(0).permutation(ids)
+    df["event_id"] = ids.astype("float64")
+    if layout == "with_na":
+        df.loc[df.index % 5 == 0, "event_id"] = np.nan
+
+    out = to_row_per_event(df, event_id_col="event_id", metrics=_METRICS, include_src_row_count=True)
+
+    pd.testing.assert_frame_equal(out, _reference_events(df, "event_id", _METRICS), check_dtype=True)
+
+
+@pytest.mark.parametrize("include_all", [False, True])
+@pytest.mark.parametrize("freq", [TimeFreq(5, TimeUnit.MINUTE), TimeFreq(1, TimeUnit.HOUR)])
+def test_to_row_per_time_chunk_matches_grouper(freq, include_all):
+    df = _frame()
+    metrics = [m for m in _METRICS if m.col != "ts"]
+
+    out = to_row_per_time_chunk(df, ts_col="ts", freq=freq, metrics=metrics, include_all_wall_clock_chunks=include_all)
+
+    ref = _chunk_metrics_grouped(
+        df, ts_col="ts", pandas_freq=freq.as_pandas_str, metrics=metrics, include_all_wall_clock_chunks=include_all
+    )
+    for m in metrics:
+        if m.agg == Aggregation.COUNT_TRUE:
+            ref[m.resolve_out_name()] = ref[m.resolve_out_name()].fillna(0).astype(int)
+    ref = ref.reset_index()
+
+    pd.testing.assert_frame_equal(out, ref, check_dtype=True)
+    assert out["src_row_count"].sum() == len(df)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from qlir.df.condition_set.assign_group_ids import assign_condition_group_id
+from qlir.df.granularity.summarize_condition_path import (
+    summarize_condition_path,
+    summarize_condition_paths,
+)
+
+
+def _frame(n=500, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(size=n).cumsum()
+    df = pd.DataFrame({
+        "tz_start": pd.date_range("2024-01-01", periods=n, freq="min", tz="UTC"),
+        "open": close + rng.normal(size=n),
+        "high": close + 2,
+        "low": close - 2,
+        "close": close,
+        "cond": rng.random(n) > 0.45,
+    })
+    df.loc[rng.choice(n, 10, replace=False), "high"] = np.nan
+    return df
+
+
+def _reference(df, group_col):
+    # the original per-group apply
+    return (
+        df.dropna(subset=[group_col])
+        .groupby(group_col, sort=True)[list(df.columns)]
+        .apply(summarize_condition_path)
+        .reset_index()
+    )
+
+
+def test_matches_groupby_apply():
+    df = _frame()
+    before = df.copy()
+
+    out = summarize_condition_paths(df, condition_col="cond", group_col="g")
+
+    pd.testing.assert_frame_equal(df, before)
+    expected = _reference(assign_condition_group_id(df.copy(), condition_col="cond", group_col="g")[0], "g")
+    pd.testing.assert_frame_equal(out, expected)
+    assert out["bars"].sum() == df["cond"].sum()
+
+
+def test_preassigned_unsorted_group_ids():
+    df = _frame(n=200)
+    ids = pd.Series(np.random.default_rng(1).integers(0, 12, len(df)), dtype="float64")
+    ids[::7] = np.nan
+    df["leg_id"] = ids
+
+    out = summarize_condition_paths(df, condition_col="cond", group_col="leg_id")
+
+    pd.testing.assert_frame_equal(out, _reference(df, "leg_id"), check_dtype=False)
+
+
+def test_no_paths():
+    df = _frame(n=20)
+    df["cond"] = False
+
+    out = summarize_condition_paths(df, condition_col="cond")
+
+    assert out.empty
+    assert list(out.columns)[:4] == ["condition_group_id", "start_time", "end_time", "bars"]
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from qlir.indicators.boll import with_bollinger
+from qlir.indicators.grid import bollinger_grid, macd_grid, rsi_grid, sma_grid
+from qlir.indicators.macd import with_macd
+from qlir.indicators.rsi import rsi
+from qlir.indicators.sma import sma
+
+
+def _prices(n=500, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    close[[10, 11, 250]] = np.nan
+    return pd.DataFrame({"close": close})
+
+
+def test_sma_grid_matches_single_window():
+    df = _prices()
+    out = sma_grid(df, col="close", windows=[1, 5, 20, 200]).df
+    for w in (1, 5, 20, 200):
+        single = sma(df.copy(), col="close", window=w).df
+        np.testing.assert_allclose(out[f"close_sma_{w}"], single[f"close_sma_{w}"], rtol=1e-9, equal_nan=True)
+
+
+def test_rsi_grid_matches_single_period():
+    df = _prices()
+    out = rsi_grid(df, periods=[7, 14]).df
+    for p in (7, 14):
+        single = rsi(df, period=p, out_col=f"rsi_{p}", in_place=False)
+        np.testing.assert_allclose(out[f"rsi_{p}"], single[f"rsi_{p}"], equal_nan=True)
+
+
+def test_bollinger_grid_matches_with_bollinger():
+    df = _prices()
+    out = bollinger_grid(df, periods=[20], ks=[1.5, 2]).df
+    single = with_bollinger(df, period=20, k=2.0, in_place=False).df
+    np.testing.assert_allclose(out["boll_mid_20"], single["boll_mid"], rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(out["boll_upper_20_2"], single["boll_upper"], rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(out["boll_lower_20_2"], single["boll_lower"], rtol=1e-9, equal_nan=True)
+    assert "boll_upper_20_1.5" in out.columns
+
+
+def test_macd_grid_matches_with_macd():
+    df = _prices().ffill()
+    out = macd_grid(df, params=[(12, 26, 9), (5, 26, 9)]).df
+    single = with_macd(df, fast=12, slow=26, signal=9, in_place=False)
+    np.testing.assert_allclose(out["macd_12_26_9"], single["macd"])
+    np.testing.assert_allclose(out["macd_signal_12_26_9"], single["macd_signal"])
+    np.testing.assert_allclose(out["macd_hist_12_26_9"], single["macd_hist"])
+
+
+def test_grid_adds_columns_without_touching_input():
+    df = _prices()
+    res = sma_grid(df, col="close", windows=range(2, 12))
+    assert list(df.columns) == ["close"]
+    assert res.df.columns.tolist() == ["close"] + [f"close_sma_{w}" for w in range(2, 12)]
+    assert res.new_cols.get_column("close_sma_5") == "close_sma_5"
@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+from qlir.core.registries.columns.registry import ColRegistry
+from qlir.core.types.annotated_df import AnnotatedDF
+from qlir.io.stage_cache import StageCache, cached_stage, frame_fingerprint
+
+
+def _frame(n=100):
+    idx = pd.date_range("2024-01-01", periods=n, freq="min", tz="UTC")
+    return pd.DataFrame({"close": np.arange(n, dtype=float)}, index=idx)
+
+
+def test_fingerprint_tracks_content():
+    df = _frame()
+    assert frame_fingerprint(df) == frame_fingerprint(df.copy())
+    changed = df.copy()
+    changed.iloc[5, 0] = -1.0
+    assert frame_fingerprint(df) != frame_fingerprint(changed)
+    assert frame_fingerprint(df) != frame_fingerprint(df.rename(columns={"close": "c"}))
+
+
+def test_cached_stage_round_trips_annotated_df(tmp_path):
+    cache = StageCache(tmp_path)
+    calls = []
+
+    @cached_stage(cache)
+    def add_sma(df, *, window):
+        calls.append(window)
+        out = df.copy()
+        out[f"sma_{window}"] = out["close"].rolling(window).mean()
+        cols = ColRegistry()
+        cols.add(key="sma_col", column=f"sma_{window}")
+        return AnnotatedDF(df=out, new_cols=cols, label="add_sma")
+
+    df = _frame()
+    first = add_sma(df, window=5)
+    second = add_sma(df.copy(), window=5)
+    add_sma(df, window=6)
+
+    assert calls == [5, 6]
+    pd.testing.assert_frame_equal(first.df, second.df, check_freq=False)
+    assert second.new_cols.get_column("sma_col") == "sma_5"
+    assert second.label == "add_sma"
+
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = StageCache(tmp_path, max_bytes=10**9)
+    for i in range(3):
+        cache.put(f"k{i}", _frame(1_000) + i)
+    entry = cache.size_bytes() // 3
+
+    cache.get("k0")  # most recently used now
+    cache.max_bytes = entry * 2 + entry // 2
+    cache.put("k3", _frame(1_000) + 3)
+
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None
+    assert cache.get("k3") is not None
+
+
+def test_uncacheable_argument_runs_uncached(tmp_path):
+    calls = []
+
+    @cached_stage(StageCache(tmp_path))
+    def stage(df, *, helper):
+        calls.append(1)
+        return df
+
+    helper = object()
+    stage(_frame(), helper=helper)
+    stage(_frame(), helper=helper)
+    assert len(calls) == 2
+
+
+def test_lambdas_and_closures_are_not_shared_entries(tmp_path):
+    @cached_stage(StageCache(tmp_path))
+    def apply(df, *, fn):
+        return fn(df)
+
+    df = pd.DataFrame({"a": [1.0, 2.0]})
+    assert apply(df, fn=lambda d: d + 1)["a"].tolist() == [2.0, 3.0]
+    assert apply(df, fn=lambda d: d * 100)["a"].tolist() == [100.0, 200.0]
+
+    def make(k):
+        return lambda d: d * k
+
+    assert apply(df, fn=make(2))["a"].tolist() == [2.0, 4.0]
+    assert apply(df, fn=make(3))["a"].tolist() == [3.0, 6.0]
+
+
+def test_unhashable_cells_run_uncached(tmp_path):
+    calls = []
+
+    @cached_stage(StageCache(tmp_path))
+    def stage(df):
+        calls.append(1)
+        return df[["a"]]
+
+    df = pd.DataFrame({"a": [1.0, 2.0], "tags": [["x"], {"y": 1}]})
+    stage(df)
+    stage(df)
+    assert len(calls) == 2
+
+
+def test_version_is_part_of_the_key(tmp_path):
+    cache = StageCache(tmp_path)
+    calls = []
+
+    def stage(df):
+        calls.append(1)
+        return df * 2
+
+    v1 = cached_stage(cache, version=1)(stage)
+    v1(_frame())
+    v1(_frame())
+    cached_stage(cache, version=2)(stage)(_frame())
+    assert len(calls) == 2
+
+
+def test_macd_pyramid_annotation_is_served_from_cache(tmp_path, monkeypatch):
+    from qlir.io import stage_cache
+    from qlir.servers.analysis_server.analyses.macd import macd_initial
+
+    # the pyramid annotation itself is swapped for a stand-in: only the wiring is under test
+    calls = []
+
+    def annotate(df, *, hist_col, group_col):
+        calls.append(1)
+        cols = ColRegistry()
+        cols.add(key="pyr_len", column="pyr_len")
+        return AnnotatedDF(df=df.assign(pyr_len=df.groupby(group_col).cumcount()), new_cols=cols, label="pyr")
+
+    monkeypatch.setattr(macd_initial, "macd_full_pyramidal_annotation", annotate)
+    monkeypatch.setattr(stage_cache, "_default_cache", StageCache(tmp_path))
+    rng = np.random.default_rng(0)
+    df = _frame(500)
+    df["close"] = 100 + rng.standard_normal(500).cumsum()
+    before = df.copy()
+
+    first = macd_initial.df_macd_full_pyramidal_annotation(df)
+    pd.testing.assert_frame_equal(df, before)  # input untouched, so a hit behaves the same
+    second = macd_initial.df_macd_full_pyramidal_annotation(df)
+
+    assert calls == [1]
+    assert len(list(tmp_path.glob("*.parquet"))) == 1
+    pd.testing.assert_frame_equal(first.df, second.df, check_freq=False)
+    assert set(second.new_cols.keys()) == set(first.new_cols.keys())
@@ -91,3 +91,55 @@ def test_union_parquet_fast_path(tmp_path: Path):
     # turn DataFrame into set of tuples
     rows = {tuple(x) for x in result[["id", "val"]].to_numpy().tolist()}
     assert rows == {(1, 10), (2, 20)}
+
+
+def _write_minutes(data_dir: Path):
+    data_dir.mkdir()
+    ts = _pd.date_range("2024-01-01", periods=6, freq="min", tz="UTC")
+    full = _pd.DataFrame({"tz_start": ts, "close": range(6), "volume": range(10, 16)})
+    full.iloc[:3].to_parquet(data_dir / "part1.parquet", index=False)
+    full.iloc[3:].to_parquet(data_dir / "part2.parquet", index=False)
+    return ts
+
+
+def test_union_projects_and_filters_time_range(tmp_path: Path):
+    data_dir = tmp_path / "parquet"
+    ts = _write_minutes(data_dir)
+
+    result = union_file_datasets(
+        data_dir, columns=["tz_start", "close"], time_col="tz_start", start=ts[1], end="2024-01-01 00:04"
+    )
+
+    assert result.columns.tolist() == ["tz_start", "close"]
+    assert result["close"].tolist() == [1, 2, 3]
+
+
+def test_scan_yields_bounded_batches(tmp_path: Path):
+    from qlir.io.union_files import scan_file_datasets
+
+    data_dir = tmp_path / "parquet"
+    _write_minutes(data_dir)
+
+    batches = list(scan_file_datasets(data_dir, columns=["close"], batch_size=2))
+
+    assert all(b.num_rows <= 2 for b in batches)
+    assert all(b.schema.names == ["close"] for b in batches)
+    assert sorted(v for b in batches for v in b.column("close").to_pylist()) == list(range(6))
+
+
+def test_csv_keeps_pandas_typing(tmp_path: Path):
+    data_dir = tmp_path / "csvs"
+    data_dir.mkdir()
+    (data_dir / "part1.csv").write_text(
+        "tz_start,close\n2024-01-01T00:00:00Z,1\n2024-01-01T00:01:00Z,2\n2024-01-01T00:02:00Z,3\n"
+    )
+
+    result = union_file_datasets(data_dir)
+    expected = _pd.read_csv(data_dir / "part1.csv")
+    assert result.dtypes.to_dict() == expected.dtypes.to_dict()
+    assert result["tz_start"].tolist() == expected["tz_start"].tolist()
+
+    # the time range is still applied to timestamp strings
+    ranged = union_file_datasets(data_dir, time_col="tz_start", start="2024-01-01 00:01", end=None)
+    assert ranged["close"].tolist() == [2, 3]
+    assert ranged["tz_start"].dtype == expected["tz_start"].dtype
@@ -0,0 +1,40 @@
+import logging
+
+import numpy as _np
+import pandas as _pd
+
+from qlir.logging import logdf as logdf_mod
+from qlir.logging.logdf import logdf
+
+
+def _df(n: int = 50) -> _pd.DataFrame:
+    return _pd.DataFrame({"a": _np.arange(n, dtype=float), "b": _np.arange(n) % 2 == 0})
+
+
+def test_logdf_disabled_level_does_not_render(caplog, monkeypatch):
+    def _boom(*args, **kwargs):
+        raise AssertionError("_fmt_df must not run for a disabled level")
+
+    monkeypatch.setattr(logdf_mod, "_fmt_df", _boom)
+    with caplog.at_level(logging.INFO, logger="qlir.logdf"):
+        logdf(_df(), level="debug")
+    assert caplog.records == []
+
+
+def test_logdf_tail_rows_and_col_filter(caplog):
+    with caplog.at_level(logging.INFO, logger="qlir.logdf"):
+        logdf(_df(), from_row_idx=-2, max_rows=2, cols_filter_all_dfs=["a"], display_as_int=True)
+
+    msg = caplog.records[-1].getMessage()
+    assert "Showing 1 of 2 columns" in msg
+    assert "showing rows 48:50 of 50" in msg
+    assert " 49 " in msg
+    assert " 47 " not in msg
+
+
+def test_logdf_rate_limit_suppresses_repeat_calls(caplog):
+    logdf_mod._LAST_EMIT_AT.clear()
+    with caplog.at_level(logging.INFO, logger="qlir.logdf"):
+        for _ in range(5):
+            logdf(_df(), max_rows=1, rate_limit_s=60, rate_limit_key="loop")
+    assert len(caplog.records) == 1
@@ -0,0 +1,98 @@
+from qlir.servers.alerts import journal as journal_mod
+from qlir.servers.alerts.journal import AlertJournal, Offset, open_journal, summarize
+
+
+def test_append_read_and_resume(tmp_path):
+    j = AlertJournal(tmp_path)
+    ids = j.append([{"kind": "alert", "n": i} for i in range(3)])
+
+    entries = list(j.read())
+    assert [e.id for e in entries] == ids
+    assert [e.record["n"] for e in entries] == [0, 1, 2]
+
+    j.commit(entries[1].next_offset)
+    assert [e.record["n"] for e in j.read(j.committed_offset())] == [2]
+
+
+def test_segments_rotate_and_compact(tmp_path):
+    j = AlertJournal(tmp_path, segment_bytes=64)
+    for i in range(6):
+        j.append([{"kind": "alert", "n": i, "pad": "x" * 40}])
+
+    assert len(j.segments()) == 6
+    assert [e.record["n"] for e in j.read()] == list(range(6))
+
+    end = j.end_offset()
+    assert j.compact(end, keep=1) == [1, 2, 3, 4]
+    assert j.segments() == [5, 6]
+
+
+def test_torn_tail_is_ignored_then_truncated(tmp_path):
+    j = AlertJournal(tmp_path)
+    j.append([{"kind": "alert", "n": 0}])
+    seg = tmp_path / "00000001.log"
+    with open(seg, "ab") as f:
+        f.write(b"\x50\x00\x00\x00garbage")  # crash mid-frame
+
+    assert [e.record["n"] for e in j.read()] == [0]
+
+    AlertJournal(tmp_path).append([{"kind": "alert", "n": 1}])
+    assert [e.record["n"] for e in j.read()] == [0, 1]
+    assert j.end_offset() > Offset(1, 0)
+
+
+def test_failed_records_survive_compaction(tmp_path):
+    j = AlertJournal(tmp_path, segment_bytes=64)
+    (alert_id,) = j.append([{"kind": "alert", "alert": {"ts": 1}, "pad": "x" * 40}])
+    (failed_id,) = j.append([{"kind": "failed", "ref": alert_id, "retries": 3, "error": "boom", "alert": {"ts": 1}}])
+    for i in range(3):
+        j.append([{"kind": "alert", "n": i, "pad": "x" * 40}])
+
+    j.commit(j.end_offset())
+    assert j.compact(j.end_offset(), keep=1)
+    assert all(e.record["kind"] == "alert" for e in j.read())
+
+    (rec,) = j.failed()
+    assert rec["id"] == failed_id and rec["ref"] == alert_id and rec["error"] == "boom"
+
+
+def test_summarize_counts_after_committed_offset(tmp_path):
+    j = AlertJournal(tmp_path)
+    j.append([{"kind": "alert", "n": 0}])
+    j.commit(j.end_offset())
+    j.append([
+        {"kind": "alert", "n": 1},
+        {"kind": "retry", "ref": "1:0", "retries": 1, "not_before": 0},
+        {"kind": "retry", "ref": "1:0", "retries": 1, "not_before": 2**40},
+        {"kind": "failed", "ref": "1:0", "retries": 3, "error": "x"},
+    ])
+
+    s = summarize(j)
+    assert s["committed"] == str(j.committed_offset())
+    assert (s["pending"], s["retry_waiting"], s["failed_total"]) == (2, 1, 1)
+
+
+def test_append_checks_only_the_tail(tmp_path, monkeypatch):
+    AlertJournal(tmp_path).append([{"kind": "alert", "n": i, "pad": "x" * 100} for i in range(200)])
+    scanned: list[int] = []
+    real_scan = journal_mod._scan
+    monkeypatch.setattr(journal_mod, "_scan", lambda buf, start=0: (scanned.append(len(buf)), real_scan(buf, start))[1])
+
+    # fresh instances (another process) start from the persisted tail
+    AlertJournal(tmp_path).append([{"kind": "alert", "n": 200}])
+    j = AlertJournal(tmp_path)
+    j.append([{"kind": "alert", "n": 201}])
+    assert scanned == []
+
+    # bytes appended by someone else since are the only ones checked
+    with open(tmp_path / "00000001.log", "ab") as f:
+        f.write(journal_mod._frame({"kind": "alert", "n": 202}))
+    (tmp_path / ".tail").unlink()
+    j.append([{"kind": "alert", "n": 203}])
+    assert scanned and max(scanned) < 100
+    assert [e.record["n"] for e in j.read()][-4:] == [200, 201, 202, 203]
+
+
+def test_open_journal_is_shared_per_directory(tmp_path):
+    assert open_journal(tmp_path / "a") is open_journal(tmp_path / "a")
+    assert open_journal(tmp_path / "a") is not open_journal(tmp_path / "b")
@@ -0,0 +1,144 @@
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from qlir.servers.logging.queued import (
+    BoundedQueueHandler,
+    make_queued_handler,
+    stop_queued_logging,
+)
+
+
+class GatedHandler(logging.Handler):
+    """Sink that waits for `gate` before each write and records the formatting thread."""
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__()
+        self.delay = delay
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lines: list[str] = []
+        self.threads: set[str] = set()
+
+    def emit(self, record):
+        self.gate.wait()
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def logger():
+    lg = logging.getLogger("qlir.test_queued")
+    lg.setLevel(logging.INFO)
+    lg.propagate = False
+    yield lg
+    lg.handlers.clear()
+    stop_queued_logging()
+
+
+def test_slow_sink_does_not_block_caller(logger):
+    sink = GatedHandler(delay=0.01)
+    logger.addHandler(make_queued_handler([sink]))
+
+    t0 = time.perf_counter()
+    for i in range(20):
+        logger.info("record %d", i)
+    assert time.perf_counter() - t0 < 0.05  # vs 0.2 s synchronously
+
+    stop_queued_logging()  # drains
+    assert sink.lines == [f"record {i}" for i in range(20)]
+    assert threading.current_thread().name not in sink.threads
+
+
+def test_drop_overflow_counts_and_reports(logger):
+    sink = GatedHandler()
+    sink.gate.clear()
+    handler = make_queued_handler([sink], queue_size=2, overflow="drop")
+    logger.addHandler(handler)
+
+    for i in range(10):
+        logger.info("record %d", i)
+    assert handler.dropped >= 7
+
+    sink.gate.set()
+    time.sleep(0.05)
+    logger.info("after")
+    stop_queued_logging()
+
+    assert any("dropped" in line for line in sink.lines)
+    assert sink.lines[-1] == "after"
+
+
+class _SlowQueue(queue.Queue):
+    """Queue whose puts yield to other threads first (widens enqueue races)."""
+
+    def put_nowait(self, item):
+        time.sleep(0.01)
+        super().put_nowait(item)
+
+
+def test_concurrent_callers_report_pending_drops_once():
+    q = _SlowQueue(maxsize=100)
+    handler = BoundedQueueHandler(q, overflow="drop")
+    handler.dropped = handler._pending_drops = 5
+
+    record = logging.LogRecord("x", logging.INFO, __file__, 0, "msg", None, None)
+    threads = [threading.Thread(target=handler.enqueue, args=(record,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    items = [q.get_nowait() for _ in range(q.qsize())]
+    notices = [r.args[0] for r in items if r.msg.startswith("log queue full")]
+    assert notices == [5]
+    assert handler._pending_drops == 0
+
+
+def test_block_overflow_loses_nothing(logger):
+    sink = GatedHandler(delay=0.001)
+    handler = make_queued_handler([sink], queue_size=2, overflow="block")
+    logger.addHandler(handler)
+
+    for i in range(30):
+        logger.info("record %d", i)
+    stop_queued_logging()
+
+    assert handler.dropped == 0
+    assert len(sink.lines) == 30
+
+
+def test_exception_text_survives_the_queue(logger):
+    sink = GatedHandler()
+    logger.addHandler(make_queued_handler([sink]))
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("boom")
+    stop_queued_logging()
+
+    assert "ZeroDivisionError" in sink.lines[0]
+
+
+def test_telemetry_exit_flush_reaches_queued_handlers(tmp_path):
+    # telemetry imported first: its atexit hook runs after stop_queued_logging
+    script = (
+        "from qlir.telemetry.telemetry import telemetry\n"
+        "from qlir.servers.logging.logging_setup import LogProfile, setup_logging\n"
+        "setup_logging(LogProfile.ALL_INFO, enable_telemetry=True, queued=True)\n"
+        "@telemetry(name='work', console=False)\n"
+        "def work():\n"
+        "    pass\n"
+        "work()\n"
+    )
+    env = {**os.environ, "QLIR_TELEMETRY_DIR": str(tmp_path)}
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert "work | n=1" in out.stderr
@@ -0,0 +1,303 @@
+import json
+from pathlib import Path
+import threading
+import time
+
+from qlir.servers.alerts.journal import AlertJournal
+from qlir.servers.notification_server.adapters.base import NotificationAdapter
+from qlir.servers.notification_server.delivery import MAX_RETRIES, DeliveryEngine, backoff_delay
+
+
+class RecordingAdapter(NotificationAdapter):
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.sent: list = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def destination(self) -> str:
+        return self.name
+
+    def send(self, data):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("down")
+            self.sent.append(data)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _alerts(root: Path, outbox: str, n: int) -> Path:
+    d = root / outbox
+    d.mkdir(parents=True, exist_ok=True)
+    for i in range(n):
+        (d / f"{i:04d}.json").write_text(json.dumps({"ts": i, "data": {"i": i}}))
+    return d
+
+
+def _engine(root: Path, routes, **kw) -> DeliveryEngine:
+    return DeliveryEngine(routes, journal_root=root / "_journal", **kw)
+
+
+def _kinds(root: Path, outbox: str) -> list[str]:
+    return [e.record["kind"] for e in AlertJournal(root / "_journal" / outbox).read()]
+
+
+def test_outboxes_run_concurrently_and_keep_order(tmp_path):
+    a, b = RecordingAdapter("a", delay=0.05), RecordingAdapter("b", delay=0.05)
+    dirs = [_alerts(tmp_path, "out-a", 4), _alerts(tmp_path, "out-b", 4)]
+    engine = _engine(tmp_path, {"out-a": [a], "out-b": [b]})
+
+    t0 = time.perf_counter()
+    sent = engine.run_once(dirs)
+    elapsed = time.perf_counter() - t0
+    engine.close()
+
+    assert sent == 8
+    assert [d["i"] for d in a.sent] == [0, 1, 2, 3]
+    assert [d["i"] for d in b.sent] == [0, 1, 2, 3]
+    assert elapsed < 8 * 0.05  # not serial
+    assert not list(dirs[0].iterdir())  # files bridged into the journal
+    assert _kinds(tmp_path, "out-a") == ["alert"] * 4
+
+
+def test_per_destination_limit_across_outboxes(tmp_path):
+    shared = RecordingAdapter("bot", delay=0.02)
+    dirs = [_alerts(tmp_path, f"out-{i}", 3) for i in range(4)]
+    engine = _engine(tmp_path, {d.name: [shared] for d in dirs}, per_destination=2)
+
+    assert engine.run_once(dirs) == 12
+    engine.close()
+    assert shared.max_in_flight == 2
+
+
+def test_failure_retries_then_records_failed(tmp_path):
+    ok, broken = RecordingAdapter("ok"), RecordingAdapter("broken", fail=True)
+    d = _alerts(tmp_path, "out", 1)
+    engine = _engine(tmp_path, {"out": [ok, broken]})
+
+    for _ in range(MAX_RETRIES):
+        assert engine.run_once([d]) == 0
+    engine.close()
+
+    assert not list(d.iterdir())
+    assert _kinds(tmp_path, "out") == ["alert", "retry", "retry", "failed"]
+    assert len(ok.sent) == 1  # the healthy adapter is not re-sent
+    assert len(broken.sent) == 0
+
+
+def test_failed_alert_waits_for_retry_delay(tmp_path):
+    broken = RecordingAdapter("broken", fail=True)
+    d = _alerts(tmp_path, "out", 1)
+    engine = _engine(tmp_path, {"out": [broken]}, retry_delay=60.0)
+
+    engine.run_once([d])
+    engine.run_once([d])  # e.g. woken by the retry record append
+    engine.close()
+
+    assert _kinds(tmp_path, "out") == ["alert", "retry"]
+    assert len(broken.sent) == 0
+
+
+def test_backoff_doubles_with_jitter_and_cap():
+    for attempt, d in [(1, 1.0), (2, 2.0), (3, 4.0), (10, 30.0)]:
+        delays = [backoff_delay(attempt, 1.0, 30.0) for _ in range(50)]
+        assert all(d / 2 <= x <= d for x in delays)
+        assert len(set(delays)) > 1
+
+
+def test_retry_targets_only_the_failed_adapter(tmp_path):
+    ok, broken = RecordingAdapter("ok"), RecordingAdapter("broken", fail=True)
+    d = _alerts(tmp_path, "out", 1)
+    engine = _engine(tmp_path, {"out": [ok, broken]}, retry_delay=1.0)
+
+    t0 = time.time()
+    engine.run_once([d])
+    engine.close()
+
+    (retry,) = [e.record for e in AlertJournal(tmp_path / "_journal" / "out").read() if e.record["kind"] == "retry"]
+    assert (retry["adapter"], retry["destination"], retry["retries"]) == (1, "broken", 1)
+    assert t0 + 0.5 <= retry["not_before"] <= time.time() + 1.0
+
+
+def test_dead_destination_does_not_block_the_queue(tmp_path):
+    healthy, dead = RecordingAdapter("ok"), RecordingAdapter("dead", delay=0.1, fail=True)
+    d = _alerts(tmp_path, "out", 5)
+    engine = _engine(tmp_path, {"out": [healthy, dead]}, retry_delay=30.0)
+
+    t0 = time.perf_counter()
+    engine.run_once([d])
+    elapsed = time.perf_counter() - t0
+    engine.close()
+
+    assert len(healthy.sent) == 5
+    assert elapsed < 2 * 0.1  # one attempt against the dead endpoint, not five
+    retries = [e.record["retries"] for e in AlertJournal(tmp_path / "_journal" / "out").read() if e.record["kind"] == "retry"]
+    assert retries == [1, 0, 0, 0, 0]  # backed-off alerts keep their retry budget
+
+
+def test_journal_producers_and_committed_offset(tmp_path):
+    rec = RecordingAdapter("a")
+    out = tmp_path / "out"
+    out.mkdir()
+    journal = AlertJournal(tmp_path / "_journal" / "out")
+    journal.append([{"kind": "alert", "alert": {"ts": i, "data": i}} for i in range(3)])
+
+    engine = _engine(tmp_path, {"out": [rec]})
+    assert engine.run_once([out]) == 3
+    engine.close()
+
+    # a restarted engine resumes from the committed offset
+    journal.append([{"kind": "alert", "alert": {"ts": 3, "data": 3}}])
+    engine = _engine(tmp_path, {"out": [rec]})
+    assert engine.run_once([out]) == 1
+    engine.close()
+    assert rec.sent == [0, 1, 2, 3]
+
+
+class BatchingAdapter(RecordingAdapter):
+    """Merges up to `max_batch` alerts per send; fails sends containing a poisoned alert."""
+
+    def __init__(self, name: str, max_batch: int = 3, poison=None, rate_limit=None):
+        super().__init__(name)
+        self.max_batch = max_batch
+        self.poison = poison
+        self._rate = rate_limit
+
+    @property
+    def rate_limit(self):
+        return self._rate
+
+    def coalesce(self, datas):
+        return {"batch": list(datas)} if len(datas) <= self.max_batch else None
+
+    def send(self, data):
+        items = data["batch"] if isinstance(data, dict) and "batch" in data else [data]
+        if self.poison is not None and self.poison in [d["i"] for d in items]:
+            raise RuntimeError("rejected")
+        super().send(data)
+
+
+def test_coalescing_window_merges_with_per_alert_accounting(tmp_path):
+    adapter = BatchingAdapter("bot", max_batch=3, poison=4)
+    d = _alerts(tmp_path, "out", 7)
+    engine = _engine(tmp_path, {"out": [adapter]}, coalesce_ms={"out": 10})
+
+    assert engine.run_once([d]) == 4  # [0,1,2] sent, [3,4,5] failed, [6] sent
+    engine.close()
+
+    assert adapter.sent == [{"batch": [{"i": 0}, {"i": 1}, {"i": 2}]}, {"i": 6}]
+    retried = [e.record["alert"]["data"]["i"] for e in AlertJournal(tmp_path / "_journal" / "out").read()
+               if e.record["kind"] == "retry"]
+    assert retried == [3, 4, 5]
+
+
+def test_without_window_alerts_are_not_merged(tmp_path):
+    adapter = BatchingAdapter("bot", max_batch=3)
+    d = _alerts(tmp_path, "out", 3)
+    engine = _engine(tmp_path, {"out": [adapter]})
+
+    assert engine.run_once([d]) == 3
+    engine.close()
+    assert adapter.sent == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+
+def test_sends_are_paced_per_destination(tmp_path):
+    adapter = BatchingAdapter("bot", max_batch=1, rate_limit=(50.0, 1))
+    dirs = [_alerts(tmp_path, f"out-{i}", 3) for i in range(2)]
+    engine = _engine(tmp_path, {d.name: [adapter] for d in dirs})
+
+    t0 = time.perf_counter()
+    sent = 0
+    while sent < 6 and time.perf_counter() - t0 < 5:
+        sent += engine.run_once(dirs)
+        time.sleep(0.005)
+    engine.close()
+
+    assert sent == 6
+    assert time.perf_counter() - t0 >= 5 / 50 * 0.9
+    for d in dirs:
+        retried = [e.record for e in AlertJournal(tmp_path / "_journal" / d.name).read() if e.record["kind"] == "retry"]
+        assert all(r["retries"] == 0 for r in retried)  # pacing does not use up retries
+
+
+def test_paced_outbox_does_not_stall_the_pass(tmp_path):
+    paced = BatchingAdapter("paced-bot", max_batch=1, rate_limit=(1.0, 3))
+    other = RecordingAdapter("other-bot")
+    dirs = [_alerts(tmp_path, "paced", 8), _alerts(tmp_path, "other", 1)]
+    engine = _engine(tmp_path, {"paced": [paced], "other": [other]})
+
+    t0 = time.perf_counter()
+    assert engine.run_once(dirs) == 3 + 1
+    elapsed = time.perf_counter() - t0
+    engine.close()
+
+    assert elapsed < 0.5
+    assert [a["i"] for a in paced.sent] == [0, 1, 2]
+    retried = [e.record for e in AlertJournal(tmp_path / "_journal" / "paced").read() if e.record["kind"] == "retry"]
+    assert [r["alert"]["data"]["i"] for r in retried] == [3, 4, 5, 6, 7]
+    assert all(r["retries"] == 0 and r["not_before"] > time.time() for r in retried)
+
+
+def test_delivered_traces_are_stamped_sent_and_logged(tmp_path):
+    ok, broken = RecordingAdapter("ok"), RecordingAdapter("broken", fail=True)
+    d = tmp_path / "out"
+    d.mkdir()
+    trace = {"closed": 100.0, "received": 101.0, "aggregated": 102.0, "detected": 103.0}
+    (d / "0.json").write_text(json.dumps({"ts": 0, "data": {"i": 0}, "trace": trace}))
+    (d / "1.json").write_text(json.dumps({"ts": 1, "data": {"i": 1}}))
+    log = tmp_path / "_traces" / "latency.jsonl"
+
+    engine = _engine(tmp_path, {"out": [ok]}, trace_log=log)
+    t0 = time.time()
+    assert engine.run_once([d]) == 2
+    engine.close()
+
+    (line,) = log.read_text().splitlines()
+    rec = json.loads(line)
+    assert {k: rec[k] for k in trace} == trace
+    assert rec["outbox"] == "out" and rec["sent"] >= t0
+
+    # an alert that is not delivered everywhere is not traced yet
+    (d / "2.json").write_text(json.dumps({"ts": 2, "data": {"i": 2}, "trace": trace}))
+    engine = _engine(tmp_path, {"out": [ok, broken]}, trace_log=log, retry_delay=30.0)
+    engine.run_once([d])
+    engine.close()
+    assert len(log.read_text().splitlines()) == 1
+
+
+def test_unparsable_file_is_kept_until_grace_period(tmp_path):
+    rec = RecordingAdapter("a")
+    d = tmp_path / "out"
+    d.mkdir()
+    partial = d / "0.json"
+    partial.write_text('{"ts": 0, "da')  # mid-write
+    engine = _engine(tmp_path, {"out": [rec]}, unparsable_grace_s=0.05)
+
+    assert engine.run_once([d]) == 0
+    assert partial.exists() and _kinds(tmp_path, "out") == []
+
+    partial.write_text(json.dumps({"ts": 0, "data": {"i": 0}}))  # writer finished
+    assert engine.run_once([d]) == 1
+    assert rec.sent == [{"i": 0}]
+
+    garbage = d / "1.json"
+    garbage.write_text("not json")
+    engine.run_once([d])
+    assert garbage.exists()
+    time.sleep(0.06)
+    engine.run_once([d])
+    engine.close()
+
+    assert not garbage.exists()
+    (failed,) = AlertJournal(tmp_path / "_journal" / "out").failed()
+    assert (failed["ref"], failed["raw"], failed["alert"]) == ("1.json", "not json", None)
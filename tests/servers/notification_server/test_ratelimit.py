@@ -0,0 +1,37 @@
+import time
+
+from qlir.servers.notification_server.adapters.telegram import MAX_MESSAGE_CHARS, TelegramAdapter
+from qlir.servers.notification_server.ratelimit import TokenBucket
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=100.0, burst=3)
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0.005 < waits[3] <= 0.01
+    assert 0.015 < waits[4] <= 0.02
+
+
+def test_pause_blocks_then_refills_from_empty():
+    bucket = TokenBucket(rate=100.0, burst=3)
+    bucket.pause(0.05)
+
+    assert 0.05 < bucket.reserve() <= 0.061
+    time.sleep(0.2)
+    assert bucket.reserve() == 0.0
+
+
+def test_telegram_coalesces_until_message_limit():
+    adapter = TelegramAdapter(bot_token="123:abc", chat_id="1")
+    try:
+        assert adapter.destination == "telegram:123"
+        assert adapter.coalesce(["a", {"b": 1}]) == 'a\n\n{\n  "b": 1\n}'
+        assert adapter.coalesce(["x" * MAX_MESSAGE_CHARS, "y"]) is None
+    finally:
+        adapter.close()
+
+
+def test_try_acquire_does_not_borrow():
+    bucket = TokenBucket(rate=1.0, burst=2)
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
@@ -0,0 +1,44 @@
+import json
+import sys
+
+import pytest
+
+from qlir.servers.notification_server.watcher import InotifyWatcher, PollingWatcher
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+
+
+def test_reports_outbox_on_close_write_and_rename(tmp_path):
+    out = tmp_path / "qlir-events"
+    out.mkdir()
+    watcher = InotifyWatcher(tmp_path, [out])
+    try:
+        assert watcher.wait(0.01) == set()
+
+        (out / "a.json").write_text(json.dumps({"ts": 1, "data": 1}))
+        assert watcher.wait(1.0) == {out}
+
+        (out / "b.json.tmp").write_text("{}")
+        assert watcher.wait(0.05) == set()  # temp files are ignored
+        (out / "b.json.tmp").replace(out / "b.json")
+        assert watcher.wait(1.0) == {out}
+    finally:
+        watcher.close()
+
+
+def test_new_outbox_dirs_are_watched(tmp_path):
+    watcher = InotifyWatcher(tmp_path)
+    try:
+        new = tmp_path / "qlir-ops"
+        new.mkdir()
+        (tmp_path / "_sent").mkdir()
+        assert watcher.wait(1.0) == {new}
+
+        (new / "x.json").write_text("{}")
+        assert watcher.wait(1.0) == {new}
+    finally:
+        watcher.close()
+
+
+def test_polling_watcher_times_out_empty():
+    assert PollingWatcher().wait(0.0) == set()
@@ -0,0 +1,46 @@
+from qlir.servers.ops_watcher.checks_heartbeat import eval_heartbeat_check
+from qlir.servers.ops_watcher.config import HeartbeatCheckConfig, load_config
+from qlir.telemetry.heartbeat import HeartbeatRecord
+
+CFG = HeartbeatCheckConfig(
+    name="analysis_server",
+    server="analysis_server",
+    max_silence_seconds=60,
+    max_loop_seconds=10,
+    max_lag_seconds=300,
+)
+
+
+def _rec(*, beat_at=1000.0, loop_duration_s=1.0, last_processed_ts=900.0):
+    return HeartbeatRecord(
+        server="analysis_server", pid=1, started_at=0.0, beat_at=beat_at, loop=5,
+        loop_duration_s=loop_duration_s, last_processed_ts=last_processed_ts,
+    )
+
+
+def test_heartbeat_check_outcomes():
+    cases = [
+        (None, "heartbeat_missing"),
+        (_rec(), "heartbeat_ok"),
+        (_rec(beat_at=900.0), "heartbeat_stalled"),
+        (_rec(loop_duration_s=30.0), "loop_slow"),
+        (_rec(last_processed_ts=500.0), "processing_lag"),
+        (_rec(last_processed_ts=None), "heartbeat_ok"),
+    ]
+    for record, expected in cases:
+        ok, payload = eval_heartbeat_check(CFG, record, now=1010.0)
+        assert payload["type"] == expected
+        assert ok == (expected == "heartbeat_ok")
+
+
+def test_config_parses_heartbeat_checks(tmp_path):
+    path = tmp_path / "ops.toml"
+    path.write_text(
+        '[service]\ninterval_seconds = 60\nemit_outbox = "/tmp/out"\nheartbeat_dir = "/tmp/hb"\n'
+        '[[heartbeat_checks]]\nname = "notif"\nserver = "notification_server"\nmax_silence_seconds = 30\n'
+    )
+    cfg = load_config(path)
+
+    assert str(cfg.service.heartbeat_dir) == "/tmp/hb"
+    (hc,) = cfg.heartbeat_checks
+    assert (hc.server, hc.max_silence_seconds, hc.max_loop_seconds) == ("notification_server", 30.0, None)
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+
+from qlir.servers.ops_watcher.checks_process import (
+    CmdlineCache,
+    ProcessSnapshot,
+    count_matching_proc_cmdline,
+)
+
+
+def test_counts_match_per_selector_substring_semantics():
+    snap = ProcessSnapshot([
+        "python -m qlir.servers.ops_watcher.server",
+        "python -m qlir.servers.notification_server.server",
+        "python -m qlir.servers.notification_server.server --dry-run",
+        "/usr/sbin/sshd -D",
+    ])
+    selectors = ["notification_server", "notification_server.server --dry", "qlir.servers", "absent", ""]
+
+    counts = snap.counts(selectors)
+
+    assert counts == {s: sum(s in c for c in snap.cmdlines) for s in selectors}
+    assert snap.count("sshd") == 1
+
+
+def test_cache_reads_each_cmdline_once_and_finds_this_process():
+    cache = CmdlineCache()
+    first = cache.cmdlines()
+    key = next(k for k in cache._cmdlines if k[0] == os.getpid())
+    cache._cmdlines[key] = "cached-marker"  # a second tick must reuse the cached entry
+
+    assert "cached-marker" in cache.cmdlines()
+    assert any(sys.executable in c or "pytest" in c for c in first)
+    assert count_matching_proc_cmdline("pytest", ProcessSnapshot(first)) >= 1
+
+
+def test_cache_rereads_cmdline_after_exec():
+    proc = subprocess.Popen(["sh", "-c", "read _; exec sleep 30"], stdin=subprocess.PIPE)
+    try:
+        cache = CmdlineCache()
+        assert any("read _; exec sleep 30" in c for c in cache.cmdlines())
+
+        proc.stdin.write(b"\n")
+        proc.stdin.flush()
+        deadline = time.time() + 5
+        while psutil.Process(proc.pid).name() != "sleep" and time.time() < deadline:
+            time.sleep(0.01)
+
+        # same pid and create_time, new program: the cached cmdline must not be reused
+        assert "sleep 30" in cache.cmdlines()
+    finally:
+        proc.kill()
+        proc.wait()
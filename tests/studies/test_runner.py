@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qlir.studies.runner import StudyTask, run_studies
+from qlir.studies.shared_frame import SharedFrame, attach
+
+
+def _sma_summary(df: pd.DataFrame, *, window: int) -> pd.DataFrame:
+    sma = df["close"].rolling(window).mean()
+    return pd.DataFrame({"window": [window], "above": [int((df["close"] > sma).sum())]})
+
+
+def _boom(df: pd.DataFrame, **_) -> pd.DataFrame:
+    raise ValueError("boom")
+
+
+def _base(n=1_000):
+    idx = pd.date_range("2024-01-01", periods=n, freq="min", tz="UTC")
+    return pd.DataFrame({"close": 100 + np.cumsum(np.random.default_rng(1).normal(size=n))}, index=idx)
+
+
+def test_attach_is_read_only_view():
+    df = _base(10)
+    with SharedFrame(df) as shared:
+        attached = attach(shared.handle)
+        pd.testing.assert_frame_equal(attached, df, check_freq=False)
+        with pytest.raises(ValueError):
+            attached["close"].to_numpy()[0] = 0.0
+
+
+def test_run_studies_matches_serial():
+    df = _base()
+    tasks = [StudyTask(f"w{w}", {"window": w}) for w in (5, 20, 50)]
+
+    run = run_studies(df, _sma_summary, tasks, max_workers=2, progress=lambda *a: None)
+
+    assert list(run.results) == ["w5", "w20", "w50"]
+    for t in tasks:
+        pd.testing.assert_frame_equal(run.results[t.name], _sma_summary(df, **t.params))
+    assert run.metrics["task"].tolist() == ["w5", "w20", "w50"]
+    assert run.metrics["ok"].all()
+    assert (run.metrics["wall_s"] >= 0).all()
+
+
+def test_run_studies_collects_errors():
+    run = run_studies(_base(10), _boom, [StudyTask("a")], max_workers=1, progress=lambda *a: None)
+    assert run.results == {}
+    assert "ValueError: boom" in run.errors["a"]
+    assert not run.metrics["ok"].iloc[0]
+
+    with pytest.raises(RuntimeError):
+        run_studies(_base(10), _boom, [StudyTask("a")], max_workers=1, raise_on_error=True)
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+import os
+
+import pandas as pd
+
+from qlir.telemetry import heartbeat
+from qlir.telemetry.heartbeat import Heartbeat, read_heartbeat, read_heartbeats
+
+
+def test_beat_publishes_counter_duration_and_processed_ts(tmp_path):
+    hb = Heartbeat("analysis_server", directory=tmp_path)
+    with hb.loop() as it:
+        it.processed_ts = pd.Timestamp("2026-01-08T23:15:00Z")
+    hb.beat()
+
+    rec = read_heartbeat("analysis_server", tmp_path)
+    assert rec is not None
+    assert (rec.server, rec.pid, rec.loop) == ("analysis_server", os.getpid(), 2)
+    assert rec.loop_duration_s is not None and rec.loop_duration_s >= 0
+    # the processed ts sticks until a newer one is reported
+    assert rec.last_processed_ts == datetime(2026, 1, 8, 23, 15, tzinfo=timezone.utc).timestamp()
+    assert not [p for p in tmp_path.iterdir() if p.suffix == ".tmp"]
+
+
+def test_read_heartbeats_skips_foreign_files(tmp_path):
+    Heartbeat("a", directory=tmp_path).beat()
+    Heartbeat("b", directory=tmp_path).beat(processed_ts=100.0)
+    (tmp_path / "junk.json").write_text("{not json")
+
+    recs = read_heartbeats(tmp_path)
+    assert sorted(recs) == ["a", "b"]
+    assert recs["b"].lag_s(now=160.0) == 60.0
+
+
+def test_module_level_beat_is_noop_until_started(tmp_path, monkeypatch):
+    monkeypatch.setattr(heartbeat, "_current", None)
+    heartbeat.begin()
+    heartbeat.beat()  # nothing configured: no file, no error
+
+    heartbeat.start_heartbeat("agg_server", directory=tmp_path)
+    heartbeat.beat()
+    assert read_heartbeat("agg_server", tmp_path).loop == 1
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from qlir.telemetry import latency_trace as lt
+
+
+def test_start_skips_missing_and_backfill_candles():
+    assert lt.start(None, received=10.0) is None
+    assert lt.start(0.0, received=lt.MAX_TRACE_LAG_S + 1) is None
+    assert lt.start(95.0, received=100.0) == {"closed": 95.0, "received": 100.0}
+
+
+def test_carry_keeps_first_stamp_per_candle():
+    first = lt.carry(None, lt.start(60.0, received=61.0), "received")
+    # re-fetched slice, same newest closed candle: the first receive time sticks
+    again = lt.carry(first, lt.start(60.0, received=75.0), "received")
+    assert again == {"closed": 60.0, "received": 61.0}
+    # a newer candle starts a new trace
+    newer = lt.carry(again, lt.start(120.0, received=121.0), "received")
+    assert newer == {"closed": 120.0, "received": 121.0}
+    # nothing new: previous trace is kept
+    assert lt.carry(newer, None, "aggregated") == newer
+
+
+def test_stamp_validates_stage_and_passes_none():
+    assert lt.stamp(None, "sent") is None
+    with pytest.raises(ValueError):
+        lt.stamp({}, "bogus")
+
+
+def test_newest_picks_latest_closed_candle():
+    traces = [None, {"closed": 1.0}, {"closed": 3.0, "received": 4.0}, {"closed": 2.0}]
+    assert lt.newest(traces) == {"closed": 3.0, "received": 4.0}
+    assert lt.newest([None]) is None
+
+
+def test_read_manifest_trace(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    assert lt.read_manifest_trace(manifest) is None
+    manifest.write_text(json.dumps({"parts": [], "trace": {"closed": 1.0}}))
+    assert lt.read_manifest_trace(manifest) == {"closed": 1.0}
+    manifest.write_text("{")
+    assert lt.read_manifest_trace(manifest) is None
+
+
+def test_log_roundtrip_and_summary(tmp_path):
+    path = tmp_path / "latency.jsonl"
+    lt.append_traces(
+        path,
+        [
+            {"closed": 0.0, "received": 2.0, "aggregated": 22.0, "detected": 30.0, "sent": 30.5},
+            {"closed": 100.0, "received": 104.0, "aggregated": 110.0, "detected": 125.0, "sent": 126.0},
+            {"closed": 200.0, "detected": 210.0, "sent": 211.0},  # partial trace
+        ],
+    )
+    with path.open("a") as f:
+        f.write("{torn")
+
+    traces = lt.read_traces(path)
+    assert len(traces) == 3
+    assert len(lt.read_traces(path, since=100.0)) == 2
+
+    s = lt.summarize(traces)
+    assert s["received"]["n"] == 2 and s["received"]["max"] == 4.0
+    assert s["aggregated"] == {"n": 2, "p50": 20.0, "p99": 20.0, "max": 20.0}
+    assert s["sent"]["n"] == 3
+    assert s["total"]["n"] == 3 and s["total"]["max"] == 30.5
+    assert "closed -> sent" in lt.format_summary(s)
+
+
+def test_trace_log_rotates(tmp_path, monkeypatch):
+    monkeypatch.setattr(lt, "MAX_TRACE_LOG_BYTES", 10)
+    path = tmp_path / "latency.jsonl"
+    lt.append_traces(path, [{"closed": 1.0, "sent": 2.0}])
+    lt.append_traces(path, [{"closed": 3.0, "sent": 4.0}])
+    assert len(lt.read_traces(path)) == 1
+    assert len(lt.read_traces(path.with_name("latency.jsonl.1"))) == 1
@@ -0,0 +1,143 @@
+import logging
+from pathlib import Path
+import time
+
+import pytest
+
+from qlir.telemetry import telemetry as tm
+from qlir.telemetry.telemetry import Telemetry, span
+
+
+@pytest.fixture
+def reg(monkeypatch):
+    reg = Telemetry(flush_interval_s=None, logger=logging.getLogger("qlir.telemetry.test"))
+    monkeypatch.setattr(tm, "_TELEMETRY", reg)
+    return reg
+
+
+def test_calls_aggregate_instead_of_printing(reg, tmp_path, capsys):
+    log_path = tmp_path / "t.log"
+
+    @tm.telemetry(name="work", log_path=log_path, console=True)
+    def work(x):
+        return x * 2
+
+    assert [work(i) for i in range(5)] == [0, 2, 4, 6, 8]
+    assert capsys.readouterr().out == ""
+    assert not log_path.exists()
+
+    stats = reg.snapshot()["work"]
+    assert stats.count == 5
+    assert stats.min <= stats.mean <= stats.max
+    assert sum(stats.buckets) == 5
+    assert stats.parents == {None: pytest.approx(stats.total)}
+
+    lines = reg.flush()
+    assert len(lines) == 1 and lines[0].startswith("work | n=5 ")
+    assert "⏱" in capsys.readouterr().out
+    assert log_path.read_text().count("\n") == 1
+    # each flush starts a new window
+    assert reg.snapshot() == {} and reg.flush() == []
+
+
+def test_nested_spans_attribute_self_time_to_parent(reg):
+    @tm.telemetry(name="inner", console=False)
+    def inner():
+        time.sleep(0.01)
+
+    with span("outer"):
+        inner()
+        inner()
+
+    stats = reg.snapshot()
+    outer, inner_stats = stats["outer"], stats["inner"]
+    assert inner_stats.count == 2
+    assert inner_stats.parents == {"outer": pytest.approx(inner_stats.total)}
+    assert outer.self_total == pytest.approx(outer.total - inner_stats.total)
+    assert outer.self_total < 0.01 <= inner_stats.self_total
+
+
+def test_sampling_is_decided_per_root_span(reg):
+    reg.sample_rate = 0.0
+    with span("root"):
+        with span("child"):
+            pass
+    assert reg.snapshot() == {}
+
+    reg.sample_rate = 1.0
+    with span("root"):
+        with span("child"):
+            pass
+    assert set(reg.snapshot()) == {"root", "child"}
+
+
+def test_set_sample_rate_validates():
+    with pytest.raises(ValueError):
+        tm.set_sample_rate(1.5)
+
+
+def test_exceptions_still_recorded_and_stack_unwound(reg):
+    @tm.telemetry(name="boom", console=False)
+    def boom():
+        raise RuntimeError("x")
+
+    with pytest.raises(RuntimeError):
+        boom()
+    assert reg.snapshot()["boom"].count == 1
+    assert reg._stack() == []
+
+
+def test_flush_goes_through_telemetry_logger_with_tag(reg):
+    records: list[logging.LogRecord] = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    reg.logger.addHandler(handler)
+    reg.logger.setLevel(logging.INFO)
+    try:
+        with span("tagged"):
+            pass
+        reg.flush()
+    finally:
+        reg.logger.removeHandler(handler)
+    (rec,) = records
+    assert rec.tag == "TELEMETRY"
+    assert "tagged | n=1" in rec.getMessage()
+
+
+def test_periodic_flush_on_span_exit(reg):
+    reg.flush_interval_s = 0.0
+    with span("a"):
+        pass
+    assert reg.snapshot() == {}
+
+
+def test_histogram_quantiles_bound_observed_values():
+    s = tm.SpanStats("q")
+    for v in [1e-5] * 98 + [1e-2] * 2:
+        s.add(v, v, None)
+    assert 1e-5 <= s.quantile(0.5) < 1e-4
+    assert 1e-3 < s.quantile(0.99) <= 1e-2
+
+
+def test_relative_log_path_is_rooted_at_telemetry_dir(reg, tmp_path, monkeypatch):
+    monkeypatch.setenv("QLIR_TELEMETRY_DIR", str(tmp_path / "tdir"))
+    monkeypatch.chdir(tmp_path)
+
+    @tm.telemetry(name="rel", log_path=Path("etl_times.log"), console=False)
+    def rel():
+        pass
+
+    rel()
+    reg.flush()
+    assert (tmp_path / "tdir" / "etl_times.log").exists()
+    assert not (tmp_path / "etl_times.log").exists()
+
+
+def test_summaries_are_not_printed_by_default(reg, capsys):
+    @tm.telemetry(name="quiet")
+    def quiet():
+        pass
+
+    quiet()
+    assert reg.flush()
+    assert capsys.readouterr().out == ""
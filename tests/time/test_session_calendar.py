@@ -0,0 +1,68 @@
+from datetime import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from qlir.df.filtering import session as fsession
+from qlir.df.labeling.session_labels import mark_all_common_sessions
+from qlir.time.session_calendar import (
+    COMMON_SESSIONS,
+    SessionCalendar,
+    SessionSpec,
+    _wall_clock_mask,
+)
+
+
+def _ts(start="2024-03-08", end="2024-11-05", freq="7min"):
+    # spans both US and EU DST switches
+    return pd.Series(pd.date_range(start, end, freq=freq, tz="UTC"))
+
+
+@pytest.mark.parametrize("name", list(COMMON_SESSIONS))
+def test_common_sessions_match_wall_clock(name):
+    ts = _ts()
+    cal = SessionCalendar.for_timestamps(ts)
+    assert cal.intervals(name) is not None
+    np.testing.assert_array_equal(cal.mask(name, ts), _wall_clock_mask(ts, COMMON_SESSIONS[name]))
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        SessionSpec(time(22, 0), time(3, 0), "America/New_York"),  # wraps over the DST switch
+        SessionSpec(time(1, 30), time(5, 0), "America/New_York"),  # start is ambiguous / fallback
+        SessionSpec(time(0, 0), time(2, 30), "Europe/Berlin"),  # end is nonexistent / fallback
+    ],
+)
+def test_custom_sessions_match_wall_clock(spec):
+    ts = _ts(freq="1min")
+    cal = SessionCalendar.for_timestamps(ts, {"s": spec})
+    np.testing.assert_array_equal(cal.mask("s", ts), _wall_clock_mask(ts, spec))
+
+
+def test_mark_all_common_sessions_one_pass():
+    ts = _ts(freq="13min")
+    df = pd.DataFrame({"tz_start": ts.dt.tz_localize(None), "close": np.arange(len(ts), dtype=float)})
+    before = df.copy()
+
+    out = mark_all_common_sessions(df, col="tz_start")
+
+    pd.testing.assert_frame_equal(df, before)
+    assert str(out["tz_start"].dt.tz) == "UTC"
+
+    ny = ts.dt.tz_convert("America/New_York").dt.time
+    ldn = ts.dt.tz_convert("Europe/London").dt.time
+    cash = ((ny >= time(9, 30)) & (ny < time(16, 0))).to_numpy()
+    overlap = (
+        (ldn >= time(8, 0)) & (ldn < time(16, 30)) & (ny >= time(8, 0)) & (ny < time(17, 0))
+    ).to_numpy()
+    np.testing.assert_array_equal(out["in_ny_cash"].to_numpy(), cash)
+    np.testing.assert_array_equal(out["in_ldn_ny_overlap"].to_numpy(), overlap)
+    np.testing.assert_array_equal(
+        out["in_ny_extended"].to_numpy(),
+        (out["in_ny_premarket"] | out["in_ny_cash"] | out["in_ny_afterhours"]).to_numpy(),
+    )
+
+    filtered = fsession.london_newyork_overlap(df, col="tz_start", add_label=False)
+    assert len(filtered) == overlap.sum()